@@ -0,0 +1,167 @@
+"""
+Ce module fournit l'analyseur des fichiers de données texte de l'application IFT-1004 Solo Immo
+(proprietes.txt et utilisateurs.txt).
+
+Les fichiers sont lus en mode binaire par grands tampons, puis chaque tampon (limité à des lignes complètes)
+est décodé d'un seul coup avec l'encodage déclaré des fichiers (`ENCODAGE_FICHIERS`). Si le tampon n'est pas
+valide dans cet encodage (par exemple, d'anciennes lignes enregistrées en Latin-1), seules les lignes fautives
+sont décodées avec l'encodage de secours (`ENCODAGE_SECOURS`). Le résultat ne dépend donc pas des paramètres
+régionaux de l'ordinateur.
+
+Chaque ligne est accompagnée de son décalage en octets dans le fichier, ce qui permet de signaler précisément
+les lignes mal formées plutôt que d'interrompre la lecture à la première erreur.
+
+Fonctions:
+- `iterer_lignes(chemin_fichier, taille_tampon, debut)`: Parcourt les lignes non vides d'un fichier avec leur décalage.
+- `decoder_ligne(octets)`: Décode une ligne isolée, avec l'encodage de secours au besoin.
+- `analyser_lignes(lignes, nombre_champs, convertir, erreurs)`: Convertit des lignes CSV en enregistrements.
+
+Dépendances:
+- `configuration`: Pour l'encodage déclaré des fichiers, l'encodage de secours et la taille des tampons.
+"""
+
+from configuration import ENCODAGE_FICHIERS, ENCODAGE_SECOURS, TAILLE_TAMPON_LECTURE
+
+
+def iterer_lignes(chemin_fichier, taille_tampon=TAILLE_TAMPON_LECTURE, debut=0):
+    """Parcourt les lignes non vides d'un fichier texte, avec leur décalage en octets.
+
+    Les fins de ligne (`\\n` ou `\\r\\n`) et les espaces aux extrémités sont retirés.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier à lire.
+        taille_tampon (int): La taille des tampons de lecture, en octets.
+        debut (int): Le décalage en octets où commencer la lecture, au début d'une ligne.
+
+    Yields:
+        tuple: (décalage en octets du début de la ligne, ligne décodée).
+    """
+    decalage = debut
+    reste = b""
+
+    with open(chemin_fichier, "rb") as fichier:
+        fichier.seek(debut)
+        while True:
+            tampon = fichier.read(taille_tampon)
+            if not tampon:
+                break
+            tampon = reste + tampon
+            fin = tampon.rfind(b"\n") + 1
+            if fin == 0:
+                reste = tampon
+                continue
+            reste = tampon[fin:]
+
+            yield from decouper_tampon(tampon[:fin - 1], decalage)
+            decalage += fin
+
+    if reste:
+        yield from decouper_tampon(reste, decalage)
+
+
+def decouper_tampon(tampon, decalage):
+    """Décode un tampon de lignes complètes et le découpe en lignes.
+
+    Args:
+        tampon (bytes): Des lignes complètes, sans le dernier saut de ligne.
+        decalage (int): Le décalage en octets du début du tampon dans le fichier.
+
+    Yields:
+        tuple: (décalage en octets du début de la ligne, ligne décodée), pour les lignes non vides.
+    """
+    lignes_binaires = tampon.split(b"\n")
+    try:
+        lignes = tampon.decode(ENCODAGE_FICHIERS).split("\n")
+    except UnicodeDecodeError:
+        lignes = [decoder_ligne(ligne) for ligne in lignes_binaires]
+
+    for ligne_binaire, ligne in zip(lignes_binaires, lignes):
+        ligne = ligne.strip()
+        if ligne:
+            yield decalage, ligne
+        decalage += len(ligne_binaire) + 1
+
+
+def decoder_ligne(octets):
+    """Décode une ligne avec l'encodage déclaré des fichiers, ou l'encodage de secours si elle n'y est pas valide.
+
+    Args:
+        octets (bytes): La ligne à décoder.
+
+    Returns:
+        str: La ligne décodée.
+
+    Exemple:
+        >>> decoder_ligne("Montréal".encode("latin-1"))
+        'Montréal'
+    """
+    try:
+        return octets.decode(ENCODAGE_FICHIERS)
+    except UnicodeDecodeError:
+        return octets.decode(ENCODAGE_SECOURS)
+
+
+def analyser_lignes(lignes, nombre_champs, convertir, erreurs=None):
+    """Convertit des lignes CSV en enregistrements, en ignorant les lignes mal formées.
+
+    Args:
+        lignes (iterable): Des paires (position, ligne), comme celles produites par `iterer_lignes`.
+        nombre_champs (tuple of int): Les nombres de champs acceptés pour une ligne.
+        convertir (callable): La fonction qui convertit la liste des champs d'une ligne en enregistrement;
+                              elle peut lever `ValueError` pour une valeur invalide.
+        erreurs (list): Liste à laquelle ajouter un triplet (position, ligne, message) pour chaque ligne
+                        mal formée. Si elle est omise, les lignes mal formées sont ignorées silencieusement.
+
+    Yields:
+        L'enregistrement de chaque ligne valide.
+    """
+    for position, ligne in lignes:
+        champs = ligne.split(",")
+        if len(champs) not in nombre_champs:
+            if erreurs is not None:
+                erreurs.append((position, ligne, f"{len(champs)} champ(s) au lieu de {' ou '.join(map(str, nombre_champs))}"))
+            continue
+        try:
+            yield convertir(champs)
+        except ValueError as e:
+            if erreurs is not None:
+                erreurs.append((position, ligne, str(e)))
+
+
+def tests_analyseur():
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "test.txt")
+
+        # Teste un fichier mélangeant UTF-8, Latin-1, fins de ligne Windows et lignes vides.
+        contenu = "a,Montréal\r\n".encode("utf-8") + "b,Québec\r\n".encode("latin-1") + b"\n  \nc,Laval"
+        with open(chemin, "wb") as fichier:
+            fichier.write(contenu)
+
+        for taille_tampon in [1, 4, 1 << 20]:
+            lignes = list(iterer_lignes(chemin, taille_tampon))
+            assert lignes == [(0, "a,Montréal"), (13, "b,Québec"), (27, "c,Laval")], lignes
+            for decalage, ligne in lignes:
+                assert contenu[decalage:].startswith(ligne[0].encode())
+
+        # Teste une lecture qui commence au milieu du fichier, au début d'une ligne.
+        assert list(iterer_lignes(chemin, 4, debut=13)) == [(13, "b,Québec"), (27, "c,Laval")]
+
+        # Teste que les lignes mal formées sont signalées avec leur position, sans interrompre l'analyse.
+        erreurs = []
+        lignes = [(0, "1,2"), (4, "3"), (6, "x,4"), (10, "5,6")]
+        enregistrements = list(analyser_lignes(lignes, (2,), lambda champs: tuple(map(int, champs)), erreurs))
+        assert enregistrements == [(1, 2), (5, 6)]
+        assert [position for position, _, _ in erreurs] == [4, 6]
+
+        # Teste un fichier vide.
+        open(chemin, "wb").close()
+        assert list(iterer_lignes(chemin)) == []
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'analyseur'...")
+    tests_analyseur()
+    print("Tests réussis!")
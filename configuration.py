@@ -7,24 +7,143 @@ de l'application.
 
 Constantes:
     - DOSSIER_BASE: Répertoire de base de l'application, défini comme le dossier contenant ce fichier de configuration.
+    - DOSSIER_DONNEES: Répertoire des fichiers de données (par défaut, DOSSIER_BASE; voir SOLOIMMO_DOSSIER_DONNEES).
+    - ENCODAGE_FICHIERS: Encodage des fichiers de données texte.
+    - ENCODAGE_SECOURS: Encodage des anciennes lignes qui ne sont pas valides dans `ENCODAGE_FICHIERS`.
+    - TAILLE_TAMPON_LECTURE: Taille des tampons de lecture des fichiers de données, en octets.
     - FICHIER_UTILISATEURS: Chemin vers le fichier stockant les informations des utilisateurs (utilisateurs.txt).
+    - FICHIER_FILTRE_UTILISATEURS: Chemin vers le filtre de Bloom des noms d'utilisateurs (utilisateurs.bloom).
+    - CAPACITE_FILTRE_UTILISATEURS: Nombre minimal d'utilisateurs prévu lors de la création du filtre de Bloom.
+    - TAUX_FAUX_POSITIFS_UTILISATEURS: Taux de faux positifs visé pour le filtre de Bloom des utilisateurs.
     - FICHIER_PROPRIETES: Chemin vers le fichier stockant les informations des propriétés (proprietes.txt).
-    - FICHIER_SESSION: Chemin vers le fichier stockant la session active (session.txt).
+    - FORMAT_STOCKAGE_PROPRIETES: Format de stockage des propriétés, "texte" ou "blocs".
+    - FICHIER_PROPRIETES_BLOCS: Chemin vers le fichier des propriétés en blocs compressés (proprietes.blocs).
+    - TAILLE_BLOC_PROPRIETES: Nombre de propriétés par bloc compressé.
+    - FICHIER_INDEX_PROPRIETAIRES: Chemin vers l'index des propriétés de chaque propriétaire.
+    - FICHIER_EMPREINTES: Chemin vers l'ensemble des empreintes des propriétés (proprietes.v3.empreintes).
+    - FICHIER_STATISTIQUES: Chemin vers les histogrammes des propriétés, qui servent à estimer les résultats d'un filtre.
+    - BUDGET_MEMOIRE_TRI: Mémoire, en octets, allouée à chaque lot de lignes lors d'un tri externe.
+    - ALGORITHME_MOTS_DE_PASSE: Fonction de dérivation de clé des nouveaux mots de passe ("scrypt" ou "pbkdf2").
+    - COUT_SCRYPT: Facteur de coût (N) de scrypt.
+    - TAILLE_BLOC_SCRYPT: Taille de bloc (r) de scrypt.
+    - ITERATIONS_PBKDF2: Nombre d'itérations de PBKDF2-HMAC-SHA256.
+    - TAILLE_SEL_MOTS_DE_PASSE: Taille du sel aléatoire de chaque mot de passe, en octets.
+    - FICHIER_SESSION: Chemin vers la table des sessions actives (session.txt).
+    - FICHIER_VILLES: Chemin vers le fichier des villes permises (villes.txt).
+    - FICHIER_TYPES_PROPRIETE: Chemin vers le fichier des types de propriété permis (types_propriete.txt).
+    - DUREE_SESSION: Durée de validité d'une session, en secondes.
+    - INTERVALLE_PURGE_SESSIONS: Intervalle minimal entre deux purges des sessions expirées, en secondes.
+    - INTERVALLE_SYNCHRONISATION_SESSIONS: Délai maximal avant qu'une révocation faite par un autre processus soit
+      vue par la validation des sessions, en secondes.
 
 Dépendances:
+- `os`: Pour lire la variable d'environnement SOLOIMMO_DOSSIER_DONNEES.
 - `pathlib`: Nécessaire pour manipuler les chemins de fichiers et répertoires de manière portable et efficace.
 """
 
+import os
 from pathlib import Path
 
 # Définit le dossier de base de l'application comme étant le dossier contenant ce fichier de configuration.
 DOSSIER_BASE = Path(__file__).resolve().parent
 
+# Dossier des fichiers de données (utilisateurs, propriétés, sessions et fichiers dérivés). La variable
+# d'environnement SOLOIMMO_DOSSIER_DONNEES permet d'utiliser un autre dossier, par exemple un dossier partagé
+# par plusieurs processus lors d'un test de charge (voir `generateur_charge`).
+DOSSIER_DONNEES = Path(os.environ.get("SOLOIMMO_DOSSIER_DONNEES") or DOSSIER_BASE)
+
+# Encodage des fichiers de données texte, indépendant des paramètres régionaux de l'ordinateur.
+ENCODAGE_FICHIERS = "utf-8"
+
+# Encodage des anciennes lignes enregistrées selon les paramètres régionaux de Windows (ex. « Montréal »
+# en Latin-1), utilisé à la lecture seulement pour les lignes qui ne sont pas valides dans ENCODAGE_FICHIERS.
+ENCODAGE_SECOURS = "latin-1"
+
+# Taille des tampons de lecture des fichiers de données, en octets.
+TAILLE_TAMPON_LECTURE = 1 << 20
+
 # Chemin vers le fichier stockant les informations des utilisateurs.
-FICHIER_UTILISATEURS = DOSSIER_BASE / "utilisateurs.txt"
+FICHIER_UTILISATEURS = DOSSIER_DONNEES / "utilisateurs.txt"
+
+# Chemin vers le filtre de Bloom des noms d'utilisateurs, qui permet de savoir qu'un nom est libre
+# sans lire le fichier des utilisateurs.
+FICHIER_FILTRE_UTILISATEURS = DOSSIER_DONNEES / "utilisateurs.bloom"
+
+# Nombre minimal d'utilisateurs prévu lors de la création du filtre de Bloom. Le filtre est recréé avec
+# le double du nombre d'utilisateurs lorsque sa capacité est dépassée.
+CAPACITE_FILTRE_UTILISATEURS = 100_000
+
+# Taux de faux positifs visé pour le filtre de Bloom des utilisateurs, à pleine capacité.
+TAUX_FAUX_POSITIFS_UTILISATEURS = 0.01
 
 # Chemin vers le fichier stockant les informations des propriétés.
-FICHIER_PROPRIETES = DOSSIER_BASE / "proprietes.txt"
+FICHIER_PROPRIETES = DOSSIER_DONNEES / "proprietes.txt"
+
+# Format de stockage des propriétés: "texte" (proprietes.txt) ou "blocs" (blocs compressés avec zlib,
+# accompagnés d'un index des prix et des villes de chaque bloc). Le fichier de blocs est créé à partir
+# de proprietes.txt au premier démarrage en format "blocs".
+FORMAT_STOCKAGE_PROPRIETES = "texte"
+
+# Chemin vers le fichier des propriétés en blocs compressés (son index porte le suffixe .idx).
+FICHIER_PROPRIETES_BLOCS = DOSSIER_DONNEES / "proprietes.blocs"
+
+# Nombre de propriétés par bloc compressé.
+TAILLE_BLOC_PROPRIETES = 4096
+
+# Chemin vers l'index des propriétés de chaque propriétaire (proprietaire, identifiant). Les identifiants
+# dépendent du format de stockage, d'où un index distinct pour chaque format.
+FICHIER_INDEX_PROPRIETAIRES = DOSSIER_DONNEES / (
+    "proprietaires.idx" if FORMAT_STOCKAGE_PROPRIETES == "texte" else "proprietaires_blocs.idx"
+)
+
+# Chemin vers l'ensemble des empreintes des propriétés enregistrées, qui sert à rejeter les doublons.
+# Le numéro de version change avec le calcul des empreintes (voir `calculer_empreinte`) : un fichier d'une
+# version précédente est ignoré, et l'ensemble est reconstruit au démarrage (voir `preparer_fichier_proprietes`).
+FICHIER_EMPREINTES = DOSSIER_DONNEES / "proprietes.v3.empreintes"
+
+# Chemin vers les histogrammes des propriétés (par ville, type, chambres, salles de bains et tranche de prix),
+# qui servent à estimer le nombre de résultats d'un filtre. Comme l'index des propriétaires, ils sont
+# distincts pour chaque format de stockage.
+FICHIER_STATISTIQUES = DOSSIER_DONNEES / (
+    "proprietes.stats" if FORMAT_STOCKAGE_PROPRIETES == "texte" else "proprietes_blocs.stats"
+)
+
+# Mémoire allouée, en octets, à chaque lot de lignes lors d'un tri externe des propriétés (voir `tri_externe`).
+# Les lots sont triés en mémoire puis écrits dans des fichiers temporaires avant d'être fusionnés.
+BUDGET_MEMOIRE_TRI = 64 * 1024 * 1024
+
+# Fonction de dérivation de clé utilisée pour hacher les nouveaux mots de passe: "scrypt" ou "pbkdf2"
+# (PBKDF2-HMAC-SHA256). Les paramètres sont enregistrés avec chaque hachage : ils peuvent être augmentés
+# au fil du temps sans invalider les mots de passe déjà enregistrés.
+ALGORITHME_MOTS_DE_PASSE = "scrypt"
+
+# Facteur de coût (N) de scrypt, une puissance de 2; la mémoire utilisée est d'environ 128 × N × r octets.
+COUT_SCRYPT = 2**14
+
+# Taille de bloc (r) de scrypt.
+TAILLE_BLOC_SCRYPT = 8
+
+# Nombre d'itérations de PBKDF2-HMAC-SHA256.
+ITERATIONS_PBKDF2 = 600_000
+
+# Taille du sel aléatoire de chaque mot de passe, en octets.
+TAILLE_SEL_MOTS_DE_PASSE = 16
+
+# Chemin vers la table des sessions actives (jeton, utilisateur, expiration).
+FICHIER_SESSION = DOSSIER_DONNEES / "session.txt"
+
+# Chemin vers le fichier des villes permises, une ville par ligne.
+FICHIER_VILLES = DOSSIER_BASE / "villes.txt"
+
+# Chemin vers le fichier des types de propriété permis, un type par ligne.
+FICHIER_TYPES_PROPRIETE = DOSSIER_BASE / "types_propriete.txt"
+
+# Durée de validité d'une session, en secondes (8 heures).
+DUREE_SESSION = 8 * 60 * 60
+
+# Intervalle minimal entre deux purges des sessions expirées, en secondes.
+INTERVALLE_PURGE_SESSIONS = 5 * 60
 
-# Chemin vers le fichier stockant la session active.
-FICHIER_SESSION = DOSSIER_BASE / "session.txt"
+# Intervalle entre deux relectures de la table des sessions lors de la validation d'un jeton déjà en cache, en
+# secondes. Une session révoquée par un autre processus reste donc valide au plus pendant cet intervalle.
+INTERVALLE_SYNCHRONISATION_SESSIONS = 2
@@ -0,0 +1,152 @@
+"""
+Ce module gère les empreintes des propriétés de l'application IFT-1004 Solo Immo, qui servent à
+détecter les doublons.
+
+L'empreinte d'une propriété est un condensat BLAKE2b de 8 octets calculé sur ses champs normalisés
+(prix, ville, type, chambres et salles de bains). La ville et le type sont normalisés comme les saisies
+(voir `normaliser`) : deux enregistrements de la même annonce ont donc la même empreinte, quels que soient
+la casse, les accents ou les espaces de la ville et du type (« Québec » et « quebec »), et quel que soit le
+propriétaire qui l'a saisie : la même annonce ajoutée par deux utilisateurs est un doublon.
+
+C'est un compromis : une propriété n'a ni adresse ni autre identifiant, de sorte que deux propriétés
+distinctes ayant les mêmes prix, ville, type, chambres et salles de bains sont indiscernables, dans le
+fichier comme dans les listes affichées. La seconde est rejetée comme doublon, même si elle est ajoutée par
+un autre utilisateur. Ajouter le propriétaire à l'empreinte laisserait plutôt passer la même annonce
+republiée par chaque utilisateur qui la saisit.
+
+L'ensemble des empreintes est conservé dans un fichier binaire (8 octets par propriété), auquel chaque
+nouvelle empreinte est ajoutée. Comme pour les sessions, une copie en mémoire est maintenue à jour en ne
+lisant que les empreintes ajoutées depuis la dernière lecture.
+
+Fonctions:
+- `calculer_empreinte(propriete)`: Calcule l'empreinte d'une propriété.
+- `empreinte_existe(empreinte)`: Vérifie si une empreinte fait partie de l'ensemble persistant.
+- `ajouter_empreinte(empreinte)`: Ajoute une empreinte à l'ensemble persistant.
+- `ecrire_empreintes(empreintes)`: Remplace l'ensemble persistant par les empreintes fournies.
+- `synchroniser_empreintes()`: Ajoute à la copie en mémoire les empreintes ajoutées depuis la dernière lecture.
+
+Dépendances:
+- `hashlib`: Pour calculer les empreintes (BLAKE2b).
+- `os`: Pour remplacer atomiquement le fichier des empreintes.
+- `utilitaires`: Pour lire seulement les empreintes ajoutées depuis la dernière lecture.
+- `vocabulaire`: Pour normaliser la ville et le type.
+- `configuration`: Pour le chemin du fichier des empreintes.
+"""
+
+import hashlib
+import os
+
+from configuration import FICHIER_EMPREINTES
+from utilitaires import synchroniser_fichier
+from vocabulaire import normaliser
+
+# Taille d'une empreinte, en octets.
+TAILLE_EMPREINTE = 8
+
+# Copie en mémoire de l'ensemble des empreintes.
+EMPREINTES = set()
+
+# Identité (inode) et position de lecture du fichier des empreintes.
+ETAT_EMPREINTES = {"inode": None, "octets_lus": 0}
+
+
+def calculer_empreinte(propriete):
+    """Calcule l'empreinte d'une propriété.
+
+    Args:
+        propriete (dict): La propriété dont on veut l'empreinte.
+
+    Returns:
+        bytes: L'empreinte de la propriété (`TAILLE_EMPREINTE` octets).
+    """
+    champs = (
+        str(propriete["prix"]),
+        normaliser(propriete["ville"]),
+        normaliser(propriete["type"]),
+        str(propriete["chambres"]),
+        str(propriete["salles_de_bains"]),
+    )
+    return hashlib.blake2b("\x1f".join(champs).encode("utf-8"), digest_size=TAILLE_EMPREINTE).digest()
+
+
+def empreinte_existe(empreinte):
+    """Vérifie si une empreinte fait partie de l'ensemble persistant des empreintes.
+
+    Args:
+        empreinte (bytes): L'empreinte à vérifier.
+
+    Returns:
+        bool: True si une propriété ayant cette empreinte a déjà été enregistrée.
+    """
+    synchroniser_empreintes()
+    return empreinte in EMPREINTES
+
+
+def ajouter_empreinte(empreinte):
+    """Ajoute une empreinte à l'ensemble persistant des empreintes.
+
+    L'appelant est responsable de sérialiser la vérification et l'ajout (voir `verrouiller_fichier`).
+
+    Args:
+        empreinte (bytes): L'empreinte à ajouter.
+    """
+    with open(FICHIER_EMPREINTES, "ab") as fichier:
+        fichier.write(empreinte)
+    EMPREINTES.add(empreinte)
+
+
+def ecrire_empreintes(empreintes):
+    """Remplace l'ensemble persistant des empreintes par les empreintes fournies.
+
+    Args:
+        empreintes (iterable of bytes): Les empreintes à conserver.
+    """
+    fichier_temporaire = f"{FICHIER_EMPREINTES}.tmp"
+    with open(fichier_temporaire, "wb") as fichier:
+        for empreinte in empreintes:
+            fichier.write(empreinte)
+    os.replace(fichier_temporaire, FICHIER_EMPREINTES)
+
+
+def synchroniser_empreintes():
+    """Ajoute à la copie en mémoire les empreintes ajoutées au fichier depuis la dernière lecture.
+
+    Si le fichier a été remplacé (déduplication ou reconstruction), il est relu depuis le début
+    (voir `synchroniser_fichier`).
+    """
+    synchroniser_fichier(FICHIER_EMPREINTES, ETAT_EMPREINTES, EMPREINTES.clear, EMPREINTES.update, TAILLE_EMPREINTE)
+
+
+def tests_empreintes():
+    propriete = {"prix": 250_000, "ville": "Québec", "type": "Condo", "chambres": 2, "salles_de_bains": 1}
+
+    # Teste la taille de l'empreinte et sa stabilité.
+    assert len(calculer_empreinte(propriete)) == TAILLE_EMPREINTE
+    assert calculer_empreinte(propriete) == calculer_empreinte(dict(propriete))
+
+    # Teste que la casse, les accents et les espaces de la ville et du type sont ignorés, comme dans les saisies.
+    assert calculer_empreinte(propriete) == calculer_empreinte(dict(propriete, ville=" québec ", type="CONDO"))
+    assert calculer_empreinte(propriete) == calculer_empreinte(dict(propriete, ville="quebec"))
+    assert calculer_empreinte(dict(propriete, ville="Montréal")) == calculer_empreinte(dict(propriete, ville="MONTREAL"))
+
+    # Teste que le propriétaire ne fait pas partie de l'empreinte : deux propriétés indiscernables ajoutées
+    # par deux utilisateurs sont un doublon (voir le compromis décrit au début du module).
+    assert calculer_empreinte(propriete) == calculer_empreinte(dict(propriete, proprietaire="alice"))
+    assert calculer_empreinte(dict(propriete, proprietaire="alice")) == calculer_empreinte(
+        dict(propriete, proprietaire="bob")
+    )
+
+    # Teste que chaque champ de l'annonce change l'empreinte.
+    for colonne, valeur in [("prix", 250_001), ("ville", "Lévis"), ("type", "Maison"), ("chambres", 3), ("salles_de_bains", 2)]:
+        assert calculer_empreinte(propriete) != calculer_empreinte(dict(propriete, **{colonne: valeur}))
+
+    # Teste que le séparateur empêche de confondre deux découpages des mêmes caractères.
+    assert calculer_empreinte(dict(propriete, ville="a", type="bc")) != calculer_empreinte(
+        dict(propriete, ville="ab", type="c")
+    )
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'empreintes'...")
+    tests_empreintes()
+    print("Tests réussis!")
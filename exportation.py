@@ -0,0 +1,312 @@
+"""
+Ce module exporte des propriétés de l'application IFT-1004 Solo Immo vers des fichiers destinés à
+d'autres outils. Les propriétés sont lues en continu depuis le fichier des propriétés et écrites au fur
+et à mesure, à travers des tampons d'écriture de grande taille : aucune liste intermédiaire n'est
+construite et la mémoire utilisée ne dépend pas du nombre de propriétés exportées.
+
+Les propriétés peuvent aussi être exportées par ordre de prix (voir `ORDRES_EXPORT`); elles passent alors par
+un tri externe (voir `iterer_proprietes_triees`), dont la mémoire est bornée elle aussi.
+
+Formats offerts:
+- "csv": Une ligne d'en-tête, puis une propriété par ligne (module `csv`).
+- "jsonl": Un objet JSON par ligne.
+- "colonnes": Un format binaire en colonnes, découpé en tranches d'au plus `TAILLE_TRANCHE` propriétés.
+  Chaque tranche contient le nombre de propriétés, puis chaque colonne : les colonnes numériques sous forme
+  de tableaux d'entiers (`array`), les colonnes texte sous forme d'un dictionnaire des valeurs distinctes de
+  la tranche suivi des codes de chaque propriété.
+
+Fonctions:
+- `exporter_proprietes(criteres, chemin_fichier, format_export, ordre)`: Exporte les propriétés correspondant aux
+  critères, dans leur ordre d'enregistrement ou par ordre de prix.
+- `exporter_csv(proprietes, chemin_fichier)`: Écrit des propriétés en CSV.
+- `exporter_jsonl(proprietes, chemin_fichier)`: Écrit des propriétés en JSON Lines.
+- `exporter_colonnes(proprietes, chemin_fichier)`: Écrit des propriétés dans le format binaire en colonnes.
+- `lire_colonnes(chemin_fichier)`: Relit un fichier du format binaire en colonnes.
+
+Dépendances:
+- `array`: Pour sérialiser les colonnes numériques et les codes du format en colonnes.
+- `csv`: Pour écrire les fichiers CSV.
+- `json`: Pour écrire les fichiers JSON Lines.
+- `struct`: Pour écrire les en-têtes et les longueurs du format en colonnes.
+- `sys`: Pour normaliser l'ordre des octets du format en colonnes.
+- `gestionnaire_donnees`: Pour parcourir et filtrer les propriétés en continu.
+"""
+
+import array
+import csv
+import json
+import struct
+import sys
+
+from gestionnaire_donnees import iterer_proprietes, iterer_proprietes_triees
+
+# Colonnes exportées, dans l'ordre.
+COLONNES_EXPORT = ["prix", "ville", "type", "chambres", "salles_de_bains", "proprietaire"]
+
+# Type `array` des colonnes numériques du format en colonnes (entiers signés de 64 bits et non signés de 32 bits).
+TYPES_COLONNES_NUMERIQUES = {"prix": "q", "chambres": "I", "salles_de_bains": "I"}
+
+# Signature au début d'un fichier du format en colonnes.
+SIGNATURE_COLONNES = b"SOLOIMMO-COLONNES-1\n"
+
+# Nombre maximal de propriétés par tranche du format en colonnes.
+TAILLE_TRANCHE = 65_536
+
+# Taille du tampon d'écriture des fichiers exportés, en octets.
+TAILLE_TAMPON_EXPORT = 1 << 20
+
+# Ordres d'exportation par prix offerts, associés au sens du tri (True pour décroissant).
+ORDRES_EXPORT = {"prix": False, "prix-decroissant": True}
+
+
+def exporter_proprietes(criteres, chemin_fichier, format_export, ordre=None):
+    """Exporte les propriétés correspondant aux critères vers un fichier.
+
+    Args:
+        criteres (dict): Les critères de filtrage, comme pour le menu de filtrage (voir `demander_criteres`).
+        chemin_fichier (str): Le chemin du fichier à créer (écrasé s'il existe).
+        format_export (str): Le format du fichier : "csv", "jsonl" ou "colonnes".
+        ordre (str): L'ordre des propriétés exportées : `None` pour l'ordre d'enregistrement, ou une clé
+                     de `ORDRES_EXPORT` ("prix" ou "prix-decroissant").
+
+    Returns:
+        int: Le nombre de propriétés exportées.
+
+    Raises:
+        ValueError: Si le format ou l'ordre demandé n'existe pas.
+    """
+    if format_export not in FORMATS_EXPORT:
+        raise ValueError(f"Format d'exportation inconnu: {format_export}. Choisissez parmi: {', '.join(FORMATS_EXPORT)}")
+    if ordre is not None and ordre not in ORDRES_EXPORT:
+        raise ValueError(f"Ordre d'exportation inconnu: {ordre}. Choisissez parmi: {', '.join(ORDRES_EXPORT)}")
+
+    if ordre is None:
+        proprietes = iterer_proprietes(criteres)
+    else:
+        proprietes = iterer_proprietes_triees(criteres, decroissant=ORDRES_EXPORT[ordre])
+    return FORMATS_EXPORT[format_export](proprietes, chemin_fichier)
+
+
+def exporter_csv(proprietes, chemin_fichier):
+    """Écrit des propriétés dans un fichier CSV, avec une ligne d'en-tête.
+
+    Args:
+        proprietes (iterable): Les propriétés à écrire.
+        chemin_fichier (str): Le chemin du fichier à créer.
+
+    Returns:
+        int: Le nombre de propriétés écrites.
+    """
+    nombre = 0
+    with open(chemin_fichier, "w", newline="", encoding="utf-8", buffering=TAILLE_TAMPON_EXPORT) as fichier:
+        ecrivain = csv.writer(fichier)
+        ecrivain.writerow(COLONNES_EXPORT)
+        for propriete in proprietes:
+            ecrivain.writerow([propriete[colonne] for colonne in COLONNES_EXPORT])
+            nombre += 1
+    return nombre
+
+
+def exporter_jsonl(proprietes, chemin_fichier):
+    """Écrit des propriétés dans un fichier JSON Lines (un objet JSON par ligne).
+
+    Args:
+        proprietes (iterable): Les propriétés à écrire.
+        chemin_fichier (str): Le chemin du fichier à créer.
+
+    Returns:
+        int: Le nombre de propriétés écrites.
+    """
+    nombre = 0
+    encodeur = json.JSONEncoder(ensure_ascii=False)
+    with open(chemin_fichier, "w", encoding="utf-8", buffering=TAILLE_TAMPON_EXPORT) as fichier:
+        for propriete in proprietes:
+            fichier.write(encodeur.encode({colonne: propriete[colonne] for colonne in COLONNES_EXPORT}))
+            fichier.write("\n")
+            nombre += 1
+    return nombre
+
+
+def exporter_colonnes(proprietes, chemin_fichier):
+    """Écrit des propriétés dans le format binaire en colonnes.
+
+    Les propriétés sont accumulées par tranches d'au plus `TAILLE_TRANCHE`; seule la tranche en cours
+    est conservée en mémoire.
+
+    Args:
+        proprietes (iterable): Les propriétés à écrire.
+        chemin_fichier (str): Le chemin du fichier à créer.
+
+    Returns:
+        int: Le nombre de propriétés écrites.
+    """
+    nombre = 0
+    with open(chemin_fichier, "wb", buffering=TAILLE_TAMPON_EXPORT) as fichier:
+        fichier.write(SIGNATURE_COLONNES)
+        tranche = {colonne: [] for colonne in COLONNES_EXPORT}
+        for propriete in proprietes:
+            for colonne in COLONNES_EXPORT:
+                tranche[colonne].append(propriete[colonne])
+            nombre += 1
+            if len(tranche["prix"]) == TAILLE_TRANCHE:
+                ecrire_tranche(fichier, tranche)
+                tranche = {colonne: [] for colonne in COLONNES_EXPORT}
+        if tranche["prix"]:
+            ecrire_tranche(fichier, tranche)
+    return nombre
+
+
+def ecrire_tranche(fichier, tranche):
+    """Écrit une tranche de propriétés dans un fichier du format en colonnes.
+
+    Args:
+        fichier (file): Le fichier binaire ouvert en écriture.
+        tranche (dict): Les valeurs de chaque colonne de la tranche.
+    """
+    fichier.write(struct.pack("<I", len(tranche["prix"])))
+    for colonne in COLONNES_EXPORT:
+        if colonne in TYPES_COLONNES_NUMERIQUES:
+            ecrire_tableau(fichier, array.array(TYPES_COLONNES_NUMERIQUES[colonne], tranche[colonne]))
+        else:
+            codes = {}
+            tableau = array.array("I", [codes.setdefault(valeur, len(codes)) for valeur in tranche[colonne]])
+            fichier.write(struct.pack("<I", len(codes)))
+            for valeur in codes:
+                encodee = valeur.encode("utf-8")
+                fichier.write(struct.pack("<H", len(encodee)))
+                fichier.write(encodee)
+            ecrire_tableau(fichier, tableau)
+
+
+def ecrire_tableau(fichier, tableau):
+    """Écrit un tableau d'entiers en ordre d'octets petit-boutiste.
+
+    Args:
+        fichier (file): Le fichier binaire ouvert en écriture.
+        tableau (array.array): Le tableau à écrire.
+    """
+    if sys.byteorder == "big":
+        tableau.byteswap()
+    tableau.tofile(fichier)
+
+
+def lire_colonnes(chemin_fichier):
+    """Relit un fichier du format binaire en colonnes, tranche par tranche.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier à lire.
+
+    Yields:
+        dict: Les propriétés du fichier, dans leur ordre d'écriture.
+
+    Raises:
+        ValueError: Si le fichier n'est pas du format en colonnes.
+    """
+    with open(chemin_fichier, "rb") as fichier:
+        if fichier.read(len(SIGNATURE_COLONNES)) != SIGNATURE_COLONNES:
+            raise ValueError(f"{chemin_fichier} n'est pas un fichier du format en colonnes.")
+
+        while entete := fichier.read(4):
+            (nombre,) = struct.unpack("<I", entete)
+            colonnes = {}
+            for colonne in COLONNES_EXPORT:
+                if colonne in TYPES_COLONNES_NUMERIQUES:
+                    colonnes[colonne] = lire_tableau(fichier, TYPES_COLONNES_NUMERIQUES[colonne], nombre)
+                else:
+                    (nombre_valeurs,) = struct.unpack("<I", fichier.read(4))
+                    valeurs = []
+                    for _ in range(nombre_valeurs):
+                        (longueur,) = struct.unpack("<H", fichier.read(2))
+                        valeurs.append(fichier.read(longueur).decode("utf-8"))
+                    colonnes[colonne] = [valeurs[code] for code in lire_tableau(fichier, "I", nombre)]
+
+            for position in range(nombre):
+                yield {colonne: colonnes[colonne][position] for colonne in COLONNES_EXPORT}
+
+
+def lire_tableau(fichier, type_tableau, nombre):
+    """Lit un tableau d'entiers petit-boutiste.
+
+    Args:
+        fichier (file): Le fichier binaire ouvert en lecture.
+        type_tableau (str): Le type `array` des éléments.
+        nombre (int): Le nombre d'éléments à lire.
+
+    Returns:
+        array.array: Le tableau lu.
+    """
+    tableau = array.array(type_tableau)
+    tableau.fromfile(fichier, nombre)
+    if sys.byteorder == "big":
+        tableau.byteswap()
+    return tableau
+
+
+# Fonction d'exportation de chaque format.
+FORMATS_EXPORT = {"csv": exporter_csv, "jsonl": exporter_jsonl, "colonnes": exporter_colonnes}
+
+
+def tests_exportation():
+    import tempfile
+    from pathlib import Path
+
+    proprietes = [
+        {"prix": 250_000, "ville": "Québec", "type": "Condo", "chambres": 2, "salles_de_bains": 1, "proprietaire": "alice"},
+        {"prix": 2**40, "ville": "Lévis", "type": "Maison", "chambres": 4, "salles_de_bains": 2, "proprietaire": ""},
+        {"prix": 180_000, "ville": "Québec", "type": "Condo", "chambres": 1, "salles_de_bains": 1, "proprietaire": "bob"},
+    ]
+
+    with tempfile.TemporaryDirectory() as dossier:
+        dossier = Path(dossier)
+
+        # Teste l'aller-retour en CSV (les valeurs sont relues comme du texte).
+        assert exporter_csv(iter(proprietes), dossier / "export.csv") == 3
+        with open(dossier / "export.csv", newline="", encoding="utf-8") as fichier:
+            lignes = list(csv.DictReader(fichier))
+        assert list(lignes[0]) == COLONNES_EXPORT
+        assert lignes == [{colonne: str(p[colonne]) for colonne in COLONNES_EXPORT} for p in proprietes]
+
+        # Teste l'aller-retour en JSON Lines.
+        assert exporter_jsonl(iter(proprietes), dossier / "export.jsonl") == 3
+        with open(dossier / "export.jsonl", encoding="utf-8") as fichier:
+            assert [json.loads(ligne) for ligne in fichier] == proprietes
+
+        # Teste l'aller-retour dans le format en colonnes, y compris un fichier vide.
+        assert exporter_colonnes(iter(proprietes), dossier / "export.col") == 3
+        assert list(lire_colonnes(dossier / "export.col")) == proprietes
+        assert exporter_colonnes([], dossier / "vide.col") == 0
+        assert list(lire_colonnes(dossier / "vide.col")) == []
+
+        # Teste un fichier de plus d'une tranche, dont les dictionnaires des colonnes texte diffèrent.
+        nombre = TAILLE_TRANCHE + 10
+        grand = (
+            {"prix": i, "ville": f"Ville {i // TAILLE_TRANCHE}", "type": "Condo", "chambres": i % 5,
+             "salles_de_bains": i % 3, "proprietaire": f"u{i % 7}"}
+            for i in range(nombre)
+        )
+        assert exporter_colonnes(grand, dossier / "grand.col") == nombre
+        relues = 0
+        for i, propriete in enumerate(lire_colonnes(dossier / "grand.col")):
+            assert propriete == {"prix": i, "ville": f"Ville {i // TAILLE_TRANCHE}", "type": "Condo",
+                                 "chambres": i % 5, "salles_de_bains": i % 3, "proprietaire": f"u{i % 7}"}
+            relues += 1
+        assert relues == nombre
+
+        # Teste le refus d'un fichier d'un autre format et d'un format ou d'un ordre inconnu.
+        try:
+            list(lire_colonnes(dossier / "export.csv"))
+            assert False, "Un fichier CSV ne devrait pas être lu comme un fichier en colonnes."
+        except ValueError:
+            pass
+        for format_export, ordre in [("xml", None), ("csv", "ville")]:
+            try:
+                exporter_proprietes({}, dossier / "export", format_export, ordre)
+                assert False, f"Le format {format_export} et l'ordre {ordre} devraient être refusés."
+            except ValueError:
+                pass
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'exportation'...")
+    tests_exportation()
+    print("Tests réussis!")
@@ -0,0 +1,271 @@
+"""
+Ce module implémente un filtre de Bloom persistant pour l'application IFT-1004 Solo Immo.
+
+Un filtre de Bloom répond à la question « cette valeur a-t-elle déjà été ajoutée ? » avec deux réponses
+possibles : « certainement pas » ou « peut-être ». Chaque valeur ajoutée met à 1 `k` bits d'un tableau de
+`m` bits, choisis par hachage; une valeur dont un des `k` bits est à 0 n'a donc jamais été ajoutée. La
+probabilité d'un « peut-être » erroné (faux positif) dépend du remplissage du filtre.
+
+Le filtre est conservé dans un fichier binaire : un en-tête (signature, `m`, `k`, capacité prévue, nombre
+de valeurs ajoutées, et taille et date de modification du fichier source des valeurs) suivi du tableau de
+bits. La taille et la date de modification de la source permettent de savoir si elle a été modifiée sans que
+le filtre soit mis à jour (voir `lire_source_filtre`).
+
+Un filtre d'une version précédente du format (SIBLOOM1, sans source) est refusé comme un fichier invalide :
+l'application le recrée. Les vérifications et les ajouts lisent et écrivent directement
+les `k` octets concernés dans le fichier, sans charger le filtre en entier : tous les processus voient ainsi
+le même filtre, et le coût d'une opération ne dépend pas du nombre de valeurs.
+
+Fonctions:
+- `creer_filtre(chemin_fichier, valeurs, capacite, taux_faux_positifs, source)`: Crée un filtre contenant des valeurs.
+- `filtre_peut_contenir(chemin_fichier, valeur)`: Vérifie si une valeur a peut-être été ajoutée au filtre.
+- `ajouter_au_filtre(chemin_fichier, valeur, source)`: Ajoute une valeur au filtre.
+- `lire_source_filtre(chemin_fichier)`: Retourne la taille et la date de modification de la source du filtre.
+- `decrire_filtre(chemin_fichier)`: Retourne les paramètres du filtre et son taux de faux positifs estimé.
+
+Dépendances:
+- `hashlib`: Pour calculer les positions des bits d'une valeur (BLAKE2b).
+- `math`: Pour dimensionner le filtre et estimer son taux de faux positifs.
+- `os`: Pour remplacer atomiquement le fichier lors de la création d'un filtre.
+- `struct`: Pour lire et écrire l'en-tête du fichier.
+"""
+
+import hashlib
+import math
+import os
+import struct
+
+# Signature et format de l'en-tête: signature, m (bits), k (hachages), capacité, nombre de valeurs, puis
+# taille (octets) et date de modification (nanosecondes) du fichier source.
+SIGNATURE_FILTRE = b"SIBLOOM2"
+FORMAT_EN_TETE = "<8sQIQQQQ"
+TAILLE_EN_TETE = struct.calcsize(FORMAT_EN_TETE)
+
+
+def creer_filtre(chemin_fichier, valeurs, capacite, taux_faux_positifs, source=(0, 0)):
+    """Crée (ou remplace) un fichier de filtre de Bloom contenant les valeurs fournies.
+
+    Le filtre est dimensionné pour que le taux de faux positifs soit `taux_faux_positifs` lorsqu'il
+    contient `capacite` valeurs.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier du filtre.
+        valeurs (iterable of str): Les valeurs à ajouter au filtre.
+        capacite (int): Le nombre de valeurs prévu.
+        taux_faux_positifs (float): Le taux de faux positifs visé à pleine capacité (ex. 0.01).
+        source (tuple): La taille et la date de modification (nanosecondes) du fichier d'où proviennent les
+                        valeurs, après leur lecture.
+
+    Returns:
+        int: Le nombre de valeurs ajoutées.
+    """
+    nombre_bits = max(8, math.ceil(-capacite * math.log(taux_faux_positifs) / math.log(2) ** 2))
+    nombre_hachages = max(1, round(nombre_bits / capacite * math.log(2)))
+    bits = bytearray((nombre_bits + 7) // 8)
+
+    nombre = 0
+    for valeur in valeurs:
+        for position in positions_bits(valeur, nombre_bits, nombre_hachages):
+            bits[position >> 3] |= 1 << (position & 7)
+        nombre += 1
+
+    fichier_temporaire = f"{chemin_fichier}.tmp"
+    with open(fichier_temporaire, "wb") as fichier:
+        fichier.write(
+            struct.pack(FORMAT_EN_TETE, SIGNATURE_FILTRE, nombre_bits, nombre_hachages, capacite, nombre, *source)
+        )
+        fichier.write(bits)
+    os.replace(fichier_temporaire, chemin_fichier)
+
+    return nombre
+
+
+def filtre_peut_contenir(chemin_fichier, valeur):
+    """Vérifie si une valeur a peut-être été ajoutée au filtre.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier du filtre.
+        valeur (str): La valeur à vérifier.
+
+    Returns:
+        bool: False si la valeur n'a certainement jamais été ajoutée, True si elle l'a peut-être été.
+    """
+    with open(chemin_fichier, "rb") as fichier:
+        nombre_bits, nombre_hachages, _, _, _ = lire_en_tete(fichier)
+        for position in positions_bits(valeur, nombre_bits, nombre_hachages):
+            fichier.seek(TAILLE_EN_TETE + (position >> 3))
+            if not fichier.read(1)[0] >> (position & 7) & 1:
+                return False
+    return True
+
+
+def ajouter_au_filtre(chemin_fichier, valeur, source=None):
+    """Ajoute une valeur au filtre, en n'écrivant que les octets modifiés et l'en-tête.
+
+    L'appelant est responsable de sérialiser les ajouts concurrents (voir `verrouiller_fichier`).
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier du filtre.
+        valeur (str): La valeur à ajouter.
+        source (tuple): La taille et la date de modification du fichier source après l'ajout de la valeur,
+                        ou `None` pour conserver celles de l'en-tête.
+
+    Returns:
+        bool: True si le filtre contient maintenant plus de valeurs que sa capacité prévue
+              (il devrait alors être recréé plus grand), False sinon.
+    """
+    with open(chemin_fichier, "r+b") as fichier:
+        nombre_bits, nombre_hachages, capacite, nombre, source_actuelle = lire_en_tete(fichier)
+        for position in positions_bits(valeur, nombre_bits, nombre_hachages):
+            fichier.seek(TAILLE_EN_TETE + (position >> 3))
+            octet = fichier.read(1)[0]
+            if not octet >> (position & 7) & 1:
+                fichier.seek(-1, os.SEEK_CUR)
+                fichier.write(bytes([octet | 1 << (position & 7)]))
+
+        fichier.seek(0)
+        en_tete = (SIGNATURE_FILTRE, nombre_bits, nombre_hachages, capacite, nombre + 1, *(source or source_actuelle))
+        fichier.write(struct.pack(FORMAT_EN_TETE, *en_tete))
+
+    return nombre + 1 > capacite
+
+
+def decrire_filtre(chemin_fichier):
+    """Retourne les paramètres d'un filtre et son taux de faux positifs estimé.
+
+    Deux estimations sont fournies : la valeur théorique d'après le nombre de valeurs ajoutées,
+    (1 - e^(-k·n/m))^k, et la valeur mesurée d'après la proportion de bits à 1, (bits à 1 / m)^k.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier du filtre.
+
+    Returns:
+        dict or None: Les clés "bits", "hachages", "capacite", "valeurs", "taille_octets",
+                      "taux_theorique", "taux_mesure" et "remplissage" (proportion de bits à 1),
+                      ou `None` si le filtre n'a pas encore été créé.
+    """
+    try:
+        with open(chemin_fichier, "rb") as fichier:
+            nombre_bits, nombre_hachages, capacite, nombre, _ = lire_en_tete(fichier)
+            bits = fichier.read()
+    except FileNotFoundError:
+        return None
+
+    remplissage = int.from_bytes(bits, "little").bit_count() / nombre_bits
+    return {
+        "bits": nombre_bits,
+        "hachages": nombre_hachages,
+        "capacite": capacite,
+        "valeurs": nombre,
+        "taille_octets": TAILLE_EN_TETE + len(bits),
+        "taux_theorique": (1 - math.exp(-nombre_hachages * nombre / nombre_bits)) ** nombre_hachages,
+        "taux_mesure": remplissage ** nombre_hachages,
+        "remplissage": remplissage,
+    }
+
+
+def lire_source_filtre(chemin_fichier):
+    """Retourne la taille et la date de modification du fichier source enregistrées dans un filtre.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier du filtre.
+
+    Returns:
+        tuple or None: (taille, date de modification en nanosecondes), ou `None` si le filtre n'existe pas
+                       ou n'est pas un filtre valide (il devrait alors être recréé).
+    """
+    try:
+        with open(chemin_fichier, "rb") as fichier:
+            return lire_en_tete(fichier)[4]
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def lire_en_tete(fichier):
+    """Lit et valide l'en-tête d'un fichier de filtre.
+
+    Args:
+        fichier (file): Le fichier du filtre, ouvert en mode binaire.
+
+    Returns:
+        tuple: (nombre de bits, nombre de hachages, capacité, nombre de valeurs, (taille, date de modification)
+               du fichier source).
+
+    Raises:
+        ValueError: Si le fichier n'est pas un filtre de Bloom.
+    """
+    fichier.seek(0)
+    en_tete = fichier.read(TAILLE_EN_TETE)
+    if len(en_tete) != TAILLE_EN_TETE or not en_tete.startswith(SIGNATURE_FILTRE):
+        raise ValueError(f"{fichier.name} n'est pas un filtre de Bloom.")
+    _, nombre_bits, nombre_hachages, capacite, nombre, *source = struct.unpack(FORMAT_EN_TETE, en_tete)
+    return nombre_bits, nombre_hachages, capacite, nombre, tuple(source)
+
+
+def positions_bits(valeur, nombre_bits, nombre_hachages):
+    """Calcule les positions des bits associés à une valeur (double hachage de Kirsch-Mitzenmacher).
+
+    Args:
+        valeur (str): La valeur à hacher.
+        nombre_bits (int): La taille du filtre, en bits.
+        nombre_hachages (int): Le nombre de positions à calculer.
+
+    Returns:
+        list of int: Les positions des bits, entre 0 et `nombre_bits` - 1.
+    """
+    condensat = hashlib.blake2b(valeur.encode("utf-8"), digest_size=16).digest()
+    hachage_1 = int.from_bytes(condensat[:8], "little")
+    hachage_2 = int.from_bytes(condensat[8:], "little") | 1
+    return [(hachage_1 + i * hachage_2) % nombre_bits for i in range(nombre_hachages)]
+
+
+def tests_filtre_bloom():
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "test.bloom")
+
+        # Teste qu'aucune valeur ajoutée n'est déclarée absente (pas de faux négatifs).
+        valeurs = [f"utilisateur{i}" for i in range(1000)]
+        assert creer_filtre(chemin, valeurs, 1000, 0.01) == 1000
+        assert all(filtre_peut_contenir(chemin, valeur) for valeur in valeurs)
+
+        # Teste que le taux de faux positifs reste près du taux visé.
+        faux_positifs = sum(filtre_peut_contenir(chemin, f"inconnu{i}") for i in range(10_000))
+        assert faux_positifs < 300
+
+        # Teste l'ajout d'une valeur et la mise à jour de l'en-tête.
+        assert ajouter_au_filtre(chemin, "nouveau")  # Capacité dépassée
+        assert filtre_peut_contenir(chemin, "nouveau")
+        description = decrire_filtre(chemin)
+        assert description["valeurs"] == 1001
+        assert 0 < description["taux_mesure"] < 0.05
+
+        # Teste que la source est conservée par un ajout sans source, et remplacée par un ajout avec source.
+        assert lire_source_filtre(chemin) == (0, 0)
+        creer_filtre(chemin, valeurs, 1000, 0.01, source=(120, 1_700_000_000_000_000_000))
+        assert lire_source_filtre(chemin) == (120, 1_700_000_000_000_000_000)
+        ajouter_au_filtre(chemin, "autre")
+        assert lire_source_filtre(chemin) == (120, 1_700_000_000_000_000_000)
+        ajouter_au_filtre(chemin, "encore", source=(140, 1_700_000_000_000_000_001))
+        assert lire_source_filtre(chemin) == (140, 1_700_000_000_000_000_001)
+        assert filtre_peut_contenir(chemin, "autre") and filtre_peut_contenir(chemin, "encore")
+
+        # Teste qu'un filtre absent ou d'une version précédente du format n'a pas de source (il doit être recréé).
+        assert lire_source_filtre(os.path.join(dossier, "absent.bloom")) is None
+        with open(chemin, "r+b") as fichier:
+            fichier.write(b"SIBLOOM1")
+        assert lire_source_filtre(chemin) is None
+
+        # Teste la description d'un filtre qui n'a pas encore été créé.
+        assert decrire_filtre(os.path.join(dossier, "absent.bloom")) is None
+
+        # Teste qu'un filtre vide ne contient rien.
+        creer_filtre(chemin, [], 10, 0.01)
+        assert not filtre_peut_contenir(chemin, "utilisateur0")
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'filtre_bloom'...")
+    tests_filtre_bloom()
+    print("Tests réussis!")
@@ -0,0 +1,630 @@
+"""
+Générateur de charge de l'application IFT-1004 Solo Immo : rejoue des scripts de sessions d'utilisateurs
+contre la boucle principale (`ift1004_solo_immo.main`), dans plusieurs processus en parallèle partageant
+le même dossier de données, puis rapporte la latence de chaque action et vérifie l'intégrité des données.
+
+Un script de session est une suite d'actions du menu principal (connexion, liste, filtre, ajout, etc.), chacune
+accompagnée de toutes les réponses aux questions posées par l'application (choix du menu, puis réponses à
+`demander_ville`, `demander_plage_de_prix`, etc.). Les scripts sont conservés en JSON Lines, une session
+par ligne : `{"actions": [["connexion", ["4", "alice", "secret"]], ["lister", ["1"]], ...]}`. Ils peuvent
+être générés aléatoirement (commande `generer`) ou enregistrés lors d'une session interactive (commande
+`enregistrer`).
+
+Pendant le rejeu, `input` est remplacé par une fonction qui fournit les réponses du script, et la sortie de
+l'application est écartée. La latence d'une action est le temps écoulé entre le choix de l'action dans le
+menu principal et le retour au menu principal. Une session qui n'utilise pas exactement les réponses prévues
+(par exemple, à cause d'un message d'erreur inattendu) est signalée comme désynchronisée.
+
+Utilisation:
+    python generateur_charge.py charge [--scripts FICHIER] [--sessions N] [--processus P] [--actions K]
+                                       [--graine G] [--dossier DOSSIER]
+    python generateur_charge.py generer FICHIER [--sessions N] [--actions K] [--graine G]
+    python generateur_charge.py enregistrer FICHIER [--dossier DOSSIER]
+    python generateur_charge.py tests
+
+Sans `--dossier`, la charge est exécutée dans un nouveau dossier temporaire, initialisé avec une copie
+des fichiers des utilisateurs et des propriétés de l'application. Le dossier de données est transmis aux
+processus par la variable d'environnement SOLOIMMO_DOSSIER_DONNEES (voir `configuration`); c'est pourquoi
+les modules de l'application ne sont importés qu'une fois cette variable définie.
+
+Fonctions:
+- `generer_sessions(nombre, nombre_actions, graine)`: Génère des scripts de sessions aléatoires.
+- `rejouer_session(session)`: Rejoue un script de session contre `main` et mesure la latence de chaque action.
+- `executer_charge(sessions, processus)`: Rejoue des sessions dans plusieurs processus en parallèle.
+- `verifier_integrite(nombre_initial, resultats)`: Vérifie la cohérence des fichiers de données après la charge.
+- `enregistrer_session(chemin_fichier)`: Enregistre le script d'une session interactive.
+- `tests_generateur_charge()`: Rejoue une session dans un dossier de données temporaire et vérifie le résultat.
+- `main(arguments)`: Analyse les arguments de la ligne de commande et exécute la commande demandée.
+
+Dépendances:
+- `argparse`: Pour analyser les arguments de la ligne de commande.
+- `builtins`: Pour remplacer `input` pendant le rejeu et l'enregistrement des sessions.
+- `collections`: Pour les files de réponses (`deque`) et le décompte des messages (`Counter`).
+- `contextlib`: Pour écarter la sortie de l'application pendant le rejeu.
+- `io`: Pour la sortie qui compte les messages de l'application.
+- `json`: Pour lire et écrire les scripts de sessions.
+- `multiprocessing`: Pour rejouer les sessions dans plusieurs processus.
+- `os`: Pour définir le dossier de données des processus.
+- `random`: Pour générer les sessions.
+- `shutil`: Pour initialiser le dossier de données.
+- `tempfile`: Pour créer le dossier de données temporaire.
+- `time`: Pour mesurer la latence des actions.
+- `pathlib`: Pour manipuler les chemins du dossier de données.
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter, deque
+from pathlib import Path
+
+# Variable d'environnement indiquant le dossier des fichiers de données (voir `configuration`).
+VARIABLE_DOSSIER_DONNEES = "SOLOIMMO_DOSSIER_DONNEES"
+
+# Fichiers de données copiés dans un nouveau dossier de données.
+FICHIERS_INITIAUX = ["utilisateurs.txt", "proprietes.txt"]
+
+# Question posée par le menu principal; elle marque la fin d'une action et le début de la suivante.
+INVITE_MENU = "Choisissez une option: "
+
+# Poids relatif de chaque action dans les sessions générées, une fois l'utilisateur connecté.
+MELANGE_ACTIONS = {"lister": 2, "filtrer": 5, "compter": 2, "trier": 1, "ajouter": 3, "mes_proprietes": 1}
+
+# Messages de l'application comptés pendant le rejeu, pour les vérifications d'intégrité.
+MESSAGES_SUIVIS = {
+    "compte_cree": "Compte créé avec succès.",
+    "connexion": "Connexion réussie.",
+    "ajout": "Propriété ajoutée avec succès.",
+    "doublon": "Cette propriété a déjà été ajoutée.",
+}
+
+# Centiles rapportés pour la latence de chaque action.
+CENTILES = [50, 90, 99]
+
+
+class SortieComptee(io.TextIOBase):
+    """Sortie qui écarte le texte affiché par l'application, en comptant les messages de `MESSAGES_SUIVIS`."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = Counter()
+
+    def write(self, texte):
+        for cle, message in MESSAGES_SUIVIS.items():
+            if message in texte:
+                self.messages[cle] += 1
+        return len(texte)
+
+
+def generer_sessions(nombre, nombre_actions, graine):
+    """Génère des scripts de sessions aléatoires.
+
+    Chaque session crée un compte, s'y connecte, effectue `nombre_actions` actions tirées selon
+    `MELANGE_ACTIONS`, puis se déconnecte et quitte l'application. Environ une propriété ajoutée sur dix
+    est un doublon d'une propriété déjà ajoutée par la session.
+
+    Args:
+        nombre (int): Le nombre de sessions.
+        nombre_actions (int): Le nombre d'actions de chaque session, entre la connexion et la déconnexion.
+        graine (int): La graine du générateur aléatoire (les mêmes arguments donnent les mêmes sessions).
+
+    Returns:
+        list of dict: Les scripts des sessions.
+    """
+    from configuration import FICHIER_VILLES, FICHIER_TYPES_PROPRIETE
+    from vocabulaire import charger_vocabulaire
+
+    villes = charger_vocabulaire(FICHIER_VILLES)["valeurs"]
+    types = charger_vocabulaire(FICHIER_TYPES_PROPRIETE)["valeurs"]
+    aleatoire = random.Random(graine)
+    noms_actions = list(MELANGE_ACTIONS)
+    poids = list(MELANGE_ACTIONS.values())
+
+    sessions = []
+    for numero in range(nombre):
+        utilisateur = f"charge{graine}_{numero}"
+        mot_de_passe = f"secret{aleatoire.randrange(10**6)}"
+        actions = [["creer_compte", ["3", utilisateur, mot_de_passe]], ["connexion", ["4", utilisateur, mot_de_passe]]]
+        ajouts = []
+
+        for nom in aleatoire.choices(noms_actions, poids, k=nombre_actions):
+            if nom == "lister":
+                actions.append([nom, ["1"]])
+            elif nom == "mes_proprietes":
+                actions.append([nom, ["6"]])
+            elif nom == "ajouter":
+                if ajouts and aleatoire.random() < 0.1:
+                    entrees = aleatoire.choice(ajouts)
+                else:
+                    entrees = [
+                        str(aleatoire.randrange(50_000, 5_000_000)),
+                        aleatoire.choice(villes),
+                        aleatoire.choice(types),
+                        str(aleatoire.randint(1, 6)),
+                        str(aleatoire.randint(1, 3)),
+                    ]
+                    ajouts.append(entrees)
+                actions.append([nom, ["3", *entrees]])
+            else:
+                option = aleatoire.choice("123456")
+                entrees = ["2", {"filtrer": "", "compter": "8", "trier": "9"}[nom], option]
+                entrees = [entree for entree in entrees if entree]
+                entrees += generer_criteres(aleatoire, option, villes, types)
+                if nom == "trier":
+                    entrees.append(aleatoire.choice("cd"))
+                actions.append([nom, entrees])
+
+        actions += [["deconnexion", ["4"]], ["quitter", ["5"]]]
+        sessions.append({"actions": actions})
+
+    return sessions
+
+
+def generer_criteres(aleatoire, option, villes, types):
+    """Génère les réponses aux questions de `demander_criteres` pour une option du menu de filtrage.
+
+    Args:
+        aleatoire (random.Random): Le générateur aléatoire.
+        option (str): L'option de filtrage ("1" à "6").
+        villes (list of str): Les villes permises.
+        types (list of str): Les types de propriété permis.
+
+    Returns:
+        list of str: Les réponses, dans l'ordre des questions.
+    """
+    prix_minimum = aleatoire.randrange(0, 2_000_000)
+    prix = [str(prix_minimum), str(prix_minimum + aleatoire.randrange(100_000, 3_000_000))]
+    chambres = [str(aleatoire.randint(1, 3)), str(aleatoire.randint(3, 6))]
+    salles_de_bains = [str(aleatoire.randint(1, 2)), ""]
+    # Les villes sont parfois saisies en minuscules et sans accents, comme le ferait un utilisateur.
+    ville = aleatoire.choice(villes)
+    ville = ville.lower() if aleatoire.random() < 0.5 else ville
+
+    if option == "1":
+        return prix
+    if option == "2":
+        return [ville]
+    if option == "3":
+        return [aleatoire.choice(types)]
+    if option == "4":
+        return chambres
+    if option == "5":
+        return salles_de_bains
+    return prix + [ville, "", *chambres, "", ""]
+
+
+def rejouer_session(session):
+    """Rejoue un script de session contre la boucle principale de l'application.
+
+    Args:
+        session (dict): Le script de la session (voir le format au début du module).
+
+    Returns:
+        dict: Le résultat du rejeu : "durees" (liste de paires (action, secondes)), "messages" (`Counter` des
+              messages de `MESSAGES_SUIVIS` affichés), "comptes_crees" (noms des comptes créés) et
+              "erreurs" (descriptions des actions désynchronisées ou en erreur).
+    """
+    from gestionnaire_utilisateurs import vider_session
+    from ift1004_solo_immo import main as main_application
+
+    actions = deque(session["actions"])
+    resultat = {"durees": [], "messages": Counter(), "comptes_crees": [], "erreurs": []}
+    sortie = SortieComptee()
+    courante = {"nom": None, "entrees": None, "reponses": deque(), "debut": 0.0}
+
+    def terminer_action():
+        if courante["nom"] is None:
+            return
+        resultat["durees"].append((courante["nom"], time.perf_counter() - courante["debut"]))
+        if courante["reponses"]:
+            resultat["erreurs"].append(
+                f"{courante['nom']}: {len(courante['reponses'])} réponse(s) inutilisée(s) (session désynchronisée)"
+            )
+        if courante["nom"] == "creer_compte" and sortie.messages["compte_cree"]:
+            resultat["comptes_crees"].append(courante["entrees"][1])
+        resultat["messages"].update(sortie.messages)
+        sortie.messages.clear()
+        courante["nom"] = None
+
+    def saisir(invite=""):
+        if invite == INVITE_MENU:
+            terminer_action()
+            if not actions:
+                raise EOFError
+            courante["nom"], courante["entrees"] = actions.popleft()
+            courante["reponses"] = deque(courante["entrees"])
+            courante["debut"] = time.perf_counter()
+        if not courante["reponses"]:
+            raise EOFError
+        return courante["reponses"].popleft()
+
+    input_original = builtins.input
+    builtins.input = saisir
+    try:
+        with contextlib.redirect_stdout(sortie):
+            main_application()
+        terminer_action()
+    except EOFError:
+        if courante["nom"] is not None:
+            resultat["erreurs"].append(f"{courante['nom']}: réponses épuisées ({', '.join(courante['entrees'])})")
+    except Exception as e:
+        resultat["erreurs"].append(f"{courante['nom']}: {type(e).__name__}: {e}")
+    finally:
+        builtins.input = input_original
+        vider_session()
+
+    return resultat
+
+
+def executer_charge(sessions, processus):
+    """Rejoue des sessions dans plusieurs processus en parallèle.
+
+    Les processus partagent le dossier de données indiqué par SOLOIMMO_DOSSIER_DONNEES.
+
+    Args:
+        sessions (list of dict): Les scripts des sessions.
+        processus (int): Le nombre de processus.
+
+    Returns:
+        tuple: (résultats de `rejouer_session` pour chaque session, durée totale en secondes).
+    """
+    debut = time.perf_counter()
+    with multiprocessing.Pool(processus) as bassin:
+        resultats = list(bassin.imap_unordered(rejouer_session, sessions))
+    return resultats, time.perf_counter() - debut
+
+
+def calculer_centile(valeurs_triees, centile):
+    """Retourne le centile d'une liste de valeurs triées (méthode du rang le plus proche).
+
+    Args:
+        valeurs_triees (list): Les valeurs, en ordre croissant (au moins une).
+        centile (float): Le centile voulu, entre 0 et 100.
+
+    Returns:
+        La valeur du centile.
+
+    Exemple:
+        >>> calculer_centile([1, 2, 3, 4], 50)
+        2
+    """
+    rang = max(1, -(-len(valeurs_triees) * centile // 100))
+    return valeurs_triees[int(rang) - 1]
+
+
+def afficher_rapport(resultats, duree_totale):
+    """Affiche la latence de chaque action (centiles, en millisecondes) et le résumé de la charge.
+
+    Args:
+        resultats (list of dict): Les résultats de `rejouer_session`.
+        duree_totale (float): La durée totale de la charge, en secondes.
+    """
+    from utilitaires import afficher_tableau
+
+    durees = {}
+    for resultat in resultats:
+        for action, duree in resultat["durees"]:
+            durees.setdefault(action, []).append(duree)
+
+    lignes = []
+    for action, valeurs in sorted(durees.items()):
+        valeurs.sort()
+        lignes.append(
+            [action, len(valeurs)]
+            + [f"{calculer_centile(valeurs, centile) * 1000:.1f}" for centile in CENTILES]
+            + [f"{valeurs[-1] * 1000:.1f}"]
+        )
+    afficher_tableau(lignes, ["Action", "Nombre", *(f"p{centile} (ms)" for centile in CENTILES), "Max (ms)"])
+
+    messages = sum((resultat["messages"] for resultat in resultats), Counter())
+    erreurs = [erreur for resultat in resultats for erreur in resultat["erreurs"]]
+    nombre_actions = sum(len(valeurs) for valeurs in durees.values())
+    afficher_tableau(
+        [
+            ["Sessions", len(resultats)],
+            ["Actions", nombre_actions],
+            ["Durée totale", f"{duree_totale:.2f} s"],
+            ["Débit", f"{nombre_actions / duree_totale:.1f} actions/s"],
+            ["Comptes créés", messages["compte_cree"]],
+            ["Connexions réussies", messages["connexion"]],
+            ["Propriétés ajoutées", messages["ajout"]],
+            ["Doublons rejetés", messages["doublon"]],
+            ["Erreurs", len(erreurs)],
+        ],
+        ["Charge", "Valeur"],
+    )
+    for erreur in erreurs[:10]:
+        print(f"Erreur: {erreur}")
+
+
+def verifier_integrite(nombre_initial, resultats):
+    """Vérifie la cohérence des fichiers de données après la charge.
+
+    Vérifications:
+    - Aucune ligne mal formée dans les fichiers des utilisateurs et des propriétés.
+    - Chaque nom d'utilisateur n'apparaît qu'une fois, et chaque compte créé est présent.
+    - Le filtre de Bloom contient tous les utilisateurs.
+    - Le nombre de propriétés correspond au nombre initial plus les ajouts confirmés.
+    - Aucune propriété n'est enregistrée en double, et l'ensemble des empreintes est exact.
+    - L'index des propriétaires correspond au contenu du fichier des propriétés.
+    - Les statistiques des propriétés portent sur le bon nombre de propriétés.
+
+    Args:
+        nombre_initial (int): Le nombre de propriétés avant la charge.
+        resultats (list of dict): Les résultats de `rejouer_session`.
+
+    Returns:
+        list: Une ligne [vérification, résultat ("OK" ou "ÉCHEC"), détail] par vérification.
+    """
+    from analyseur import iterer_lignes
+    from configuration import FICHIER_UTILISATEURS, FICHIER_FILTRE_UTILISATEURS
+    from empreintes import EMPREINTES, calculer_empreinte, synchroniser_empreintes
+    from filtre_bloom import filtre_peut_contenir
+    from gestionnaire_donnees import charger_utilisateurs, iterer_proprietes, entrees_index_proprietaires
+    from index_proprietaires import INDEX_PROPRIETAIRES, synchroniser_index_proprietaires
+    from statistiques import charger_statistiques
+
+    verifications = []
+
+    def verifier(nom, reussi, detail):
+        verifications.append([nom, "OK" if reussi else "ÉCHEC", detail])
+
+    erreurs_utilisateurs = []
+    erreurs_proprietes = []
+    utilisateurs = charger_utilisateurs(erreurs_utilisateurs)
+    proprietes = list(iterer_proprietes(erreurs=erreurs_proprietes))
+    verifier(
+        "Lignes mal formées",
+        not erreurs_utilisateurs and not erreurs_proprietes,
+        f"{len(erreurs_utilisateurs)} utilisateur(s), {len(erreurs_proprietes)} propriété(s)",
+    )
+
+    noms = [ligne.split(",", 1)[0] for _, ligne in iterer_lignes(FICHIER_UTILISATEURS)][1:]
+    verifier("Utilisateurs uniques", len(noms) == len(set(noms)), f"{len(noms) - len(set(noms))} doublon(s)")
+
+    comptes_crees = [nom for resultat in resultats for nom in resultat["comptes_crees"]]
+    manquants = [nom for nom in comptes_crees if nom not in utilisateurs]
+    verifier("Comptes créés enregistrés", not manquants, f"{len(comptes_crees)} créé(s), {len(manquants)} manquant(s)")
+
+    absents = [nom for nom in utilisateurs if not filtre_peut_contenir(FICHIER_FILTRE_UTILISATEURS, nom)]
+    verifier("Filtre de Bloom", not absents, f"{len(absents)} utilisateur(s) absent(s) du filtre")
+
+    ajouts = sum(resultat["messages"]["ajout"] for resultat in resultats)
+    verifier(
+        "Propriétés ajoutées",
+        len(proprietes) == nombre_initial + ajouts,
+        f"{nombre_initial} + {ajouts} ajout(s) confirmé(s), {len(proprietes)} enregistrée(s)",
+    )
+
+    empreintes = {calculer_empreinte(propriete) for propriete in proprietes}
+    verifier("Aucun doublon", len(empreintes) == len(proprietes), f"{len(proprietes) - len(empreintes)} doublon(s)")
+    synchroniser_empreintes()
+    verifier("Empreintes", EMPREINTES == empreintes, f"{len(EMPREINTES)} empreinte(s) enregistrée(s)")
+
+    synchroniser_index_proprietaires()
+    attendu = sorted(entrees_index_proprietaires())
+    obtenu = sorted((proprietaire, identifiant) for proprietaire, identifiants in INDEX_PROPRIETAIRES.items()
+                    for identifiant in identifiants)
+    verifier("Index des propriétaires", attendu == obtenu, f"{len(obtenu)} entrée(s), {len(attendu)} attendue(s)")
+
+    statistiques = charger_statistiques()
+    nombre_statistiques = statistiques["nombre"] if statistiques else None
+    verifier("Statistiques", nombre_statistiques == len(proprietes), f"{nombre_statistiques} propriété(s) comptée(s)")
+
+    return verifications
+
+
+def preparer_dossier(dossier):
+    """Crée le dossier de données au besoin et y copie les fichiers de données initiaux qui n'y sont pas.
+
+    Args:
+        dossier (str): Le dossier de données, ou `None` pour un nouveau dossier temporaire.
+
+    Returns:
+        Path: Le dossier de données.
+    """
+    dossier = Path(dossier) if dossier else Path(tempfile.mkdtemp(prefix="soloimmo-charge-"))
+    dossier.mkdir(parents=True, exist_ok=True)
+    dossier_application = Path(__file__).resolve().parent
+    for nom in FICHIERS_INITIAUX:
+        if not (dossier / nom).exists() and (dossier_application / nom).exists():
+            shutil.copyfile(dossier_application / nom, dossier / nom)
+    return dossier
+
+
+def charger_sessions(chemin_fichier):
+    """Charge des scripts de sessions d'un fichier JSON Lines.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier.
+
+    Returns:
+        list of dict: Les scripts des sessions.
+    """
+    with open(chemin_fichier, "r", encoding="utf-8") as fichier:
+        return [json.loads(ligne) for ligne in fichier if ligne.strip()]
+
+
+def ecrire_sessions(sessions, chemin_fichier, mode="w"):
+    """Écrit des scripts de sessions dans un fichier JSON Lines.
+
+    Args:
+        sessions (list of dict): Les scripts des sessions.
+        chemin_fichier (str): Le chemin du fichier.
+        mode (str): "w" pour remplacer le fichier, "a" pour ajouter les sessions à la fin.
+    """
+    with open(chemin_fichier, mode, encoding="utf-8") as fichier:
+        for session in sessions:
+            fichier.write(json.dumps(session, ensure_ascii=False) + "\n")
+
+
+def nommer_action(entrees, connecte):
+    """Nomme une action du menu principal d'après les réponses saisies, comme dans les sessions générées.
+
+    Args:
+        entrees (list of str): Les réponses de l'action, à commencer par le choix du menu principal.
+        connecte (bool): Indique si l'utilisateur était connecté au moment du choix.
+
+    Returns:
+        str: Le nom de l'action.
+    """
+    choix = entrees[0].strip()
+    if choix == "2" and len(entrees) > 1:
+        return {"7": "exporter", "8": "compter", "9": "trier"}.get(entrees[1].strip(), "filtrer")
+    noms = {
+        "1": "lister",
+        "2": "filtrer",
+        "3": "ajouter" if connecte else "creer_compte",
+        "4": "deconnexion" if connecte else "connexion",
+        "5": "quitter",
+        "6": "mes_proprietes" if connecte else "invalide",
+    }
+    return noms.get(choix, "invalide")
+
+
+def enregistrer_session(chemin_fichier):
+    """Exécute l'application de manière interactive et ajoute le script de la session à un fichier.
+
+    Args:
+        chemin_fichier (str): Le fichier JSON Lines auquel ajouter le script.
+    """
+    from gestionnaire_utilisateurs import utilisateur_est_connecte
+    from ift1004_solo_immo import main as main_application
+
+    actions = []
+    input_original = builtins.input
+
+    def saisir(invite=""):
+        if invite == INVITE_MENU:
+            actions.append({"connecte": utilisateur_est_connecte(), "entrees": []})
+        entree = input_original(invite)
+        if actions:
+            actions[-1]["entrees"].append(entree)
+        return entree
+
+    builtins.input = saisir
+    try:
+        main_application()
+    except (EOFError, KeyboardInterrupt):
+        print()
+    finally:
+        builtins.input = input_original
+
+    session = {
+        "actions": [[nommer_action(action["entrees"], action["connecte"]), action["entrees"]]
+                    for action in actions if action["entrees"]]
+    }
+    ecrire_sessions([session], chemin_fichier, mode="a")
+    print(f"Session de {len(session['actions'])} action(s) ajoutée à {chemin_fichier}.")
+
+
+def tests_generateur_charge():
+    from ift1004_solo_immo import main as main_application  # noqa: F401 (importe les modules à rediriger)
+    from utilitaires import dossier_donnees_temporaire
+
+    # Teste le nommage des actions enregistrées, selon que l'utilisateur est connecté ou non.
+    assert nommer_action(["3", "alice", "secret"], False) == "creer_compte"
+    assert nommer_action(["3", "250000"], True) == "ajouter"
+    assert nommer_action(["4"], True) == "deconnexion"
+    assert nommer_action(["4", "alice", "secret"], False) == "connexion"
+    assert nommer_action(["2", "8", "1"], False) == "compter"
+    assert nommer_action(["2", "9", "1"], True) == "trier"
+    assert nommer_action(["2", "7", "csv"], True) == "exporter"
+    assert nommer_action(["2", "1"], False) == "filtrer"
+    assert nommer_action(["6"], False) == "invalide"
+    assert nommer_action(["6"], True) == "mes_proprietes"
+    assert nommer_action([" 1 "], False) == "lister"
+
+    # Teste les centiles (méthode du rang le plus proche).
+    valeurs = list(range(1, 101))
+    assert [calculer_centile(valeurs, centile) for centile in [0, 1, 50, 90, 99, 100]] == [1, 1, 50, 90, 99, 100]
+    assert calculer_centile([1, 2, 3, 4], 50) == 2
+    assert calculer_centile([7], 99) == 7
+
+    with dossier_donnees_temporaire():
+        # Teste le rejeu d'une session générée, puis l'intégrité des données qu'elle a modifiées.
+        session = generer_sessions(1, 6, graine=1)[0]
+        resultat = rejouer_session(session)
+        assert resultat["erreurs"] == [], resultat["erreurs"]
+        assert [action for action, _ in resultat["durees"]] == [action for action, _ in session["actions"]]
+        assert resultat["comptes_crees"] == [session["actions"][0][1][1]]
+        assert resultat["messages"]["compte_cree"] == 1 and resultat["messages"]["connexion"] == 1
+        ajouts = sum(1 for action, _ in session["actions"] if action == "ajouter")
+        assert resultat["messages"]["ajout"] + resultat["messages"]["doublon"] == ajouts > 0
+        verifications = verifier_integrite(0, [resultat])
+        assert all(verification[1] == "OK" for verification in verifications), verifications
+
+        # Teste la détection d'une session désynchronisée (réponse inutilisée) et de réponses épuisées.
+        resultat = rejouer_session({"actions": [["lister", ["1", "superflue"]], ["quitter", ["5"]]]})
+        assert len(resultat["erreurs"]) == 1 and "inutilisée" in resultat["erreurs"][0]
+        resultat = rejouer_session({"actions": [["connexion", ["4", "alice"]]]})
+        assert len(resultat["erreurs"]) == 1 and "épuisées" in resultat["erreurs"][0]
+
+
+def main(arguments=None):
+    """Analyse les arguments de la ligne de commande et exécute la commande demandée.
+
+    Args:
+        arguments (list of str): Les arguments à analyser (par défaut, ceux de la ligne de commande).
+    """
+    analyseur = argparse.ArgumentParser(description="Générateur de charge de Solo Immo.")
+    analyseur.add_argument("commande", choices=["charge", "generer", "enregistrer", "tests"], help="La commande à exécuter.")
+    analyseur.add_argument("fichier", nargs="?", help="Le fichier des scripts de sessions (generer, enregistrer).")
+    analyseur.add_argument("--scripts", help="Les scripts de sessions à rejouer (par défaut, des sessions générées).")
+    analyseur.add_argument("--sessions", type=int, default=100, help="Le nombre de sessions générées.")
+    analyseur.add_argument("--actions", type=int, default=10, help="Le nombre d'actions par session générée.")
+    analyseur.add_argument("--processus", type=int, default=os.cpu_count(), help="Le nombre de processus.")
+    analyseur.add_argument("--graine", type=int, default=0, help="La graine des sessions générées.")
+    analyseur.add_argument("--dossier", help="Le dossier de données partagé (par défaut, un dossier temporaire).")
+    options = analyseur.parse_args(arguments)
+
+    if options.commande == "tests":
+        print("Exécution des tests unitaires du module 'generateur_charge'...")
+        tests_generateur_charge()
+        return print("Tests réussis!")
+
+    if options.commande in ["generer", "enregistrer"] and not options.fichier:
+        analyseur.error(f"la commande {options.commande} demande un fichier.")
+
+    if options.commande == "generer":
+        ecrire_sessions(generer_sessions(options.sessions, options.actions, options.graine), options.fichier)
+        return print(f"{options.sessions} session(s) écrite(s) dans {options.fichier}.")
+
+    # Le dossier de données doit être défini avant l'importation des modules de l'application.
+    dossier = preparer_dossier(options.dossier)
+    os.environ[VARIABLE_DOSSIER_DONNEES] = str(dossier)
+
+    if options.commande == "enregistrer":
+        return enregistrer_session(options.fichier)
+
+    from configuration import FICHIER_UTILISATEURS, FICHIER_PROPRIETES, FICHIER_SESSION
+    from gestionnaire_donnees import preparer_fichier_proprietes, iterer_proprietes
+    from utilitaires import afficher_tableau, garantir_existence_fichier
+
+    # Préparer les fichiers avant de lancer les processus, qui le feraient sinon tous en même temps.
+    for chemin_fichier in [FICHIER_UTILISATEURS, FICHIER_PROPRIETES, FICHIER_SESSION]:
+        garantir_existence_fichier(chemin_fichier)
+    preparer_fichier_proprietes()
+    nombre_initial = sum(1 for _ in iterer_proprietes())
+
+    if options.scripts:
+        sessions = charger_sessions(options.scripts)
+    else:
+        sessions = generer_sessions(options.sessions, options.actions, options.graine)
+
+    print(f"{len(sessions)} session(s) dans {options.processus} processus, dossier de données: {dossier}")
+    resultats, duree_totale = executer_charge(sessions, options.processus)
+    afficher_rapport(resultats, duree_totale)
+    afficher_tableau(verifier_integrite(nombre_initial, resultats), ["Vérification", "Résultat", "Détail"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,113 @@
 """
 Ce module est responsable de la gestion des données de l'application IFT-1004 Solo Immo,
 incluant le chargement et la sauvegarde des utilisateurs et des propriétés dans des fichiers texte.
+Les propriétés peuvent aussi être stockées en blocs compressés (voir `FORMAT_STOCKAGE_PROPRIETES`).
 
 Fonctions:
-- `charger_utilisateurs()`: Charge les utilisateurs depuis le fichier des utilisateurs.
+- `charger_utilisateurs(erreurs)`: Charge les utilisateurs depuis le fichier des utilisateurs.
 - `sauvegarder_utilisateurs(utilisateurs)`: Sauvegarde les utilisateurs dans le fichier des utilisateurs.
-- `charger_proprietes()`: Charge toutes les propriétés depuis le fichier des propriétés.
-- `sauvegarder_propriete(new_property)`: Sauvegarde une nouvelle propriété.
+- `ajouter_utilisateur(utilisateur, hash_mot_de_passe)`: Ajoute un utilisateur à la fin du fichier des utilisateurs.
+- `ajouter_utilisateurs(utilisateurs)`: Ajoute des utilisateurs à la fin du fichier des utilisateurs, en une seule écriture.
+- `charger_proprietes(erreurs)`: Charge toutes les propriétés depuis le fichier des propriétés.
+- `charger_colonnes_proprietes(erreurs)`: Charge toutes les propriétés colonne par colonne, sans dictionnaires.
+- `iterer_proprietes(criteres, erreurs)`: Parcourt les propriétés une à une, en appliquant des critères facultatifs.
+- `iterer_proprietes_triees(criteres, decroissant, budget_memoire, erreurs)`: Parcourt les propriétés par ordre
+  de prix, avec un tri externe dont la mémoire est bornée.
+- `iterer_lignes_proprietes(criteres)`: Parcourt les lignes des propriétés, selon le format de stockage.
+- `iterer_lignes_texte(debut)`: Parcourt les lignes du fichier texte des propriétés, avec leur décalage en octets.
+- `correspond_aux_criteres(propriete, criteres)`: Vérifie si une propriété correspond à des critères de filtrage.
+- `sauvegarder_propriete(nouvelle_propriete)`: Sauvegarde une nouvelle propriété, à moins qu'il ne s'agisse d'un doublon.
+- `sauvegarder_proprietes(proprietes)`: Sauvegarde un lot de propriétés en ignorant les doublons.
+- `ecrire_propriete(propriete)`: Ajoute une propriété au fichier et à l'index des propriétaires.
+- `analyser_ligne_propriete(ligne)`: Convertit une ligne du fichier des propriétés en dictionnaire.
+- `convertir_champs_propriete(champs)`: Convertit les champs d'une ligne du fichier des propriétés en dictionnaire.
+- `convertir_champs_en_valeurs(champs)`: Convertit les champs d'une ligne du fichier des propriétés en tuple.
+- `formater_ligne_propriete(propriete)`: Convertit une propriété en ligne du fichier des propriétés.
+- `lire_proprietes(identifiants)`: Lit des propriétés à partir de leurs identifiants.
+- `lire_proprietes_du_proprietaire(proprietaire)`: Lit les propriétés d'un propriétaire, en reconstruisant
+  l'index des propriétaires s'il est périmé.
+- `preparer_fichier_proprietes()`: Migre le fichier des propriétés vers le format avec propriétaire.
+- `convertir_proprietes_en_blocs()`: Crée le fichier de blocs compressés à partir du fichier texte.
+- `reconstruire_index_proprietaires()`: Reconstruit l'index des propriétaires à partir du fichier des propriétés.
+- `completer_index_proprietaires()`: Ajoute à l'index des propriétaires les propriétés qui lui manquent.
+- `entrees_index_proprietaires(debut)`: Parcourt les entrées attendues de l'index des propriétaires.
+- `longueur_proprietes()`: Retourne la longueur du fichier des propriétés, dans l'unité des identifiants.
+- `reconstruire_empreintes()`: Reconstruit l'ensemble des empreintes des propriétés enregistrées.
+- `reconstruire_statistiques()`: Recalcule les statistiques (histogrammes) des propriétés enregistrées.
+- `corriger_statistiques(nombre, signature)`: Recalcule les statistiques si elles ne correspondent plus aux propriétés.
+- `signature_proprietes()`: Retourne une signature qui change chaque fois que les propriétés enregistrées changent.
+- `compacter_proprietes()`: Récupère l'espace inutilisé du fichier des propriétés en blocs.
+- `dedupliquer_proprietes(erreurs)`: Retire les doublons du fichier des propriétés.
 
 Dépendances:
-- `configuration`: Pour accéder à des constantes globales comme les chemins des fichiers.
+- `os`: Pour se positionner à la fin du fichier des propriétés et vérifier l'existence de l'index.
+- `sys`: Pour interner les villes et les types de propriété.
+- `configuration`: Pour accéder à des constantes globales comme les chemins des fichiers et leur encodage.
+- `analyseur`: Pour lire et analyser rapidement les fichiers texte, en signalant les lignes mal formées.
+- `stockage_blocs`: Pour le format de stockage en blocs compressés, lorsqu'il est choisi dans la configuration.
+- `empreintes`: Pour détecter les propriétés déjà enregistrées.
+- `index_proprietaires`: Pour maintenir l'index des propriétés de chaque propriétaire.
+- `statistiques`: Pour maintenir les histogrammes qui servent à estimer les résultats d'un filtre.
+- `tri_externe`: Pour trier les propriétés par prix sans les charger en mémoire.
+- `utilitaires`: Pour verrouiller les fichiers de données entre processus.
 """
 
-from configuration import FICHIER_UTILISATEURS, FICHIER_PROPRIETES
+import os
+import sys
 
+from analyseur import iterer_lignes, decoder_ligne, analyser_lignes
+from configuration import (
+    BUDGET_MEMOIRE_TRI,
+    ENCODAGE_FICHIERS,
+    FICHIER_UTILISATEURS,
+    FICHIER_PROPRIETES,
+    FICHIER_INDEX_PROPRIETAIRES,
+    FICHIER_EMPREINTES,
+    FICHIER_STATISTIQUES,
+    FICHIER_PROPRIETES_BLOCS,
+    FORMAT_STOCKAGE_PROPRIETES,
+    TAILLE_BLOC_PROPRIETES,
+)
+from empreintes import calculer_empreinte, empreinte_existe, ajouter_empreinte, ecrire_empreintes
+from index_proprietaires import (
+    ajouter_au_index_proprietaires,
+    ajouter_entrees_manquantes,
+    ecrire_index_proprietaires,
+    identifiants_du_proprietaire,
+    longueur_indexee,
+)
+from statistiques import calculer_statistiques, ajouter_aux_statistiques, charger_statistiques, ecrire_statistiques
+from stockage_blocs import (
+    ecrire_blocs,
+    ajouter_ligne_bloc,
+    iterer_lignes_blocs,
+    lire_lignes_blocs,
+    charger_index_blocs,
+    compacter_blocs,
+    terminer_remplacement_blocs,
+)
+from tri_externe import trier_externe
+from utilitaires import verrouiller_fichier, dossier_donnees_temporaire, garantir_existence_fichier
 
-def charger_utilisateurs():
+EN_TETE_PROPRIETES = "prix,ville,type,chambres,salles_de_bains,proprietaire"
+
+# Colonnes des propriétés, dans l'ordre des champs du fichier des propriétés.
+COLONNES_PROPRIETES = EN_TETE_PROPRIETES.split(",")
+
+
+def charger_utilisateurs(erreurs=None):
     """Charge les utilisateurs depuis le fichier des utilisateurs.
 
+    Args:
+        erreurs (list): Liste à laquelle ajouter un triplet (décalage en octets, ligne, message) pour chaque
+                        ligne mal formée, qui est ignorée (voir `analyser_lignes`).
+
     Returns:
         dict: Un dictionnaire des utilisateurs avec leurs mots de passe hachés.
     """
-    utilisateurs = {}
-
-    with open(FICHIER_UTILISATEURS, "r") as fichier:
-        # Vérifier si le fichier n'est pas vide avant de sauter la ligne d'en-tête
-        if fichier.readline().strip():  # Lit et ignore l'en-tête s'il y en a un
-            for ligne in fichier:
-                ligne = ligne.strip()
-                if ligne:  # Ignorer les lignes vides
-                    utilisateur, hash_mot_de_passe = ligne.split(",")
-                    utilisateurs[utilisateur] = hash_mot_de_passe
-
-    return utilisateurs
+    lignes = iterer_lignes(FICHIER_UTILISATEURS)
+    next(lignes, None)  # Ignorer l'en-tête s'il y en a un
+    return dict(analyser_lignes(lignes, (2,), tuple, erreurs))
 
 
 def sauvegarder_utilisateurs(utilisateurs):
@@ -51,65 +126,851 @@ def sauvegarder_utilisateurs(utilisateurs):
     Le fichier est entièrement écrasé chaque fois que cette fonction est appelée.
     """
 
-    with open(FICHIER_UTILISATEURS, "w") as fichier:
+    with open(FICHIER_UTILISATEURS, "w", encoding=ENCODAGE_FICHIERS) as fichier:
         fichier.write("utilisateur,hash\n")
         for utilisateur, hash_mot_de_passe in utilisateurs.items():
             fichier.write(f"{utilisateur},{hash_mot_de_passe}\n")
 
 
-def charger_proprietes():
+def ajouter_utilisateur(utilisateur, hash_mot_de_passe):
+    """Ajoute un utilisateur à la fin du fichier des utilisateurs, sans réécrire les utilisateurs existants.
+
+    La ligne d'en-tête est écrite si le fichier est vide. L'appelant est responsable de vérifier que
+    le nom d'utilisateur est libre et de verrouiller le fichier (voir `verrouiller_fichier`).
+
+    Args:
+        utilisateur (str): Le nom du nouvel utilisateur.
+        hash_mot_de_passe (str): Le mot de passe haché du nouvel utilisateur.
+    """
+    ajouter_utilisateurs([(utilisateur, hash_mot_de_passe)])
+
+
+def ajouter_utilisateurs(utilisateurs):
+    """Ajoute des utilisateurs à la fin du fichier des utilisateurs, en une seule écriture.
+
+    La ligne d'en-tête est écrite si le fichier est vide. L'appelant est responsable de vérifier que
+    les noms d'utilisateur sont libres et de verrouiller le fichier (voir `verrouiller_fichier`).
+
+    Args:
+        utilisateurs (iterable): Des paires (nom d'utilisateur, mot de passe haché).
+    """
+    contenu = "".join(f"{utilisateur},{hash_mot_de_passe}\n" for utilisateur, hash_mot_de_passe in utilisateurs)
+    with open(FICHIER_UTILISATEURS, "a+b") as fichier:
+        if fichier.tell() == 0:
+            fichier.write(b"utilisateur,hash\n")
+        else:
+            fichier.seek(-1, os.SEEK_END)
+            if fichier.read(1) != b"\n":
+                fichier.write(b"\n")
+        fichier.write(contenu.encode(ENCODAGE_FICHIERS))
+
+
+def charger_proprietes(erreurs=None):
     """Charge et retourne la liste des propriétés disponibles depuis le fichier des propriétés.
 
     Cette fonction lit le fichier des propriétés contenant les informations des propriétés,
     avec chaque propriété sur une ligne distincte et les champs séparés par des virgules.
     La première ligne du fichier est une ligne d'en-tête qui est ignorée.
 
-    Chaque ligne de propriété est convertie en un dictionnaire contenant les champs suivants :
+    Chaque ligne de propriété est convertie en dictionnaire par `convertir_champs_propriete`;
+    les lignes mal formées sont ignorées.
+
+    Args:
+        erreurs (list): Liste à laquelle ajouter un triplet (position, ligne, message) pour chaque
+                        ligne mal formée (voir `iterer_proprietes`).
+
+    Returns:
+        list: Une liste de dictionnaires, où chaque dictionnaire représente une propriété.
+               Si le fichier est vide, une liste vide est retournée.
+    """
+    return list(iterer_proprietes(erreurs=erreurs))
+
+
+def charger_colonnes_proprietes(erreurs=None):
+    """Charge toutes les propriétés colonne par colonne, sans construire de dictionnaire par propriété.
+
+    Les champs de chaque ligne sont convertis en tuple (voir `convertir_champs_en_valeurs`), puis les tuples
+    sont transposés en colonnes. C'est la forme utilisée pour construire les index bitmap et compter les
+    propriétés; une propriété n'est convertie en dictionnaire que si elle doit être affichée.
+
+    Args:
+        erreurs (list): Liste à laquelle ajouter les lignes mal formées (voir `iterer_proprietes`).
+
+    Returns:
+        dict: Chaque colonne de `COLONNES_PROPRIETES` associée au tuple de ses valeurs, dans l'ordre
+              d'enregistrement des propriétés.
+    """
+    valeurs = list(analyser_lignes(iterer_lignes_proprietes(), (5, 6), convertir_champs_en_valeurs, erreurs))
+    if not valeurs:
+        return {colonne: () for colonne in COLONNES_PROPRIETES}
+    return dict(zip(COLONNES_PROPRIETES, zip(*valeurs)))
+
+
+def iterer_proprietes(criteres=None, erreurs=None):
+    """Parcourt les propriétés enregistrées en les produisant une à une.
+
+    Contrairement à `charger_proprietes`, aucune liste n'est construite : la mémoire utilisée ne dépend
+    pas du nombre de propriétés. Avec le stockage en blocs, les blocs qui ne peuvent contenir aucune
+    propriété correspondant aux critères de prix ou de ville ne sont pas lus.
+
+    Args:
+        criteres (dict): Critères de filtrage facultatifs (voir `correspond_aux_criteres`).
+        erreurs (list): Liste à laquelle ajouter un triplet (position, ligne, message) pour chaque ligne
+                        mal formée, qui est ignorée. La position est le décalage en octets de la ligne
+                        dans le fichier texte, ou son numéro avec le stockage en blocs.
+
+    Yields:
+        dict: Les propriétés correspondant aux critères, dans leur ordre d'enregistrement.
+    """
+    criteres = criteres or {}
+
+    for propriete in analyser_lignes(iterer_lignes_proprietes(criteres), (5, 6), convertir_champs_propriete, erreurs):
+        if correspond_aux_criteres(propriete, criteres):
+            yield propriete
+
+
+def iterer_proprietes_triees(criteres=None, decroissant=False, budget_memoire=BUDGET_MEMOIRE_TRI, erreurs=None):
+    """Parcourt les propriétés correspondant aux critères par ordre de prix, sans les charger toutes en mémoire.
+
+    Les propriétés retenues sont triées par un tri externe (voir `trier_externe`) : au plus `budget_memoire`
+    octets de lignes sont conservés en mémoire, le reste étant écrit dans des fichiers temporaires. Les
+    propriétés de même prix restent dans leur ordre d'enregistrement.
+
+    Args:
+        criteres (dict): Critères de filtrage facultatifs (voir `correspond_aux_criteres`).
+        decroissant (bool): Parcourt les propriétés du prix le plus élevé au prix le plus bas.
+        budget_memoire (int): La mémoire allouée à chaque lot du tri externe, en octets.
+        erreurs (list): Liste à laquelle ajouter les lignes mal formées (voir `iterer_proprietes`).
+
+    Yields:
+        dict: Les propriétés correspondant aux critères, par ordre de prix.
+    """
+    lignes = (formater_ligne_propriete(propriete)[:-1] for propriete in iterer_proprietes(criteres, erreurs))
+    for ligne in trier_externe(lignes, prix_de_ligne, budget_memoire, decroissant):
+        yield analyser_ligne_propriete(ligne)
+
+
+def prix_de_ligne(ligne):
+    """Retourne le prix d'une ligne du fichier des propriétés (la clé du tri par prix).
+
+    Args:
+        ligne (str): La ligne, au format de `formater_ligne_propriete`.
+
+    Returns:
+        int: Le prix de la propriété.
+    """
+    return int(ligne.split(",", 1)[0])
+
+
+def iterer_lignes_proprietes(criteres=None):
+    """Parcourt les lignes des propriétés enregistrées, dans le fichier texte ou dans les blocs compressés.
+
+    Args:
+        criteres (dict): Critères de filtrage facultatifs. Avec le stockage en blocs, les blocs qui ne peuvent
+                         contenir aucune ligne correspondant aux critères de prix ou de ville ne sont pas lus;
+                         les lignes produites doivent tout de même être vérifiées (voir `correspond_aux_criteres`).
+
+    Yields:
+        tuple: (position de la ligne, ligne), comme `iterer_lignes_texte` ou `iterer_lignes_blocs`.
+    """
+    criteres = criteres or {}
+    if FORMAT_STOCKAGE_PROPRIETES == "blocs":
+        yield from iterer_lignes_blocs(
+            FICHIER_PROPRIETES_BLOCS, criteres.get("prix_minimum"), criteres.get("prix_maximum"), criteres.get("ville")
+        )
+    else:
+        yield from iterer_lignes_texte()
+
+
+def iterer_lignes_texte(debut=0):
+    """Parcourt les lignes de propriétés du fichier texte des propriétés, en ignorant l'en-tête.
+
+    Args:
+        debut (int): Le décalage en octets de la première ligne à lire; l'en-tête n'est ignoré que si la
+                     lecture commence au début du fichier.
+
+    Yields:
+        tuple: (décalage en octets de la ligne, ligne), pour les lignes non vides, sans espaces ni saut
+               de ligne aux extrémités.
+    """
+    lignes = iterer_lignes(FICHIER_PROPRIETES, debut=debut)
+    if debut == 0:
+        next(lignes, None)  # Ignorer l'en-tête
+    yield from lignes
+
+
+def correspond_aux_criteres(propriete, criteres):
+    """Vérifie si une propriété correspond à des critères de filtrage.
+
+    Args:
+        propriete (dict): La propriété à vérifier.
+        criteres (dict): Les critères de filtrage. Les clés reconnues sont "prix_minimum", "prix_maximum",
+                         "ville", "type", "chambres_minimum", "chambres_maximum", "salles_de_bains_minimum"
+                         et "salles_de_bains_maximum". Un critère absent ou à `None` n'est pas appliqué.
+
+    Returns:
+        bool: True si la propriété respecte tous les critères, False sinon.
+    """
+    if criteres.get("ville") and propriete["ville"] != criteres["ville"]:
+        return False
+    if criteres.get("type") and propriete["type"] != criteres["type"]:
+        return False
+    for colonne in ["prix", "chambres", "salles_de_bains"]:
+        minimum = criteres.get(f"{colonne}_minimum")
+        maximum = criteres.get(f"{colonne}_maximum")
+        if (minimum is not None and propriete[colonne] < minimum) or (maximum is not None and propriete[colonne] > maximum):
+            return False
+    return True
+
+
+def analyser_ligne_propriete(ligne):
+    """Convertit une ligne du fichier des propriétés en dictionnaire.
+
+    Le dictionnaire retourné contient les champs suivants :
         - "prix" (int) : Prix de la propriété.
         - "ville" (str) : Ville où se situe la propriété.
         - "type" (str) : Type de la propriété (par exemple, Maison ou Condo).
         - "chambres" (int) : Nombre de chambres dans la propriété.
         - "salles_de_bains" (int) : Nombre de salles de bains dans la propriété.
+        - "proprietaire" (str) : Nom de l'utilisateur qui a ajouté la propriété (vide si inconnu).
+
+    Les valeurs numériques (prix, chambres, salles de bains) sont converties en entiers. Les villes et les
+    types sont internés (`sys.intern`) : toutes les propriétés d'une même ville partagent la même chaîne.
+    Une ligne de l'ancien format, sans propriétaire, reçoit un propriétaire vide.
+
+    Args:
+        ligne (str): La ligne à analyser, sans caractère de fin de ligne.
+
+    Returns:
+        dict: La propriété correspondante.
+    """
+    return convertir_champs_propriete(ligne.split(","))
 
-    Les valeurs numériques (prix, chambres, salles de bains) sont converties en entiers.
+
+def convertir_champs_propriete(champs):
+    """Convertit les champs d'une ligne du fichier des propriétés en dictionnaire (voir `analyser_ligne_propriete`).
+
+    Args:
+        champs (list of str): Les 5 ou 6 champs de la ligne.
 
     Returns:
-        list: Une liste de dictionnaires, où chaque dictionnaire représente une propriété.
-               Si le fichier est vide, une liste vide est retournée.
+        dict: La propriété correspondante.
+
+    Raises:
+        ValueError: Si le nombre de champs est incorrect ou si un champ numérique n'est pas un entier.
     """
-    proprietes = []
+    prix, ville, type_propriete, chambres, salles_de_bains, proprietaire = convertir_champs_en_valeurs(champs)
+    return {
+        "prix": prix,
+        "ville": ville,
+        "type": type_propriete,
+        "chambres": chambres,
+        "salles_de_bains": salles_de_bains,
+        "proprietaire": proprietaire,
+    }
 
-    with open(FICHIER_PROPRIETES, "r") as fichier:
-        if not fichier.readline().strip():
-            return proprietes
-        for ligne in fichier:
-            ligne = ligne.strip()
-            if ligne:
-                prix, ville, type_propriete, chambres, salles_de_bains = ligne.split(",")
-                propriete = {"prix": int(prix), "ville": ville, "type": type_propriete, "chambres": int(chambres), "salles_de_bains": int(salles_de_bains)}
-                proprietes.append(propriete)
 
-    return proprietes
+def convertir_champs_en_valeurs(champs):
+    """Convertit les champs d'une ligne du fichier des propriétés en tuple, dans l'ordre de `COLONNES_PROPRIETES`.
+
+    Les conversions sont celles de `analyser_ligne_propriete`, sans construire de dictionnaire.
+
+    Args:
+        champs (list of str): Les 5 ou 6 champs de la ligne.
+
+    Returns:
+        tuple: (prix, ville, type, chambres, salles de bains, propriétaire).
+
+    Raises:
+        ValueError: Si le nombre de champs est incorrect ou si un champ numérique n'est pas un entier.
+    """
+    if len(champs) == 5:
+        champs = [*champs, ""]
+    prix, ville, type_propriete, chambres, salles_de_bains, proprietaire = champs
+    return int(prix), sys.intern(ville), sys.intern(type_propriete), int(chambres), int(salles_de_bains), proprietaire
+
+
+def formater_ligne_propriete(propriete):
+    """Convertit une propriété en ligne du fichier des propriétés (format CSV).
+
+    Args:
+        propriete (dict): La propriété à convertir.
+
+    Returns:
+        str: La ligne correspondante, terminée par un saut de ligne.
+    """
+    return (
+        f"{propriete['prix']},{propriete['ville']},{propriete['type']},"
+        f"{propriete['chambres']},{propriete['salles_de_bains']},{propriete.get('proprietaire', '')}\n"
+    )
 
 
 def sauvegarder_propriete(nouvelle_propriete):
-    """Sauvegarde une nouvelle propriété.
+    """Sauvegarde une nouvelle propriété, à moins qu'elle n'ait déjà été enregistrée.
+
+    L'empreinte de la propriété (voir `calculer_empreinte`) est comparée à l'ensemble des empreintes
+    des propriétés enregistrées : un doublon est rejeté sans toucher au fichier des propriétés.
+    Les statistiques des propriétés sont mises à jour.
 
     Args:
         nouvelle_propriete (dict): Dictionnaire contenant les informations de la nouvelle propriété.
+
+    Returns:
+        int or None: L'identifiant de la propriété (voir `ecrire_propriete`), ou `None` si elle
+                     était déjà enregistrée.
+    """
+    empreinte = calculer_empreinte(nouvelle_propriete)
+
+    with verrouiller_fichier(FICHIER_EMPREINTES):
+        if empreinte_existe(empreinte):
+            return None
+        identifiant = ecrire_propriete(nouvelle_propriete)
+        ajouter_empreinte(empreinte)
+
+        statistiques = charger_statistiques()
+        if statistiques is not None:
+            ajouter_aux_statistiques(statistiques, nouvelle_propriete)
+            ecrire_statistiques(statistiques)
+
+    return identifiant
+
+
+def sauvegarder_proprietes(proprietes):
+    """Sauvegarde un lot de propriétés (par exemple, l'importation d'un flux), en rejetant les doublons.
+
+    Les propriétés sont lues en continu; un doublon d'une propriété déjà enregistrée, ou d'une propriété
+    précédente du même lot, est ignoré. Les statistiques des propriétés sont mises à jour une seule fois,
+    à la fin du lot, même si le parcours du lot est interrompu par une exception : elles portent alors sur
+    les propriétés déjà écrites.
+
+    Args:
+        proprietes (iterable): Les propriétés à sauvegarder.
+
+    Returns:
+        tuple: (nombre de propriétés ajoutées, nombre de doublons ignorés).
+    """
+    ajoutees = doublons = 0
+
+    with verrouiller_fichier(FICHIER_EMPREINTES):
+        statistiques = charger_statistiques()
+        try:
+            for propriete in proprietes:
+                empreinte = calculer_empreinte(propriete)
+                if empreinte_existe(empreinte):
+                    doublons += 1
+                    continue
+                ecrire_propriete(propriete)
+                ajouter_empreinte(empreinte)
+                if statistiques is not None:
+                    ajouter_aux_statistiques(statistiques, propriete)
+                ajoutees += 1
+        finally:
+            if statistiques is not None and ajoutees:
+                ecrire_statistiques(statistiques)
+
+    return ajoutees, doublons
+
+
+def ecrire_propriete(propriete):
+    """Ajoute une propriété à la fin du fichier des propriétés, sans vérifier les doublons.
+
+    La propriété est également ajoutée à l'index des propriétaires, sous l'identifiant retourné, avec la
+    nouvelle longueur du fichier (même sans propriétaire). Un arrêt brutal entre les deux écritures laisse
+    une propriété absente de l'index, ajoutée ensuite par `completer_index_proprietaires`.
+
+    Args:
+        propriete (dict): La propriété à écrire.
+
+    Returns:
+        int: L'identifiant de la propriété : le décalage en octets de sa ligne dans le fichier texte,
+             ou son numéro de ligne avec le stockage en blocs.
+    """
+    if FORMAT_STOCKAGE_PROPRIETES == "blocs":
+        identifiant = ajouter_ligne_bloc(
+            FICHIER_PROPRIETES_BLOCS,
+            formater_ligne_propriete(propriete),
+            propriete["prix"],
+            propriete["ville"],
+            TAILLE_BLOC_PROPRIETES,
+        )
+        ajouter_au_index_proprietaires(propriete.get("proprietaire", ""), identifiant, identifiant + 1)
+        return identifiant
+
+    with verrouiller_fichier(FICHIER_PROPRIETES):
+        with open(FICHIER_PROPRIETES, "a+b") as fichier:
+            if fichier.tell() == 0:
+                # Écrire la ligne d'en-tête
+                fichier.write(f"{EN_TETE_PROPRIETES}\n".encode(ENCODAGE_FICHIERS))
+            else:
+                fichier.seek(-1, os.SEEK_END)
+                if fichier.read(1) != b"\n":
+                    fichier.write(b"\n")
+
+            identifiant = fichier.tell()
+            fichier.write(formater_ligne_propriete(propriete).encode(ENCODAGE_FICHIERS))
+            longueur = fichier.tell()
+
+        ajouter_au_index_proprietaires(propriete.get("proprietaire", ""), identifiant, longueur)
+
+    return identifiant
+
+
+def lire_proprietes(identifiants):
+    """Lit les propriétés correspondant à des identifiants, sans parcourir le reste du fichier.
+
+    Chaque identifiant est vérifié avant d'être utilisé : dans le fichier texte, le décalage doit être celui
+    du début d'une ligne de propriété bien formée (précédé d'un saut de ligne); avec le stockage en blocs, le
+    numéro doit désigner une ligne existante. Un identifiant périmé (par exemple, après une modification
+    manuelle du fichier) est ainsi refusé plutôt que de produire une propriété tronquée.
+
+    Args:
+        identifiants (iterable of int): Les identifiants des propriétés à lire (voir `sauvegarder_propriete`).
+
+    Returns:
+        list: Les propriétés correspondantes, dans l'ordre des identifiants.
+
+    Raises:
+        ValueError: Si un identifiant ne désigne pas le début d'une propriété bien formée.
+    """
+    if FORMAT_STOCKAGE_PROPRIETES == "blocs":
+        return [analyser_ligne_propriete(ligne) for ligne in lire_lignes_blocs(FICHIER_PROPRIETES_BLOCS, identifiants)]
+
+    proprietes = []
+
+    with open(FICHIER_PROPRIETES, "rb") as fichier:
+        for identifiant in identifiants:
+            ligne = ""
+            if identifiant > 0:
+                fichier.seek(identifiant - 1)
+                if fichier.read(1) == b"\n":
+                    ligne = decoder_ligne(fichier.readline()).strip()
+            if not ligne:
+                raise ValueError(f"Identifiant de propriété invalide: {identifiant}")
+            proprietes.append(analyser_ligne_propriete(ligne))
+
+    return proprietes
+
+
+def lire_proprietes_du_proprietaire(proprietaire):
+    """Lit les propriétés d'un propriétaire à partir de l'index des propriétaires.
+
+    Les propriétés ajoutées au fichier sans l'être à l'index sont d'abord ajoutées à l'index (voir
+    `completer_index_proprietaires`). Si l'index ne correspond plus au fichier des propriétés (un identifiant
+    invalide, ou une propriété d'un autre propriétaire), il est reconstruit, puis la lecture est reprise.
+
+    Args:
+        proprietaire (str): Le nom du propriétaire.
+
+    Returns:
+        list: Ses propriétés, dans leur ordre d'ajout.
+    """
+    try:
+        completer_index_proprietaires()
+        proprietes = lire_proprietes(identifiants_du_proprietaire(proprietaire))
+        if all(propriete["proprietaire"] == proprietaire for propriete in proprietes):
+            return proprietes
+    except ValueError:
+        pass
+
+    reconstruire_index_proprietaires()
+    return lire_proprietes(identifiants_du_proprietaire(proprietaire))
+
+
+def preparer_fichier_proprietes():
+    """Met à niveau le fichier des propriétés et s'assure que l'index des propriétaires existe.
+
+    Un fichier de l'ancien format (sans colonne « proprietaire ») est réécrit, dans `ENCODAGE_FICHIERS`, avec
+    la nouvelle ligne d'en-tête et un propriétaire vide pour chaque propriété existante. Avec le stockage en blocs, le fichier
+    de blocs est créé à partir du fichier texte s'il n'existe pas encore, et un remplacement du fichier de blocs
+    interrompu est achevé (voir `terminer_remplacement_blocs`). L'index des propriétaires est
+    reconstruit après une telle migration ou conversion, ou s'il est absent; il en va de même pour
+    l'ensemble des empreintes et pour les statistiques des propriétés. Sinon, les propriétés qui manquent à
+    l'index des propriétaires, après un arrêt brutal, lui sont ajoutées.
+
+    Returns:
+        bool: True si le fichier des propriétés a été migré, False s'il était déjà à jour.
+    """
+    with verrouiller_fichier(FICHIER_PROPRIETES):
+        en_tete = next(iterer_lignes(FICHIER_PROPRIETES), (0, EN_TETE_PROPRIETES))[1]
+        migration = en_tete != EN_TETE_PROPRIETES
+        if migration:
+            fichier_temporaire = f"{FICHIER_PROPRIETES}.tmp"
+            with open(fichier_temporaire, "w", encoding=ENCODAGE_FICHIERS) as fichier:
+                fichier.write(f"{EN_TETE_PROPRIETES}\n")
+                for propriete in analyser_lignes(iterer_lignes_texte(), (5, 6), convertir_champs_propriete):
+                    fichier.write(formater_ligne_propriete(propriete))
+            os.replace(fichier_temporaire, FICHIER_PROPRIETES)
+
+    if FORMAT_STOCKAGE_PROPRIETES == "blocs":
+        if terminer_remplacement_blocs(FICHIER_PROPRIETES_BLOCS):
+            migration = True
+        if not os.path.isfile(f"{FICHIER_PROPRIETES_BLOCS}.idx"):
+            convertir_proprietes_en_blocs()
+            migration = True
+
+    if migration or not os.path.isfile(FICHIER_INDEX_PROPRIETAIRES):
+        reconstruire_index_proprietaires()
+    else:
+        completer_index_proprietaires()
+    if migration or not os.path.isfile(FICHIER_EMPREINTES):
+        reconstruire_empreintes()
+    if migration or not os.path.isfile(FICHIER_STATISTIQUES):
+        reconstruire_statistiques()
+    return migration
+
+
+def convertir_proprietes_en_blocs():
+    """Crée le fichier de blocs compressés à partir du fichier texte des propriétés.
+
+    Le fichier texte est lu en continu et n'est pas modifié; un fichier de blocs existant est remplacé.
+
+    Returns:
+        int: Le nombre de propriétés converties.
+    """
+    return ecrire_blocs(
+        FICHIER_PROPRIETES_BLOCS,
+        (
+            (formater_ligne_propriete(propriete), propriete["prix"], propriete["ville"])
+            for propriete in analyser_lignes(iterer_lignes_texte(), (5, 6), convertir_champs_propriete)
+        ),
+        TAILLE_BLOC_PROPRIETES,
+    )
+
+
+def reconstruire_index_proprietaires():
+    """Reconstruit l'index des propriétaires en parcourant toutes les propriétés enregistrées.
+
+    La longueur indexée est celle du fichier avant le parcours : une propriété ajoutée pendant le parcours par
+    un autre processus, dont l'entrée serait perdue lors du remplacement de l'index, est donc rattrapée par
+    `completer_index_proprietaires`.
+    """
+    if FORMAT_STOCKAGE_PROPRIETES == "blocs":
+        longueur = longueur_proprietes()
+        return ecrire_index_proprietaires(list(entrees_index_proprietaires()), longueur)
+
+    with verrouiller_fichier(FICHIER_PROPRIETES):
+        longueur = longueur_proprietes()
+        ecrire_index_proprietaires(list(entrees_index_proprietaires()), longueur)
+
+
+def completer_index_proprietaires():
+    """Ajoute à l'index des propriétaires les propriétés enregistrées après la longueur qu'il couvre.
+
+    Une propriété est écrite avant son entrée dans l'index (voir `ecrire_propriete`) : après un arrêt brutal
+    entre les deux, le fichier des propriétés dépasse la longueur indexée. Dans le cas habituel, les deux
+    longueurs sont égales et seule la fin de l'index est lue. Sinon, les propriétés qui suivent la longueur
+    indexée sont relues sous le verrou des ajouts, ce qui écarte aussi un ajout en cours, et leurs entrées
+    manquantes sont ajoutées. Un index sans longueur (version précédente), ou plus long que le fichier
+    (fichier réécrit sans lui), est reconstruit.
+
+    Returns:
+        int: Le nombre d'entrées ajoutées (0 si l'index était à jour ou a été reconstruit).
+    """
+    if longueur_indexee() == longueur_proprietes():
+        return 0
+
+    with verrouiller_fichier(FICHIER_EMPREINTES):
+        debut, fin = longueur_indexee(), longueur_proprietes()
+        if debut == fin:
+            return 0
+        if debut is None or debut > fin:
+            reconstruire_index_proprietaires()
+            return 0
+        return ajouter_entrees_manquantes(list(entrees_index_proprietaires(debut)), fin)
+
+
+def entrees_index_proprietaires(debut=0):
+    """Parcourt les propriétés enregistrées et produit les entrées attendues de l'index des propriétaires.
+
+    Args:
+        debut (int): L'identifiant à partir duquel parcourir les propriétés (voir `longueur_proprietes`).
+
+    Yields:
+        tuple: (propriétaire, identifiant) pour chaque propriété ayant un propriétaire.
     """
-    # Charger les propriétés existantes
-    proprietes = charger_proprietes()
+    if FORMAT_STOCKAGE_PROPRIETES == "blocs":
+        lignes = iterer_lignes_blocs(FICHIER_PROPRIETES_BLOCS, debut=debut)
+    else:
+        lignes = iterer_lignes_texte(debut)
 
-    proprietes.append(nouvelle_propriete)
+    for identifiant, ligne in lignes:
+        proprietaire = ligne.rpartition(",")[2]
+        if proprietaire:
+            yield proprietaire, identifiant
 
-    with open(FICHIER_PROPRIETES, "w") as fichier:
-        # Écrire la ligne d'en-tête
-        fichier.write("prix,ville,type,chambres,salles_de_bains\n")
 
-        for propriete in proprietes:
-            # Écrire chaque propriété en format CSV
-            fichier.write(
-                f"{propriete['prix']},{propriete['ville']},{propriete['type']},"
-                f"{propriete['chambres']},{propriete['salles_de_bains']}\n"
+def longueur_proprietes():
+    """Retourne la longueur du fichier des propriétés, dans l'unité de leurs identifiants.
+
+    Returns:
+        int: La taille du fichier texte en octets, ou le nombre de lignes avec le stockage en blocs
+             (0 si le fichier n'existe pas).
+    """
+    if FORMAT_STOCKAGE_PROPRIETES == "blocs":
+        return sum(bloc["nombre"] for bloc in charger_index_blocs(FICHIER_PROPRIETES_BLOCS)["blocs"])
+    try:
+        return os.path.getsize(FICHIER_PROPRIETES)
+    except FileNotFoundError:
+        return 0
+
+
+def reconstruire_empreintes():
+    """Reconstruit l'ensemble des empreintes en parcourant toutes les propriétés enregistrées.
+
+    Returns:
+        int: Le nombre d'empreintes distinctes.
+    """
+    with verrouiller_fichier(FICHIER_EMPREINTES):
+        empreintes = {calculer_empreinte(propriete) for propriete in iterer_proprietes()}
+        ecrire_empreintes(empreintes)
+    return len(empreintes)
+
+
+def reconstruire_statistiques():
+    """Recalcule les statistiques (histogrammes) en parcourant toutes les propriétés enregistrées.
+
+    Returns:
+        int: Le nombre de propriétés.
+    """
+    with verrouiller_fichier(FICHIER_EMPREINTES):
+        statistiques = calculer_statistiques(iterer_proprietes())
+        ecrire_statistiques(statistiques)
+    return statistiques["nombre"]
+
+
+def corriger_statistiques(nombre, signature):
+    """Recalcule les statistiques si elles ne portent plus sur le nombre de propriétés chargées (par exemple,
+    après une modification manuelle du fichier).
+
+    Le recalcul est fait sous le verrou des ajouts, et seulement si le fichier n'a pas changé depuis le chargement
+    des propriétés. Sinon, un autre processus a ajouté des propriétés entre-temps : les propriétés chargées sont
+    périmées, alors que les statistiques ont été tenues à jour par l'ajout. Comme ce cas est rare, les propriétés
+    sont alors relues en continu, plutôt que d'être conservées par l'appelant sous forme de dictionnaires.
+
+    Args:
+        nombre (int): Le nombre de propriétés chargées.
+        signature (tuple): La signature du fichier des propriétés avant leur chargement (voir `signature_proprietes`).
+
+    Returns:
+        bool: True si les statistiques ont été recalculées.
+    """
+    statistiques = charger_statistiques()
+    if statistiques is not None and statistiques["nombre"] == nombre:
+        return False
+
+    with verrouiller_fichier(FICHIER_EMPREINTES):
+        if signature_proprietes() != signature:
+            return False
+        ecrire_statistiques(calculer_statistiques(iterer_proprietes()))
+    return True
+
+
+def signature_proprietes():
+    """Retourne une signature du fichier des propriétés, qui change chaque fois qu'une propriété est ajoutée
+    ou que le fichier est réécrit.
+
+    Cette signature permet de conserver des données calculées à partir des propriétés (par exemple, leurs
+    index bitmap) tant que le fichier ne change pas.
+
+    Returns:
+        tuple or None: (inode, taille, date de modification) du fichier texte, ou de l'index des blocs avec le
+                       stockage en blocs; `None` si le fichier n'existe pas.
+    """
+    chemin_fichier = f"{FICHIER_PROPRIETES_BLOCS}.idx" if FORMAT_STOCKAGE_PROPRIETES == "blocs" else FICHIER_PROPRIETES
+    try:
+        etat = os.stat(chemin_fichier)
+    except FileNotFoundError:
+        return None
+    return etat.st_ino, etat.st_size, etat.st_mtime_ns
+
+
+def compacter_proprietes():
+    """Récupère l'espace inutilisé du fichier des propriétés en blocs (voir `compacter_blocs`).
+
+    Les numéros des propriétés ne changent pas : l'index des propriétaires et les empreintes restent valides.
+
+    Returns:
+        int or None: Le nombre d'octets récupérés, ou `None` avec le stockage texte, qui n'a rien à compacter.
+    """
+    if FORMAT_STOCKAGE_PROPRIETES != "blocs":
+        return None
+    return compacter_blocs(FICHIER_PROPRIETES_BLOCS)
+
+
+def dedupliquer_proprietes(erreurs=None):
+    """Retire les doublons du fichier des propriétés, en conservant la première occurrence de chaque propriété.
+
+    Le fichier est réécrit en continu dans un fichier temporaire qui remplace ensuite l'original; seules les
+    empreintes des propriétés conservées sont gardées en mémoire. L'ensemble des empreintes et l'index des
+    propriétaires sont reconstruits, puisque les identifiants des propriétés changent, de même que les
+    statistiques des propriétés. Les lignes mal formées ne sont pas recopiées.
+
+    Avec le stockage en blocs, le fichier de données est remplacé avant son index (voir `ecrire_blocs`).
+
+    Args:
+        erreurs (list): Liste à laquelle ajouter un triplet (position, ligne, message) pour chaque ligne
+                        mal formée retirée (voir `iterer_proprietes`).
+
+    Returns:
+        tuple: (nombre de propriétés conservées, nombre de doublons retirés).
+    """
+    empreintes = set()
+    statistiques = calculer_statistiques([])
+    doublons = 0
+
+    def lignes_uniques(lignes):
+        nonlocal doublons
+        proprietes = analyser_lignes(
+            lignes, (5, 6), lambda champs: (",".join(champs), convertir_champs_propriete(champs)), erreurs
+        )
+        for ligne, propriete in proprietes:
+            empreinte = calculer_empreinte(propriete)
+            if empreinte in empreintes:
+                doublons += 1
+                continue
+            empreintes.add(empreinte)
+            ajouter_aux_statistiques(statistiques, propriete)
+            yield ligne, propriete
+
+    with verrouiller_fichier(FICHIER_EMPREINTES):
+        if FORMAT_STOCKAGE_PROPRIETES == "blocs":
+            # Le verrou des ajouts suffit à écarter les autres écrivains; `ecrire_blocs` remplace le fichier
+            # de données, puis son index, sous le verrou du fichier de blocs.
+            ecrire_blocs(
+                FICHIER_PROPRIETES_BLOCS,
+                (
+                    (f"{ligne}\n", propriete["prix"], propriete["ville"])
+                    for ligne, propriete in lignes_uniques(iterer_lignes_blocs(FICHIER_PROPRIETES_BLOCS))
+                ),
+                TAILLE_BLOC_PROPRIETES,
             )
+        else:
+            with verrouiller_fichier(FICHIER_PROPRIETES):
+                fichier_temporaire = f"{FICHIER_PROPRIETES}.tmp"
+                with open(fichier_temporaire, "w", encoding=ENCODAGE_FICHIERS) as fichier:
+                    fichier.write(f"{EN_TETE_PROPRIETES}\n")
+                    for ligne, _ in lignes_uniques(iterer_lignes_texte()):
+                        fichier.write(f"{ligne}\n")
+                os.replace(fichier_temporaire, FICHIER_PROPRIETES)
+
+        ecrire_empreintes(empreintes)
+        ecrire_statistiques(statistiques)
+        reconstruire_index_proprietaires()
+
+    return len(empreintes), doublons
+
+
+def tests_gestionnaire_donnees():
+    global FORMAT_STOCKAGE_PROPRIETES
+    format_configure = FORMAT_STOCKAGE_PROPRIETES
+    propriete = {"prix": 250_000, "ville": "Québec", "type": "Condo", "chambres": 2, "salles_de_bains": 1, "proprietaire": "alice"}
+
+    try:
+        for format_stockage in ["texte", "blocs"]:
+            FORMAT_STOCKAGE_PROPRIETES = format_stockage
+            with dossier_donnees_temporaire():
+                garantir_existence_fichier(FICHIER_PROPRIETES)
+                preparer_fichier_proprietes()
+                assert charger_colonnes_proprietes() == {colonne: () for colonne in COLONNES_PROPRIETES}
+
+                # Teste que la même annonce est rejetée, même saisie par un autre propriétaire.
+                assert sauvegarder_propriete(propriete) is not None
+                assert sauvegarder_propriete(dict(propriete, proprietaire="bob")) is None
+                assert sauvegarder_propriete(dict(propriete, ville=" québec ")) is None
+                assert sauvegarder_proprietes([dict(propriete, prix=300_000), dict(propriete, prix=300_000)]) == (1, 1)
+                assert [p["prix"] for p in charger_proprietes()] == [250_000, 300_000]
+
+                # Teste la relecture par identifiant.
+                identifiant = sauvegarder_propriete(dict(propriete, prix=350_000, proprietaire="bob"))
+                assert lire_proprietes([identifiant])[0]["proprietaire"] == "bob"
+
+                # Teste qu'une propriété écrite sans son entrée dans l'index (arrêt brutal entre les deux) est
+                # ajoutée à l'index à partir de la longueur indexée, sans le reconstruire.
+                orpheline = dict(propriete, prix=400_000, proprietaire="carole")
+                if format_stockage == "blocs":
+                    ligne = formater_ligne_propriete(orpheline)
+                    ajouter_ligne_bloc(FICHIER_PROPRIETES_BLOCS, ligne, 400_000, "Québec", TAILLE_BLOC_PROPRIETES)
+                else:
+                    with open(FICHIER_PROPRIETES, "ab") as fichier:
+                        fichier.write(formater_ligne_propriete(orpheline).encode(ENCODAGE_FICHIERS))
+                inode_index = os.stat(FICHIER_INDEX_PROPRIETAIRES).st_ino
+                assert longueur_indexee() < longueur_proprietes()
+                assert lire_proprietes_du_proprietaire("carole") == [orpheline]
+                assert longueur_indexee() == longueur_proprietes()
+                assert os.stat(FICHIER_INDEX_PROPRIETAIRES).st_ino == inode_index
+                assert completer_index_proprietaires() == 0
+
+                # Teste qu'un identifiant qui ne désigne pas le début d'une propriété est refusé.
+                for invalide in [0, identifiant + 1, 10**9] if format_stockage == "texte" else [-1, 10**9]:
+                    try:
+                        lire_proprietes([invalide])
+                        assert False, "Un identifiant invalide doit être refusé."
+                    except ValueError:
+                        pass
+
+                # Teste que le compactage ne change ni les propriétés ni leurs identifiants.
+                proprietes = charger_proprietes()
+                assert (compacter_proprietes() is None) == (format_stockage == "texte")
+                assert charger_proprietes() == proprietes
+                assert lire_proprietes([identifiant])[0]["proprietaire"] == "bob"
+
+            with dossier_donnees_temporaire():
+                # Teste la déduplication d'un fichier contenant des doublons et une ligne mal formée, écrit sans
+                # passer par les empreintes.
+                lignes = [
+                    propriete,
+                    dict(propriete, proprietaire="bob"),
+                    dict(propriete, prix=300_000),
+                    dict(propriete, ville="QUÉBEC"),
+                    dict(propriete, prix=300_000, proprietaire="carole"),
+                ]
+                contenu = [formater_ligne_propriete(p) for p in lignes]
+                contenu.insert(2, "abc,Québec,Condo,2,1,alice\n")
+                garantir_existence_fichier(FICHIER_PROPRIETES)
+                if format_stockage == "blocs":
+                    ecrire_blocs(FICHIER_PROPRIETES_BLOCS, [(ligne, 0, "Québec") for ligne in contenu], TAILLE_BLOC_PROPRIETES)
+                else:
+                    with open(FICHIER_PROPRIETES, "w", encoding=ENCODAGE_FICHIERS) as fichier:
+                        fichier.write(f"{EN_TETE_PROPRIETES}\n")
+                        fichier.writelines(contenu)
+                preparer_fichier_proprietes()
+
+                # Teste le chargement en colonnes, qui ignore aussi la ligne mal formée.
+                erreurs = []
+                colonnes = charger_colonnes_proprietes(erreurs)
+                assert list(colonnes) == COLONNES_PROPRIETES
+                assert colonnes["prix"] == (250_000, 250_000, 300_000, 250_000, 300_000)
+                assert colonnes["proprietaire"] == ("alice", "bob", "alice", "alice", "carole")
+                assert [dict(zip(colonnes, valeurs)) for valeurs in zip(*colonnes.values())] == charger_proprietes()
+                assert len(erreurs) == 1
+
+                erreurs = []
+                assert dedupliquer_proprietes(erreurs) == (2, 3)
+                assert [ligne for _, ligne, _ in erreurs] == ["abc,Québec,Condo,2,1,alice"]
+                assert charger_proprietes() == [propriete, dict(propriete, prix=300_000)]
+
+                # Teste que les empreintes, les statistiques et l'index des propriétaires suivent le fichier réécrit.
+                assert sauvegarder_propriete(dict(propriete, proprietaire="david")) is None
+                assert charger_statistiques()["nombre"] == 2
+                assert [p["prix"] for p in lire_proprietes(identifiants_du_proprietaire("alice"))] == [250_000, 300_000]
+                assert identifiants_du_proprietaire("bob") == []
+
+                # Teste qu'une deuxième déduplication ne retire plus rien.
+                assert dedupliquer_proprietes() == (2, 0)
+
+                # Teste qu'un index des propriétaires périmé (fichier réécrit sans lui) est reconstruit à la lecture.
+                if format_stockage == "blocs":
+                    ecrire_blocs(FICHIER_PROPRIETES_BLOCS, [(formater_ligne_propriete(dict(propriete, proprietaire="eve")), 1, "Québec")] * 5, TAILLE_BLOC_PROPRIETES)
+                else:
+                    with open(FICHIER_PROPRIETES, "w", encoding=ENCODAGE_FICHIERS) as fichier:
+                        fichier.write(f"{EN_TETE_PROPRIETES}\n{formater_ligne_propriete(dict(propriete, proprietaire='eve'))}")
+                assert [p["proprietaire"] for p in lire_proprietes_du_proprietaire("alice")] == []
+                assert len(lire_proprietes_du_proprietaire("eve")) == (5 if format_stockage == "blocs" else 1)
+    finally:
+        FORMAT_STOCKAGE_PROPRIETES = format_configure
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'gestionnaire_donnees'...")
+    tests_gestionnaire_donnees()
+    print("Tests réussis!")
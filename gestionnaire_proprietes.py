@@ -6,20 +6,60 @@ Fonctions:
 - `lister_proprietes()`: Liste toutes les propriétés disponibles.
 - `filtrer_proprietes()`: Filtre les propriétés en fonction des critères de l'utilisateur.
 - `ajouter_propriete()`: Ajoute une nouvelle propriété si l'utilisateur est connecté.
+- `lister_mes_proprietes()`: Liste les propriétés ajoutées par l'utilisateur connecté.
+- `exporter_resultats()`: Exporte vers un fichier les propriétés correspondant aux critères saisis.
+- `lister_resultats_par_prix()`: Affiche par ordre de prix les propriétés correspondant aux critères saisis.
+- `compter_resultats()`: Affiche le nombre estimé et le nombre exact de propriétés correspondant aux critères saisis.
+- `afficher_estimation(criteres)`: Affiche le nombre estimé de propriétés correspondant à des critères.
+- `charger_proprietes_indexees()`: Charge les propriétés en colonnes et leurs index bitmap, en réutilisant ceux déjà
+  chargés.
+- `demander_criteres(choix)`: Demande les critères correspondant à une option du menu de filtrage.
+- `bitmap_criteres(index, criteres)`: Calcule le bitmap des propriétés pouvant correspondre aux critères.
+- `selectionner_proprietes(colonnes, index, criteres)`: Sélectionne les propriétés correspondant aux critères.
+- `compter_proprietes(colonnes, index, criteres)`: Compte les propriétés correspondant aux critères.
+- `preparer_lignes(proprietes)`: Convertit des propriétés en lignes de tableau affichables.
+- `preparer_ligne(propriete)`: Convertit une propriété en ligne de tableau affichable.
+- `signaler_lignes_ignorees(erreurs)`: Avertit l'utilisateur que des lignes mal formées ont été ignorées.
 
 Dépendances:
 - `gestionnaire_donnees`: Pour lire et écrire dans le fichier des propriétés.
 - `gestionnaire_utilisateurs`: Pour vérifier si un utilisateur est connecté.
+- `exportation`: Pour exporter en continu les résultats d'un filtre.
+- `index_bitmap`: Pour filtrer et compter les propriétés à l'aide d'index bitmap.
+- `statistiques`: Pour estimer le nombre de propriétés correspondant à des critères.
+- `vocabulaire`: Pour valider et compléter les villes et les types de propriété saisis.
 - `utilitaires`: Pour des fonctions auxiliaires comme l'affichage de tableaux formatés,
 et le formatage de montants en dollars.
 """
-from configuration import FICHIER_PROPRIETES
-from gestionnaire_donnees import charger_proprietes, sauvegarder_propriete
+from configuration import FICHIER_PROPRIETES, FICHIER_VILLES, FICHIER_TYPES_PROPRIETE
+from gestionnaire_donnees import (
+    charger_proprietes,
+    charger_colonnes_proprietes,
+    corriger_statistiques,
+    iterer_proprietes_triees,
+    sauvegarder_propriete,
+    lire_proprietes_du_proprietaire,
+    signature_proprietes,
+)
 from gestionnaire_utilisateurs import utilisateur_est_connecte, recuperer_utilisateur_courant
-from utilitaires import afficher_tableau, formater_argent, garantir_existence_fichier
+from exportation import exporter_proprietes, FORMATS_EXPORT
+from index_bitmap import indexer_colonnes, bitmap_egal, bitmap_plage, compter_bitmap, positions_bitmap
+from statistiques import tranche_prix, charger_statistiques, estimer_nombre
+from utilitaires import afficher_tableau, afficher_tableau_en_continu, formater_argent, garantir_existence_fichier
+from vocabulaire import charger_vocabulaire, normaliser, resoudre_saisie
 
-TYPES_DE_PROPRIETE = ["Maison", "Appartement", "Condo", "Loft"]
-VILLES = ["Québec", "Montréal", "Toronto", "Ottawa"]
+# En-têtes des colonnes des tableaux de propriétés.
+EN_TETES_PROPRIETES = ["Prix", "Ville", "Type de propriété", "Chambres", "Salle de bains", "Propriétaire"]
+
+# Au-delà de ce nombre de valeurs, un vocabulaire n'est plus affiché au complet: seules des suggestions le sont.
+TAILLE_MAXIMALE_AFFICHAGE_VOCABULAIRE = 10
+
+# Nombre maximal de suggestions affichées pour une saisie incomplète.
+NOMBRE_SUGGESTIONS = 10
+
+# Propriétés chargées en colonnes et leurs index bitmap, conservés tant que le fichier des propriétés ne change
+# pas (voir `signature_proprietes`).
+CACHE_PROPRIETES = {"signature": None, "colonnes": None, "index": None, "erreurs": []}
 
 
 def lister_proprietes():
@@ -34,6 +74,7 @@ def lister_proprietes():
          - Type de propriété : type (par exemple, Maison, Condo).
          - Chambres : nombre de chambres.
          - Salles de bains : nombre de salles de bains.
+         - Propriétaire : utilisateur ayant ajouté la propriété.
 
     Les informations sont ensuite affichées dans un tableau formaté avec une ligne d'en-tête descriptive.
 
@@ -43,20 +84,14 @@ def lister_proprietes():
         return print("Aucune propriété disponible.")
 
     while utilisateur_est_connecte():
-        proprietes_existants = charger_proprietes()
+        erreurs = []
+        proprietes_existants = charger_proprietes(erreurs)
+        signaler_lignes_ignorees(erreurs)
 
         if not proprietes_existants:
             return print("Aucune propriété disponible")
 
-        en_tetes = ["Prix", "Ville", "Type de propriété", "Chambres", "Salle de bains"]
-        chaque_ligne = []
-
-        for propriete in proprietes_existants:
-            propriete["prix"] = formater_argent(float(propriete["prix"]))
-            ligne = list(propriete.values())
-            chaque_ligne.append(ligne)
-
-        return afficher_tableau(chaque_ligne, en_tetes)
+        return afficher_tableau(preparer_lignes(proprietes_existants), EN_TETES_PROPRIETES)
 
 
 def filtrer_proprietes():
@@ -66,169 +101,356 @@ def filtrer_proprietes():
       1. Prix (minimum et maximum)
       2. Ville
       3. Type de propriété (ex. Maison, Condo)
-      4. Nombre de chambres
-      5. Nombre de salles de bains
+      4. Nombre de chambres (minimum et maximum)
+      5. Nombre de salles de bains (minimum et maximum)
       6. Combinaison de plusieurs de ces critères
+      7. Exportation des propriétés correspondant à une combinaison de critères (voir `exporter_resultats`)
+      8. Comptage des propriétés correspondant aux critères d'une des options 1 à 6 (voir `compter_resultats`)
+      9. Liste par ordre de prix des propriétés correspondant aux critères d'une des options 1 à 6
+         (voir `lister_resultats_par_prix`)
 
     Processus de filtrage :
       - Affiche un menu permettant à l'utilisateur de sélectionner un critère de filtrage unique
         ou une combinaison de critères.
       - En fonction de l'option choisie, invite l'utilisateur à entrer les valeurs de filtrage.
-      - Applique les critères pour trouver les propriétés correspondantes.
+      - Affiche le nombre estimé de propriétés correspondantes (voir `afficher_estimation`).
+      - Applique les critères pour trouver les propriétés correspondantes, à l'aide des index bitmap
+        construits par `indexer_colonnes` (voir `selectionner_proprietes`).
 
     Affichage :
       - Si des propriétés correspondant aux critères sont trouvées, elles sont affichées sous forme de tableau
-        avec les colonnes : Prix, Ville, Type de propriété, Chambres, et Salles de bains.
+        avec les colonnes : Prix, Ville, Type de propriété, Chambres, Salles de bains et Propriétaire.
       - Si aucune propriété ne correspond, un message indique qu'aucune propriété n'est disponible.
     """
     if not utilisateur_est_connecte():
         return print("Aucune propriété disponible.")
 
-    while utilisateur_est_connecte():
-        proprietes_existants = charger_proprietes()
+    print("\nOptions de filtrage:")
+    print("1. Filtrer par prix")
+    print("2. Filtrer par ville")
+    print("3. Filtrer par type de propriété")
+    print("4. Filtrer par nombre de chambres")
+    print("5. Filtrer par nombre de salles de bains")
+    print("6. Filtrer par une combinaison des options")
+    print("7. Exporter les résultats d'un filtre (CSV, JSONL ou colonnes)")
+    print("8. Compter les résultats d'un filtre, sans les afficher")
+    print("9. Afficher les résultats d'un filtre par ordre de prix")
 
-        if not proprietes_existants:
-            return print("Aucune propriété disponible")
+    choix = input("Choisissez une option de filtrage: ")
+
+    if choix not in ["1", "2", "3", "4", "5", "6", "7", "8", "9"]:
+        print("Option invalide.")
+        return False
+
+    if choix == "7":
+        return exporter_resultats()
+    if choix == "8":
+        return compter_resultats()
+    if choix == "9":
+        return lister_resultats_par_prix()
+
+    colonnes, index, erreurs = charger_proprietes_indexees()
+    signaler_lignes_ignorees(erreurs)
+
+    if not index["tous"]:
+        return print("Aucune propriété disponible")
+
+    criteres = demander_criteres(choix)
+    afficher_estimation(criteres)
+    filtrage = selectionner_proprietes(colonnes, index, criteres)
+
+    if not filtrage:
+        print("Aucune propriété n'est disponible.")
+        return False
+
+    afficher_tableau(preparer_lignes(filtrage), EN_TETES_PROPRIETES)
+    return False
+
+
+def exporter_resultats():
+    """Exporte vers un fichier les propriétés correspondant aux critères saisis par l'utilisateur.
+
+    Les critères sont demandés comme pour l'option de combinaison du menu de filtrage, puis le format
+    ("csv", "jsonl" ou "colonnes") et le chemin du fichier. Les propriétés sont écrites en continu
+    par `exporter_proprietes`, sans être chargées en mémoire.
+
+    Returns:
+        bool: False, pour revenir au menu principal.
+    """
+    criteres = demander_criteres("6")
+
+    while True:
+        format_export = input(f"Format ({', '.join(FORMATS_EXPORT)}): ").strip().lower()
+        if format_export in FORMATS_EXPORT:
+            break
+        print(f"Format invalide. Choisissez parmi: {', '.join(FORMATS_EXPORT)}")
+
+    chemin_fichier = input("Fichier de destination: ").strip()
+    if not chemin_fichier:
+        print("Exportation annulée.")
+        return False
+
+    try:
+        nombre = exporter_proprietes(criteres, chemin_fichier, format_export)
+    except OSError as e:
+        print(f"Exportation impossible: {e}")
+        return False
+
+    print(f"{nombre} propriété(s) exportée(s) vers {chemin_fichier}.")
+    return False
+
+
+def lister_resultats_par_prix():
+    """Affiche par ordre de prix les propriétés correspondant aux critères d'une option de filtrage.
+
+    Les propriétés sont triées par un tri externe dont la mémoire est bornée (voir `iterer_proprietes_triees`),
+    puis affichées au fur et à mesure de la fusion (voir `afficher_tableau_en_continu`) : le catalogue n'est
+    jamais chargé en entier, quelle que soit sa taille.
+    """
+    choix = input("Option de filtrage à trier (1 à 6): ")
+    if choix not in ["1", "2", "3", "4", "5", "6"]:
+        print("Option invalide.")
+        return False
+
+    criteres = demander_criteres(choix)
+    decroissant = input("Ordre (c: prix croissant, d: prix décroissant): ").strip().lower() == "d"
+    afficher_estimation(criteres)
+
+    erreurs = []
+    nombre = afficher_tableau_en_continu(
+        map(preparer_ligne, iterer_proprietes_triees(criteres, decroissant, erreurs=erreurs)), EN_TETES_PROPRIETES
+    )
+    signaler_lignes_ignorees(erreurs)
+    if not nombre:
+        print("Aucune propriété n'est disponible.")
+    return False
+
+
+def compter_resultats():
+    """Affiche le nombre de propriétés correspondant aux critères d'une option de filtrage, sans les afficher.
+
+    L'estimation tirée des statistiques est affichée dès que les critères sont saisis, puis le nombre exact,
+    calculé sur les index bitmap (voir `compter_proprietes`).
+    """
+    choix = input("Option de filtrage à compter (1 à 6): ")
+    if choix not in ["1", "2", "3", "4", "5", "6"]:
+        print("Option invalide.")
+        return False
+
+    criteres = demander_criteres(choix)
+    afficher_estimation(criteres)
+
+    colonnes, index, erreurs = charger_proprietes_indexees()
+    signaler_lignes_ignorees(erreurs)
+    print(f"Nombre exact: {compter_proprietes(colonnes, index, criteres)} propriété(s).")
+    return False
+
+
+def afficher_estimation(criteres):
+    """Affiche le nombre estimé de propriétés correspondant à des critères, d'après les statistiques enregistrées.
+
+    Rien n'est affiché si les statistiques n'ont pas encore été calculées.
+
+    Args:
+        criteres (dict): Les critères retournés par `demander_criteres`.
+    """
+    statistiques = charger_statistiques()
+    if statistiques is not None:
+        print(f"Estimation: environ {round(estimer_nombre(statistiques, criteres))} propriété(s).")
+
+
+def charger_proprietes_indexees():
+    """Charge les propriétés colonne par colonne et construit leurs index bitmap, ou réutilise ceux déjà chargés
+    si le fichier des propriétés n'a pas changé depuis.
+
+    Les index sont construits directement à partir des champs analysés (voir `charger_colonnes_proprietes`) :
+    aucun dictionnaire n'est créé par propriété, de sorte qu'un premier comptage reste moins coûteux qu'une
+    liste. Seules les propriétés à afficher sont converties en dictionnaires (voir `selectionner_proprietes`).
+
+    Les statistiques enregistrées sont recalculées si leur nombre de propriétés ne correspond plus à celui
+    des propriétés chargées (par exemple, après une modification manuelle du fichier).
+
+    Returns:
+        tuple: (colonnes des propriétés, index bitmap, lignes mal formées ignorées).
+    """
+    signature = signature_proprietes()
+    if signature != CACHE_PROPRIETES["signature"]:
+        erreurs = []
+        colonnes = charger_colonnes_proprietes(erreurs)
+        CACHE_PROPRIETES.update(signature=signature, colonnes=colonnes, index=indexer_colonnes(colonnes), erreurs=erreurs)
+
+        corriger_statistiques(len(colonnes["prix"]), signature)
+
+    return CACHE_PROPRIETES["colonnes"], CACHE_PROPRIETES["index"], CACHE_PROPRIETES["erreurs"]
+
+
+def demander_criteres(choix):
+    """Demande à l'utilisateur les critères de filtrage correspondant à une option du menu de filtrage.
+
+    Args:
+        choix (str): L'option de filtrage choisie ("1" à "6"). L'option "6" demande tous les critères,
+                     chacun étant facultatif.
+
+    Returns:
+        dict: Les critères saisis. Les clés possibles sont "prix_minimum", "prix_maximum", "ville", "type",
+              "chambres_minimum", "chambres_maximum", "salles_de_bains_minimum" et "salles_de_bains_maximum".
+              Un critère absent ou à `None` n'est pas appliqué.
+    """
+    combinaison = choix == "6"
+    criteres = {}
+
+    if choix in ["1", "6"]:
+        criteres["prix_minimum"], criteres["prix_maximum"] = demander_plage_de_prix(optionnel=True)
+    if choix in ["2", "6"]:
+        criteres["ville"] = demander_ville(optionnel=combinaison)
+    if choix in ["3", "6"]:
+        criteres["type"] = demander_type_de_propriete(optionnel=combinaison)
+    if choix in ["4", "6"]:
+        criteres["chambres_minimum"], criteres["chambres_maximum"] = demander_plage_de_nombres(
+            "Nombre de chambres", optionnel=combinaison
+        )
+    if choix in ["5", "6"]:
+        criteres["salles_de_bains_minimum"], criteres["salles_de_bains_maximum"] = demander_plage_de_nombres(
+            "Nombre de salles de bains", optionnel=combinaison
+        )
+
+    return criteres
+
+
+def bitmap_criteres(index, criteres):
+    """Calcule, à l'aide des index bitmap, le bitmap des propriétés pouvant correspondre aux critères.
+
+    Les critères sur la ville, le type, les chambres et les salles de bains sont résolus par des opérations
+    bit à bit sur les index (ET entre les colonnes, OU entre les valeurs d'une plage). Le critère de prix est
+    résolu par tranche de prix : seules les propriétés des tranches contenant les bornes de la plage de prix
+    doivent encore être vérifiées individuellement.
+
+    Cette fonction ne fait que combiner des index existants : ils sont construits une seule fois par version du
+    fichier des propriétés et conservés dans `CACHE_PROPRIETES` (voir `charger_proprietes_indexees`).
+
+    Args:
+        index (dict): Les index bitmap construits par `indexer_colonnes`.
+        criteres (dict): Les critères retournés par `demander_criteres`.
+
+    Returns:
+        tuple: (bitmap des propriétés retenues, bitmap des propriétés retenues dont le prix reste à vérifier).
+    """
+    selection = index["tous"]
+
+    if criteres.get("ville"):
+        selection &= bitmap_egal(index["ville"], criteres["ville"])
+    if criteres.get("type"):
+        selection &= bitmap_egal(index["type"], criteres["type"])
+    for colonne in ["chambres", "salles_de_bains"]:
+        minimum = criteres.get(f"{colonne}_minimum")
+        maximum = criteres.get(f"{colonne}_maximum")
+        if minimum is not None or maximum is not None:
+            selection &= bitmap_plage(index[colonne], minimum, maximum)
 
-        continuer = True
-        while continuer:
-            print("\nOptions de filtrage:")
-            print("1. Filtrer par prix")
-            print("2. Filtrer par ville")
-            print("3. Filtrer par type de propriété")
-            print("4. Filtrer par nombre de chambres")
-            print("5. Filtrer par nombre de salles de bains")
-            print("6. Filtrer par une combinaison des options")
-
-            choix = input("Choisissez une option de filtrage: ")
-
-            if choix not in "123456":
-                print("Option invalide.")
-                return False
-
-            en_tetes = ["Prix", "Ville", "Type de propriété", "Chambres", "Salle de bains"]
-            filtrage = []
-
-            if choix == "1":
-                prix_minimum, prix_maximum = demander_plage_de_prix(optionnel=True)
-                for propriete in proprietes_existants:
-                    propriete_copie_pour_affichage = propriete.copy()
-                    prix = propriete_copie_pour_affichage["prix"]
-                    if (prix_minimum is None or prix >= prix_minimum) and (prix_maximum is None or prix <= prix_maximum):
-                        filtrage.append(propriete_copie_pour_affichage)
-                        propriete_copie_pour_affichage["prix"] = formater_argent(float(propriete_copie_pour_affichage["prix"]))
-
-                lignes = [list(propriete_copie_pour_affichage.values()) for propriete_copie_pour_affichage in filtrage]
-                afficher_tableau(lignes, en_tetes)
-                return False
-
-            elif choix == "2":
-                ville_choisie = demander_ville()
-
-                for propriete in proprietes_existants:
-                    if ville_choisie and propriete["ville"] == ville_choisie:
-                        filtrage.append(propriete)
-
-                if not filtrage:
-                    print("Aucune propriété n'est disponible.")
-                    return False
-                else:
-                    for propriete in filtrage:
-                        propriete["prix"] = formater_argent(float(propriete["prix"]))
-
-                lignes = [list(propriete.values()) for propriete in filtrage]
-                afficher_tableau(lignes, en_tetes)
-                return False
-
-            elif choix == "3":
-                type_propriete = demander_type_de_propriete()
-
-                for propriete in proprietes_existants:
-                    if type_propriete and propriete["type"] == type_propriete:
-                        filtrage.append(propriete)
-
-                if not filtrage:
-                    print("Aucune propriété n'est disponible.")
-                    return False
-                else:
-                    for propriete in filtrage:
-                        propriete["prix"] = formater_argent(float(propriete["prix"]))
-
-                lignes = [list(propriete.values()) for propriete in filtrage]
-                afficher_tableau(lignes, en_tetes)
-                return False
-
-            elif choix == "4":
-                chambres_choisies = demander_nombre_positif("Nombre de chambres")
-
-                for propriete in proprietes_existants:
-                    if chambres_choisies and propriete["chambres"] == chambres_choisies:
-                        filtrage.append(propriete)
-
-                if not filtrage:
-                    print("Aucune propriété n'est disponible.")
-                    return False
-                else:
-                    for propriete in filtrage:
-                        propriete["prix"] = formater_argent(float(propriete["prix"]))
-
-                lignes = [list(propriete.values()) for propriete in filtrage]
-                afficher_tableau(lignes, en_tetes)
-                return False
-
-            elif choix == "5":
-                salles_de_bains_choisies = demander_nombre_positif("Nombre de salles de bains")
-                for propriete in proprietes_existants:
-                    if salles_de_bains_choisies and propriete["salles_de_bains"] == salles_de_bains_choisies:
-                        filtrage.append(propriete)
-
-                if not filtrage:
-                    print("Aucune propriété n'est disponible.")
-                    return False
-                else:
-                    for propriete in filtrage:
-                        propriete["prix"] = formater_argent(float(propriete["prix"]))
-
-                lignes = [list(propriete.values()) for propriete in filtrage]
-                afficher_tableau(lignes, en_tetes)
-                return False
-
-            elif choix == "6":
-                prix_minimum, prix_maximum = demander_plage_de_prix(optionnel=True)
-                ville_choisie = demander_ville(optionnel=True)
-                type_propriete = demander_type_de_propriete(optionnel=True)
-                chambres_choisies = demander_nombre_positif("Nombre de chambres", optionnel=True)
-                salles_de_bains_choisies = demander_nombre_positif("Nombre de salles de bains", optionnel=True)
-
-                for propriete in proprietes_existants:
-                    propriete_copie_pour_affichage = propriete.copy()
-                    prix = propriete_copie_pour_affichage["prix"]
-                    critere_choisie = True
-
-                    if prix_minimum is not None and prix < prix_minimum:
-                        critere_choisie = False
-                    if prix_maximum is not None and prix > prix_maximum:
-                        critere_choisie = False
-                    if ville_choisie and propriete_copie_pour_affichage["ville"] != ville_choisie:
-                        critere_choisie = False
-                    if type_propriete and propriete_copie_pour_affichage["type"] != type_propriete:
-                        critere_choisie = False
-                    if chambres_choisies and propriete_copie_pour_affichage["chambres"] != chambres_choisies:
-                        critere_choisie = False
-                    if salles_de_bains_choisies and propriete_copie_pour_affichage["salles_de_bains"] != salles_de_bains_choisies:
-                        critere_choisie = False
-
-                    if critere_choisie:
-                        filtrage.append(propriete_copie_pour_affichage)
-                        propriete_copie_pour_affichage["prix"] = formater_argent(float(propriete_copie_pour_affichage["prix"]))
-
-                if filtrage:
-                    lignes = [list(propriete.values()) for propriete in filtrage]
-                    afficher_tableau(lignes, en_tetes)
-                    return False
-                else:
-                    print("Aucune propriété n'est disponible.")
-                    return False
+    prix_minimum = criteres.get("prix_minimum")
+    prix_maximum = criteres.get("prix_maximum")
+    if prix_minimum is None and prix_maximum is None:
+        return selection, 0
+
+    tranche_minimum = None if prix_minimum is None else tranche_prix(prix_minimum)
+    tranche_maximum = None if prix_maximum is None else tranche_prix(prix_maximum)
+    selection &= bitmap_plage(index["tranches_prix"], tranche_minimum, tranche_maximum)
+
+    bords = 0
+    for tranche in {tranche_minimum, tranche_maximum} - {None}:
+        bords |= bitmap_egal(index["tranches_prix"], tranche)
+    return selection, selection & bords
+
+
+def selectionner_proprietes(colonnes, index, criteres):
+    """Sélectionne les propriétés correspondant aux critères, à l'aide des index bitmap (voir `bitmap_criteres`).
+
+    Le critère de prix, dont la cardinalité est élevée, est vérifié sur les propriétés retenues par les index.
+    Seules les propriétés sélectionnées sont converties en dictionnaires.
+
+    Args:
+        colonnes (dict): Les colonnes des propriétés indexées (voir `charger_colonnes_proprietes`).
+        index (dict): Les index bitmap construits par `indexer_colonnes` sur `colonnes`.
+        criteres (dict): Les critères retournés par `demander_criteres`.
+
+    Returns:
+        list: Les propriétés correspondant à tous les critères, dans leur ordre d'origine.
+    """
+    selection, _ = bitmap_criteres(index, criteres)
+    prix = colonnes["prix"]
+    prix_minimum = criteres.get("prix_minimum")
+    prix_maximum = criteres.get("prix_maximum")
+
+    return [
+        {colonne: valeurs[position] for colonne, valeurs in colonnes.items()}
+        for position in positions_bitmap(selection)
+        if (prix_minimum is None or prix[position] >= prix_minimum)
+        and (prix_maximum is None or prix[position] <= prix_maximum)
+    ]
+
+
+def compter_proprietes(colonnes, index, criteres):
+    """Compte les propriétés correspondant aux critères, sans construire la liste des résultats.
+
+    Le nombre est calculé par comptage des bits des index bitmap (voir `bitmap_criteres`); seuls les prix des
+    propriétés des tranches de prix partiellement couvertes par la plage de prix sont lus.
+
+    Args:
+        colonnes (dict): Les colonnes des propriétés indexées (voir `charger_colonnes_proprietes`).
+        index (dict): Les index bitmap construits par `indexer_colonnes` sur `colonnes`.
+        criteres (dict): Les critères retournés par `demander_criteres`.
+
+    Returns:
+        int: Le nombre de propriétés correspondant à tous les critères.
+    """
+    selection, a_verifier = bitmap_criteres(index, criteres)
+    prix = colonnes["prix"]
+    prix_minimum = criteres.get("prix_minimum")
+    prix_maximum = criteres.get("prix_maximum")
+
+    return compter_bitmap(selection & ~a_verifier) + sum(
+        1
+        for position in positions_bitmap(a_verifier)
+        if (prix_minimum is None or prix[position] >= prix_minimum)
+        and (prix_maximum is None or prix[position] <= prix_maximum)
+    )
+
+
+def preparer_lignes(proprietes):
+    """Convertit des propriétés en lignes de tableau, avec le prix formaté en dollars.
+
+    Les propriétés reçues ne sont pas modifiées.
+
+    Args:
+        proprietes (list): Les propriétés à afficher.
+
+    Returns:
+        list of list: Une ligne par propriété, prête à être passée à `afficher_tableau`.
+    """
+    return [preparer_ligne(propriete) for propriete in proprietes]
+
+
+def preparer_ligne(propriete):
+    """Convertit une propriété en ligne de tableau, avec le prix formaté en dollars.
+
+    Args:
+        propriete (dict): La propriété à afficher; elle n'est pas modifiée.
+
+    Returns:
+        list: La ligne du tableau.
+    """
+    return [formater_argent(float(propriete["prix"]))] + list(propriete.values())[1:]
+
+
+def signaler_lignes_ignorees(erreurs):
+    """Avertit l'utilisateur que des lignes mal formées du fichier des propriétés ont été ignorées.
+
+    Args:
+        erreurs (list): Les lignes mal formées rapportées par `charger_proprietes`.
+    """
+    if erreurs:
+        print(f"Attention: {len(erreurs)} ligne(s) mal formée(s) du fichier des propriétés ont été ignorées "
+              f"(voir « python maintenance.py verifier »).")
 
 
 def ajouter_propriete():
@@ -243,22 +465,53 @@ def ajouter_propriete():
          - Type de propriété (par exemple, Maison, Condo)
          - Nombre de chambres (valeur positive)
          - Nombre de salles de bains (valeur positive)
-      3. Enregistre les informations de la nouvelle propriété dans le fichier de propriétés via la fonction `sauvegarder_propriete`.
+      3. Enregistre les informations de la nouvelle propriété, avec l'utilisateur connecté comme propriétaire,
+         dans le fichier de propriétés via la fonction `sauvegarder_propriete`, qui rejette les doublons.
 
-    Affiche un message de confirmation une fois la propriété ajoutée, ou un message d'erreur si l'utilisateur n'est pas connecté.
+    Affiche un message de confirmation une fois la propriété ajoutée, ou un message d'erreur si l'utilisateur n'est pas connecté
+    ou si la propriété a déjà été ajoutée.
+    """
+    proprietaire = recuperer_utilisateur_courant()
+    if proprietaire is None:
+        return print("Vous devez être connecté pour ajouter une propriété.")
+
+    prix = demander_nombre_positif("Prix")
+    ville = demander_ville()
+    type_propriete = demander_type_de_propriete()
+    chambres = demander_nombre_positif("Nombre de chambres")
+    salles_de_bains = demander_nombre_positif("Nombre de salles de bains")
+
+    nouvelle_propriete = {
+        "prix": prix,
+        "ville": ville,
+        "type": type_propriete,
+        "chambres": chambres,
+        "salles_de_bains": salles_de_bains,
+        "proprietaire": proprietaire,
+    }
+    if sauvegarder_propriete(nouvelle_propriete) is None:
+        return print("Cette propriété a déjà été ajoutée.")
+    return print("Propriété ajoutée avec succès.")
+
+
+def lister_mes_proprietes():
+    """Affiche les propriétés ajoutées par l'utilisateur connecté.
+
+    Les propriétés sont retrouvées par l'index des propriétaires, puis lues directement à leur position dans
+    le fichier des propriétés (voir `lire_proprietes_du_proprietaire`) : le coût dépend du nombre de propriétés
+    de l'utilisateur, et non de la taille du catalogue.
     """
-    nouvelle_propriete = charger_proprietes()
+    proprietaire = recuperer_utilisateur_courant()
+    if proprietaire is None:
+        return print("Vous devez être connecté pour consulter vos propriétés.")
 
-    if utilisateur_est_connecte():
-        prix = demander_nombre_positif("Prix")
-        ville = demander_ville()
-        type_propriete = demander_type_de_propriete()
-        chambres = demander_nombre_positif("Nombre de chambres")
-        salles_de_bains = demander_nombre_positif("Nombre de salles de bains")
+    mes_proprietes = lire_proprietes_du_proprietaire(proprietaire)
+
+    if not mes_proprietes:
+        return print("Vous n'avez ajouté aucune propriété.")
+
+    return afficher_tableau(preparer_lignes(mes_proprietes), EN_TETES_PROPRIETES)
 
-        nouvelle_propriete = {"prix": prix, "ville": ville, "type": type_propriete, "chambres": chambres, "salles_de_bains": salles_de_bains}
-        print("Propriété ajoutée avec succès.")
-    return sauvegarder_propriete(nouvelle_propriete)
 
 def demander_plage_de_prix(optionnel=False):
     """Demande à l'utilisateur de saisir une plage de prix.
@@ -290,8 +543,40 @@ def demander_plage_de_prix(optionnel=False):
             print(e)
 
 
+def demander_plage_de_nombres(prompt, optionnel=False):
+    """Demande à l'utilisateur de saisir une plage de nombres positifs (minimum et maximum).
+
+    Pour un nombre exact, l'utilisateur saisit la même valeur comme minimum et maximum.
+    Une borne laissée vide n'est pas appliquée (ex. « au moins 3 chambres »).
+
+    Args:
+        prompt (str): Le message à afficher pour la saisie.
+        optionnel (bool): Indique si la saisie est facultative (les deux bornes peuvent être vides).
+
+    Returns:
+        tuple: (minimum, maximum), chaque borne étant un int ou `None`.
+    """
+    while True:
+        try:
+            minimum = input(f"{prompt} minimum: ")
+            maximum = input(f"{prompt} maximum: ")
+            if not minimum and not maximum:
+                if optionnel:
+                    return None, None
+                raise ValueError("Veuillez saisir au moins une borne.")
+            minimum = int(minimum) if minimum else None
+            maximum = int(maximum) if maximum else None
+            if (minimum is not None and minimum <= 0) or (maximum is not None and maximum <= 0):
+                raise ValueError("Veuillez saisir un nombre positif.")
+            if minimum is not None and maximum is not None and minimum > maximum:
+                raise ValueError("Le minimum doit être inférieur ou égal au maximum.")
+            return minimum, maximum
+        except ValueError as e:
+            print(e)
+
+
 def demander_ville(optionnel=False):
-    """Demande à l'utilisateur de choisir une ville parmi les choix définis.
+    """Demande à l'utilisateur de choisir une ville parmi celles du fichier des villes.
 
     Args:
         optionnel (bool): Indique si la saisie est facultative.
@@ -299,18 +584,11 @@ def demander_ville(optionnel=False):
     Returns:
         str: La ville choisie.
     """
-    print(f"Choisissez une ville parmi les suivantes: {', '.join(VILLES)}")
-    while True:
-        ville = input("Ville: ").capitalize()
-        if optionnel and not ville:
-            return None
-        if ville in VILLES:
-            return ville
-        print(f"Ville invalide. Choisissez parmi: {', '.join(VILLES)}")
+    return demander_valeur(charger_vocabulaire(FICHIER_VILLES), "Ville", "une ville", optionnel)
 
 
 def demander_type_de_propriete(optionnel=False):
-    """Demande à l'utilisateur de choisir un type de propriété parmi les choix définis.
+    """Demande à l'utilisateur de choisir un type de propriété parmi ceux du fichier des types de propriété.
 
     Args:
         optionnel (bool): Indique si la saisie est facultative.
@@ -318,18 +596,49 @@ def demander_type_de_propriete(optionnel=False):
     Returns:
         str: Le type de propriété choisi.
     """
-    print(
-        f"Choisissez un type de propriété parmi les suivants: {', '.join(TYPES_DE_PROPRIETE)}"
+    return demander_valeur(
+        charger_vocabulaire(FICHIER_TYPES_PROPRIETE), "Type de propriété", "un type de propriété", optionnel
     )
+
+
+def demander_valeur(vocabulaire, prompt, description, optionnel=False):
+    """Demande à l'utilisateur de choisir une valeur d'un vocabulaire, avec autocomplétion.
+
+    La saisie est comparée sans égard à la casse ni aux accents. Si elle ne correspond à aucune valeur,
+    elle est traitée comme un préfixe : une suggestion unique est acceptée directement, sinon les
+    suggestions sont affichées et la saisie est redemandée.
+
+    Args:
+        vocabulaire (dict): Le vocabulaire retourné par `charger_vocabulaire`.
+        prompt (str): Le message à afficher pour la saisie.
+        description (str): La description de la valeur demandée (ex. « une ville »).
+        optionnel (bool): Indique si la saisie est facultative.
+
+    Returns:
+        str: La valeur officielle choisie, ou `None` si la saisie facultative est laissée vide.
+    """
+    valeurs = vocabulaire["valeurs"]
+    if len(valeurs) <= TAILLE_MAXIMALE_AFFICHAGE_VOCABULAIRE:
+        print(f"Choisissez {description} parmi les suivants: {', '.join(valeurs)}")
+    else:
+        print(f"Choisissez {description} (saisissez le début du nom pour obtenir des suggestions).")
+
     while True:
-        type_de_propriete = input("Type de propriété: ").capitalize()
-        if optionnel and not type_de_propriete:
+        saisie = input(f"{prompt}: ")
+        if optionnel and not saisie.strip():
             return None
-        if type_de_propriete in TYPES_DE_PROPRIETE:
-            return type_de_propriete
-        print(
-            f"Type de propriété invalide. Choisissez parmi: {', '.join(TYPES_DE_PROPRIETE)}"
-        )
+
+        valeur, suggestions = resoudre_saisie(vocabulaire, saisie, NOMBRE_SUGGESTIONS)
+        if valeur:
+            if normaliser(saisie) != normaliser(valeur):
+                print(f"{prompt}: {valeur}")  # Préfixe complété
+            return valeur
+        if suggestions:
+            print(f"Suggestions: {', '.join(suggestions)}")
+        elif len(valeurs) <= TAILLE_MAXIMALE_AFFICHAGE_VOCABULAIRE:
+            print(f"{prompt} invalide. Choisissez parmi: {', '.join(valeurs)}")
+        else:
+            print(f"{prompt} invalide. Aucune suggestion pour « {saisie.strip()} ».")
 
 
 def demander_nombre_positif(prompt, optionnel=False):
@@ -0,0 +1,271 @@
+"""
+Ce module gère les sessions de l'application IFT-1004 Solo Immo. Plusieurs clients peuvent être connectés
+en même temps : chaque connexion reçoit un jeton aléatoire (`secrets.token_urlsafe`) valide pour une durée
+limitée.
+
+Les sessions sont conservées à deux niveaux :
+  - Un cache en mémoire (dictionnaire jeton -> (utilisateur, expiration)), qui permet de valider un jeton
+    en temps constant.
+  - Une table sur disque (le fichier de session), à laquelle chaque création ou révocation de session est
+    ajoutée sous la forme d'une ligne `jeton,utilisateur,expiration`. Une révocation est une ligne dont
+    l'expiration est 0. Le cache lit seulement les lignes ajoutées depuis sa dernière lecture, ce qui lui
+    permet de voir les sessions ouvertes et révoquées par les autres processus. Cette lecture n'est faite
+    que pour un jeton absent du cache, ou une fois par `INTERVALLE_SYNCHRONISATION_SESSIONS` : la plupart
+    des validations ne touchent pas au disque.
+
+Les sessions expirées sont purgées périodiquement : elles sont retirées du cache et, si la table sur disque
+contient des sessions expirées ou révoquées, elle est réécrite (compactée) pour ne conserver que les sessions
+encore valides.
+
+Fonctions:
+- `creer_session(utilisateur, duree)`: Ouvre une session et retourne son jeton.
+- `valider_session(jeton)`: Retourne l'utilisateur associé à un jeton valide.
+- `revoquer_session(jeton)`: Ferme une session.
+- `purger_sessions_expirees(forcer)`: Retire les sessions expirées du cache et compacte la table sur disque.
+- `synchroniser_sessions()`: Ajoute au cache les sessions écrites sur disque depuis la dernière lecture.
+
+Dépendances:
+- `os`: Pour remplacer atomiquement la table lors du compactage.
+- `secrets`: Pour générer des jetons de session imprévisibles.
+- `time`: Pour calculer et vérifier l'expiration des sessions.
+- `configuration`: Pour le chemin du fichier de session et les durées de session, de purge et de synchronisation.
+- `utilitaires`: Pour verrouiller le fichier de session entre processus et ne lire que ses entrées ajoutées.
+"""
+
+import os
+import secrets
+import time
+
+from configuration import FICHIER_SESSION, DUREE_SESSION, INTERVALLE_PURGE_SESSIONS, INTERVALLE_SYNCHRONISATION_SESSIONS
+from utilitaires import verrouiller_fichier, synchroniser_fichier
+
+EN_TETE_SESSIONS = b"jeton,utilisateur,expiration\n"
+
+# Cache en mémoire des sessions: jeton -> (utilisateur, expiration).
+CACHE_SESSIONS = {}
+
+# Identité (inode), position de lecture et nombre d'entrées lues de la table sur disque, et moments de la
+# prochaine synchronisation et de la prochaine purge. La première purge n'a lieu qu'après un intervalle
+# complet : chaque processus qui démarre ne réécrit donc pas la table.
+ETAT_SESSIONS = {
+    "inode": None,
+    "octets_lus": 0,
+    "entrees": 0,
+    "prochaine_synchronisation": 0,
+    "prochaine_purge": time.time() + INTERVALLE_PURGE_SESSIONS,
+}
+
+
+def creer_session(utilisateur, duree=DUREE_SESSION):
+    """Ouvre une session pour un utilisateur et retourne son jeton.
+
+    Args:
+        utilisateur (str): Le nom de l'utilisateur qui se connecte.
+        duree (float): La durée de validité de la session, en secondes.
+
+    Returns:
+        str: Le jeton de la nouvelle session.
+    """
+    jeton = secrets.token_urlsafe(32)
+    expiration = int(time.time() + duree)
+
+    ajouter_entree(jeton, utilisateur, expiration)
+    CACHE_SESSIONS[jeton] = (utilisateur, expiration)
+    return jeton
+
+
+def valider_session(jeton):
+    """Retourne l'utilisateur associé à un jeton, si la session est valide.
+
+    Le jeton est validé par le cache en mémoire, en temps constant. La table sur disque n'est relue (seulement
+    sa fin) que si le jeton est absent du cache, par exemple s'il a été ouvert par un autre processus, ou si
+    la dernière lecture date de plus de `INTERVALLE_SYNCHRONISATION_SESSIONS` : une session révoquée par un
+    autre processus est ainsi refusée au plus tard après cet intervalle.
+
+    Args:
+        jeton (str): Le jeton de session à valider.
+
+    Returns:
+        str or None: Le nom de l'utilisateur, ou `None` si le jeton est inconnu, révoqué ou expiré.
+    """
+    if jeton is None:
+        return None
+
+    maintenant = time.time()
+    if maintenant >= ETAT_SESSIONS["prochaine_purge"]:
+        purger_sessions_expirees(forcer=True)
+
+    if jeton not in CACHE_SESSIONS or maintenant >= ETAT_SESSIONS["prochaine_synchronisation"]:
+        synchroniser_sessions()
+    session = CACHE_SESSIONS.get(jeton)
+    if session is None:
+        return None
+
+    utilisateur, expiration = session
+    if expiration <= maintenant:
+        CACHE_SESSIONS.pop(jeton, None)
+        return None
+    return utilisateur
+
+
+def revoquer_session(jeton):
+    """Ferme une session en ajoutant une révocation à la table sur disque.
+
+    Args:
+        jeton (str): Le jeton de la session à fermer.
+    """
+    if jeton is None:
+        return
+    ajouter_entree(jeton, "", 0)
+    CACHE_SESSIONS.pop(jeton, None)
+
+
+def purger_sessions_expirees(forcer=False):
+    """Retire les sessions expirées du cache et compacte la table sur disque.
+
+    La purge n'est effectuée qu'une fois par `INTERVALLE_PURGE_SESSIONS`, sauf si `forcer` est vrai. La table
+    n'est réécrite que si elle contient des entrées inutiles (sessions expirées, révocations et sessions révoquées).
+
+    Args:
+        forcer (bool): Effectue la purge même si l'intervalle n'est pas écoulé.
+
+    Returns:
+        int: Le nombre de sessions encore valides.
+    """
+    maintenant = time.time()
+    if not forcer and maintenant < ETAT_SESSIONS["prochaine_purge"]:
+        return len(CACHE_SESSIONS)
+    ETAT_SESSIONS["prochaine_purge"] = maintenant + INTERVALLE_PURGE_SESSIONS
+
+    with verrouiller_fichier(FICHIER_SESSION):
+        synchroniser_sessions()
+        for jeton, (_, expiration) in list(CACHE_SESSIONS.items()):
+            if expiration <= maintenant:
+                del CACHE_SESSIONS[jeton]
+        if ETAT_SESSIONS["entrees"] == len(CACHE_SESSIONS):
+            return len(CACHE_SESSIONS)
+
+        fichier_temporaire = f"{FICHIER_SESSION}.tmp"
+        with open(fichier_temporaire, "wb") as fichier:
+            fichier.write(EN_TETE_SESSIONS)
+            for jeton, (utilisateur, expiration) in CACHE_SESSIONS.items():
+                fichier.write(f"{jeton},{utilisateur},{expiration:.0f}\n".encode("utf-8"))
+            ETAT_SESSIONS["octets_lus"] = fichier.tell()
+            ETAT_SESSIONS["entrees"] = len(CACHE_SESSIONS)
+            ETAT_SESSIONS["inode"] = os.fstat(fichier.fileno()).st_ino
+        os.replace(fichier_temporaire, FICHIER_SESSION)
+
+    return len(CACHE_SESSIONS)
+
+
+def synchroniser_sessions():
+    """Ajoute au cache les entrées écrites dans la table sur disque depuis la dernière lecture.
+
+    Si la table a été remplacée (compactée par un autre processus), elle est relue depuis le début
+    (voir `synchroniser_fichier`).
+    """
+    synchroniser_fichier(FICHIER_SESSION, ETAT_SESSIONS, vider_cache_sessions, analyser_lignes_sessions)
+    ETAT_SESSIONS["prochaine_synchronisation"] = time.time() + INTERVALLE_SYNCHRONISATION_SESSIONS
+
+
+def vider_cache_sessions():
+    """Vide le cache des sessions avant une relecture complète de la table sur disque."""
+    ETAT_SESSIONS["entrees"] = 0
+    CACHE_SESSIONS.clear()
+
+
+def analyser_lignes_sessions(lignes):
+    """Applique au cache les entrées `jeton,utilisateur,expiration` lues dans la table sur disque.
+
+    Args:
+        lignes (iterable of str): Les lignes lues, sans saut de ligne. L'en-tête et les lignes invalides sont ignorés.
+    """
+    for ligne in lignes:
+        champs = ligne.split(",")
+        if len(champs) != 3 or not champs[2].isdigit():
+            continue  # En-tête, ancienne session d'une seule ligne ou ligne invalide
+        jeton, utilisateur, expiration = champs
+        ETAT_SESSIONS["entrees"] += 1
+        if int(expiration) == 0:
+            CACHE_SESSIONS.pop(jeton, None)
+        else:
+            CACHE_SESSIONS[jeton] = (utilisateur, int(expiration))
+
+
+def ajouter_entree(jeton, utilisateur, expiration):
+    """Ajoute une entrée à la fin de la table des sessions sur disque.
+
+    Args:
+        jeton (str): Le jeton de la session.
+        utilisateur (str): Le nom de l'utilisateur (vide pour une révocation).
+        expiration (int): Le moment d'expiration (secondes depuis l'époque), ou 0 pour une révocation.
+    """
+    with verrouiller_fichier(FICHIER_SESSION):
+        with open(FICHIER_SESSION, "ab") as fichier:
+            if fichier.tell() == 0:
+                fichier.write(EN_TETE_SESSIONS)
+            fichier.write(f"{jeton},{utilisateur},{expiration:.0f}\n".encode("utf-8"))
+
+
+def tests_gestionnaire_sessions():
+    from utilitaires import dossier_donnees_temporaire
+
+    with dossier_donnees_temporaire():
+        # Teste l'ouverture et la validation d'une session.
+        jeton = creer_session("alice")
+        assert valider_session(jeton) == "alice"
+        assert valider_session("inconnu") is None and valider_session(None) is None
+
+        # Teste qu'une validation ne réécrit pas la table tant que l'intervalle de purge n'est pas écoulé.
+        inode = os.stat(FICHIER_SESSION).st_ino
+        ETAT_SESSIONS["prochaine_purge"] = time.time() + INTERVALLE_PURGE_SESSIONS
+        assert valider_session(jeton) == "alice"
+        assert os.stat(FICHIER_SESSION).st_ino == inode
+
+        # Teste l'expiration.
+        expiree = creer_session("bob", duree=-1)
+        assert valider_session(expiree) is None
+
+        # Teste la révocation par le même processus.
+        revoquee = creer_session("carole")
+        revoquer_session(revoquee)
+        assert valider_session(revoquee) is None
+
+        # Teste qu'une session ouverte par un autre processus (écrite directement dans la table) est lue dès
+        # sa première validation, et qu'une validation en cache ne relit pas la table.
+        jeton_externe = "jeton-externe"
+        ajouter_entree(jeton_externe, "david", int(time.time()) + 60)
+        assert valider_session(jeton_externe) == "david"
+        octets_lus = ETAT_SESSIONS["octets_lus"]
+        ajouter_entree(jeton_externe, "", 0)
+        assert valider_session(jeton_externe) == "david"
+        assert ETAT_SESSIONS["octets_lus"] == octets_lus
+
+        # Teste que la révocation par un autre processus est vue une fois l'intervalle de synchronisation écoulé.
+        ETAT_SESSIONS["prochaine_synchronisation"] = 0
+        assert valider_session(jeton_externe) is None
+        ajouter_entree(jeton, "", 0)
+        ETAT_SESSIONS["prochaine_synchronisation"] = 0
+        assert valider_session(jeton) is None
+
+        # Teste que la purge compacte la table, puis ne la réécrit plus s'il n'y a rien à retirer.
+        vivante = creer_session("eve")
+        assert purger_sessions_expirees(forcer=True) == 1
+        inode = os.stat(FICHIER_SESSION).st_ino
+        with open(FICHIER_SESSION, "rb") as fichier:
+            assert fichier.read().count(b"\n") == 2  # En-tête et session d'eve
+        assert purger_sessions_expirees(forcer=True) == 1
+        assert os.stat(FICHIER_SESSION).st_ino == inode
+        assert valider_session(vivante) == "eve"
+
+        # Teste qu'une session ajoutée après la purge est lue par un processus dont le cache est vide.
+        autre = creer_session("frank")
+        CACHE_SESSIONS.clear()
+        ETAT_SESSIONS["inode"] = None
+        assert valider_session(autre) == "frank" and valider_session(vivante) == "eve"
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'gestionnaire_sessions'...")
+    tests_gestionnaire_sessions()
+    print("Tests réussis!")
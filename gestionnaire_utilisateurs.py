@@ -6,68 +6,93 @@ tels que les noms d'utilisateurs et les mots de passe (sous forme hachée).
 
 Fonctions:
 - `creer_compte()`: Crée un nouveau compte utilisateur.
+- `nom_utilisateur_est_valide(utilisateur)`: Vérifie si un nom d'utilisateur peut être enregistré.
+- `nom_utilisateur_est_pris(utilisateur)`: Vérifie si un nom d'utilisateur est déjà pris.
+- `garantir_filtre_utilisateurs()`: Recrée le filtre de Bloom des utilisateurs s'il est absent ou périmé.
+- `source_filtre_utilisateurs()`: Retourne la taille et la date de modification du fichier des utilisateurs.
+- `reconstruire_filtre_utilisateurs()`: Recrée le filtre de Bloom des utilisateurs.
+- `creer_comptes(comptes, processus)`: Crée des comptes en lot, en hachant les mots de passe en parallèle.
 - `se_connecter()`: Connecte un utilisateur existant en vérifiant son nom d'utilisateur et son mot de passe.
 - `se_deconnecter()`: Déconnecte l'utilisateur actuel.
 - `utilisateur_est_connecte()`: Vérifie si un utilisateur est connecté.
 - `recuperer_utilisateur_courant()`: Récupère l'utilisateur actuellement connecté.
 - `definir_utilisateur_courant(nom_utilisateur)`: Définit l'utilisateur actuellement connecté.
-- `vider_session()`: Efface les informations de session de l'utilisateur actuellement connecté.
+- `vider_session()`: Ferme la session de l'utilisateur actuellement connecté.
 
 Dépendances:
+- `os`: Pour lire la taille et la date de modification du fichier des utilisateurs et compter les processeurs.
+- `concurrent.futures`: Pour hacher en parallèle les mots de passe des comptes créés en lot.
+- `filtre_bloom`: Pour vérifier rapidement si un nom d'utilisateur est libre.
 - `secrets`: Pour comparer les hachages (https://docs.python.org/3/library/secrets.html#secrets.compare_digest).
 - `gestionnaire_donnees`: Pour lire et écrire dans le fichier des utilisateurs.
-- `utilitaires`: Pour hacher les mots de passe.
-- `configuration`: Pour accéder au chemin du fichier de session.
+- `utilitaires`: Pour hacher et vérifier les mots de passe.
+- `gestionnaire_sessions`: Pour ouvrir, valider et fermer les sessions par jeton.
+- `configuration`: Pour accéder aux chemins des fichiers et aux paramètres du filtre de Bloom.
 """
 
+import os
 import secrets
-from gestionnaire_donnees import charger_utilisateurs, sauvegarder_utilisateurs
-from utilitaires import hacher_mot_de_passe, garantir_existence_fichier, tests_hacher_mot_de_passe
-from configuration import FICHIER_SESSION, FICHIER_UTILISATEURS
+from concurrent.futures import ProcessPoolExecutor
+from filtre_bloom import creer_filtre, filtre_peut_contenir, ajouter_au_filtre, lire_source_filtre
+from gestionnaire_donnees import charger_utilisateurs, ajouter_utilisateur, ajouter_utilisateurs
+from gestionnaire_sessions import creer_session, valider_session, revoquer_session
+from utilitaires import (
+    hacher_mot_de_passe,
+    verifier_mot_de_passe,
+    garantir_existence_fichier,
+    tests_hacher_mot_de_passe,
+    verrouiller_fichier,
+)
+from configuration import (
+    FICHIER_UTILISATEURS,
+    FICHIER_FILTRE_UTILISATEURS,
+    CAPACITE_FILTRE_UTILISATEURS,
+    TAUX_FAUX_POSITIFS_UTILISATEURS,
+)
+
+# Jeton de la session ouverte par ce client (None si aucun utilisateur n'est connecté).
+SESSION_COURANTE = {"jeton": None}
 
 
 def recuperer_utilisateur_courant():
-    """Récupère le nom de l'utilisateur actuellement connecté depuis le fichier de session.
+    """Récupère le nom de l'utilisateur connecté dans ce client, à partir de son jeton de session.
 
-    Cette fonction lit le fichier de session pour déterminer l'utilisateur actuellement connecté.
-    Si le fichier contient un nom d'utilisateur, celui-ci est retourné sous forme de chaîne de caractères.
-    Si le fichier est vide, la fonction retourne `None`.
+    Le jeton du client est validé auprès du gestionnaire de sessions. Si la session est valide,
+    le nom de l'utilisateur est retourné; si aucune session n'est ouverte, ou si elle a expiré
+    ou été révoquée, la fonction retourne `None`.
 
     Returns:
         str or None: Le nom de l'utilisateur actuellement connecté (str)
                      ou `None` si aucun utilisateur n'est connecté.
     """
-    with open(FICHIER_SESSION, "r") as fichier:
-        caracteres = fichier.readline()
-        if caracteres != "":
-            return caracteres
-        else:
-            return None
+    return valider_session(SESSION_COURANTE["jeton"])
 
 
 def definir_utilisateur_courant(nom_utilisateur):
-    """Définit l'utilisateur actuellement connecté en enregistrant son nom dans le fichier de session.
+    """Définit l'utilisateur connecté dans ce client en lui ouvrant une nouvelle session.
 
-    Cette fonction marque l'utilisateur comme étant actuellement connecté en écrivant son nom
-    dans le fichier de session. Toute connexion précédente est remplacée, car le fichier de session
-    est écrasé à chaque appel.
+    Une session est créée pour l'utilisateur et son jeton est conservé par le client. Les sessions
+    des autres clients ne sont pas affectées; la session précédente de ce client, s'il y en a une, est révoquée.
 
     Args:
         nom_utilisateur (str): Le nom de l'utilisateur à enregistrer comme utilisateur connecté.
+
+    Returns:
+        str: Le jeton de la nouvelle session.
     """
-    with open(FICHIER_SESSION, "w") as fichier:
-        fichier.write(f"{nom_utilisateur}\n")
+    revoquer_session(SESSION_COURANTE["jeton"])
+    SESSION_COURANTE["jeton"] = creer_session(nom_utilisateur)
+    return SESSION_COURANTE["jeton"]
 
 
 def vider_session():
-    """Efface les informations de session pour déconnecter l'utilisateur actuellement connecté.
+    """Ferme la session de ce client pour déconnecter l'utilisateur actuellement connecté.
 
-    Cette fonction vide le contenu du fichier de session, marquant ainsi l'utilisateur comme déconnecté.
+    Returns:
+        bool: True si un utilisateur est encore connecté après l'opération, False sinon.
     """
-    with open(FICHIER_SESSION, "r") as fichier:
-        caracteres = fichier.read().strip()
-        if not caracteres or utilisateur_est_connecte():
-            open(FICHIER_SESSION, "w").close()
+    revoquer_session(SESSION_COURANTE["jeton"])
+    SESSION_COURANTE["jeton"] = None
 
     return utilisateur_est_connecte()
 
@@ -76,38 +101,177 @@ def creer_compte():
     """Crée un nouveau compte utilisateur en demandant un nom d'utilisateur et un mot de passe.
 
     Cette fonction suit les étapes suivantes :
-      1. Charge les utilisateurs existants depuis le fichier des utilisateurs.
-      2. Demande un nom d'utilisateur unique. Si le nom d'utilisateur existe déjà, un message d'erreur est affiché et la fonction se termine.
-      3. Demande un mot de passe, le hache pour plus de sécurité, puis ajoute les informations au dictionnaire des utilisateurs.
-      4. Sauvegarde le dictionnaire mis à jour dans le fichier des utilisateurs.
-
+      1. Demande un nom d'utilisateur et vérifie qu'il est valide (voir `nom_utilisateur_est_valide`) et libre.
+         Le filtre de Bloom des utilisateurs est consulté d'abord : s'il répond que le nom est certainement libre,
+         le fichier des utilisateurs n'est pas lu.
+         Sinon, les utilisateurs existants sont chargés pour une vérification exacte. Si le nom d'utilisateur
+         existe déjà, un message d'erreur est affiché et la fonction se termine.
+      2. Demande un mot de passe et le hache pour plus de sécurité.
+      3. Ajoute l'utilisateur à la fin du fichier des utilisateurs et au filtre de Bloom.
+
+    La vérification et l'ajout sont faits sous verrou, afin que deux clients ne puissent pas créer le même compte.
     Le hachage du mot de passe est réalisé via la fonction `hacher_mot_de_passe`, garantissant la sécurité des informations d'authentification.
 
-    Affiche un message de confirmation si le compte est créé avec succès, ou un message d'erreur si le nom d'utilisateur est déjà pris.
+    Affiche un message de confirmation si le compte est créé avec succès, ou un message d'erreur si le nom d'utilisateur est invalide ou déjà pris.
     """
-    utilisateurs_existants = charger_utilisateurs()
-
+    garantir_filtre_utilisateurs()
     utilisateur = input("Nom d'utilisateur: ")
-    if utilisateur in utilisateurs_existants:
+    if not nom_utilisateur_est_valide(utilisateur):
+        return print("Nom d'utilisateur invalide: il ne doit pas être vide, être entouré d'espaces, ni contenir de virgule.")
+    if nom_utilisateur_est_pris(utilisateur):
         return print("Nom d'utilisateur déjà pris.")
 
     mot_passe = input("Mot de passe: ")
     hash_mot_de_passe = hacher_mot_de_passe(mot_passe)
 
-    utilisateurs_existants[utilisateur] = hash_mot_de_passe
-    sauvegarder_utilisateurs(utilisateurs_existants)
+    with verrouiller_fichier(FICHIER_UTILISATEURS):
+        if nom_utilisateur_est_pris(utilisateur):
+            return print("Nom d'utilisateur déjà pris.")
+        ajouter_utilisateur(utilisateur, hash_mot_de_passe)
+        if ajouter_au_filtre(FICHIER_FILTRE_UTILISATEURS, utilisateur, source_filtre_utilisateurs()):
+            reconstruire_filtre_utilisateurs()
+
     return print("Compte créé avec succès.")
 
 
+def nom_utilisateur_est_valide(utilisateur):
+    """Vérifie si un nom d'utilisateur peut être enregistré dans le fichier des utilisateurs.
+
+    Un nom vide, entouré d'espaces ou contenant une virgule ou un saut de ligne corromprait le fichier des
+    utilisateurs, ou ne pourrait plus être saisi à la connexion.
+
+    Args:
+        utilisateur (str): Le nom d'utilisateur à vérifier.
+
+    Returns:
+        bool: True si le nom d'utilisateur est valide, False sinon.
+    """
+    return bool(utilisateur) and utilisateur == utilisateur.strip() and not any(c in utilisateur for c in ",\r\n")
+
+
+def nom_utilisateur_est_pris(utilisateur):
+    """Vérifie si un nom d'utilisateur est déjà pris.
+
+    Le filtre de Bloom est consulté en premier; le fichier des utilisateurs n'est lu que si le filtre
+    répond que le nom est peut-être pris. Si le filtre n'existe pas (voir `garantir_filtre_utilisateurs`),
+    le fichier des utilisateurs est lu directement.
+
+    Args:
+        utilisateur (str): Le nom d'utilisateur à vérifier.
+
+    Returns:
+        bool: True si le nom d'utilisateur existe déjà, False sinon.
+    """
+    if os.path.isfile(FICHIER_FILTRE_UTILISATEURS) and not filtre_peut_contenir(FICHIER_FILTRE_UTILISATEURS, utilisateur):
+        return False
+    return utilisateur in charger_utilisateurs()
+
+
+def garantir_filtre_utilisateurs():
+    """Recrée le filtre de Bloom des utilisateurs s'il n'existe pas encore ou s'il est périmé.
+
+    Le filtre enregistre la taille et la date de modification du fichier des utilisateurs après chaque ajout
+    (voir `source_filtre_utilisateurs`). Si elles ne correspondent plus au fichier, celui-ci a été modifié sans
+    passer par le filtre (restauration d'une sauvegarde, modification manuelle), et le filtre pourrait déclarer
+    libre un nom déjà pris : il est alors recréé.
+
+    La reconstruction est faite sous le verrou du fichier des utilisateurs : sans lui, un filtre reconstruit par
+    un client pourrait remplacer celui auquel un autre client vient d'ajouter un nouvel utilisateur.
+    """
+    if lire_source_filtre(FICHIER_FILTRE_UTILISATEURS) == source_filtre_utilisateurs():
+        return
+    with verrouiller_fichier(FICHIER_UTILISATEURS):
+        if lire_source_filtre(FICHIER_FILTRE_UTILISATEURS) != source_filtre_utilisateurs():
+            reconstruire_filtre_utilisateurs()
+
+
+def source_filtre_utilisateurs():
+    """Retourne la taille et la date de modification du fichier des utilisateurs, enregistrées dans le filtre.
+
+    Returns:
+        tuple: (taille en octets, date de modification en nanosecondes), ou (0, 0) si le fichier n'existe pas.
+    """
+    try:
+        etat = os.stat(FICHIER_UTILISATEURS)
+    except FileNotFoundError:
+        return 0, 0
+    return etat.st_size, etat.st_mtime_ns
+
+
+def reconstruire_filtre_utilisateurs():
+    """Recrée le filtre de Bloom des utilisateurs à partir du fichier des utilisateurs.
+
+    Le filtre est dimensionné pour le double du nombre d'utilisateurs actuel, et au moins pour
+    `CAPACITE_FILTRE_UTILISATEURS` utilisateurs. L'appelant est responsable de verrouiller le fichier des
+    utilisateurs pendant la reconstruction (voir `verrouiller_fichier`).
+
+    Returns:
+        int: Le nombre d'utilisateurs ajoutés au filtre.
+    """
+    source = source_filtre_utilisateurs()
+    utilisateurs = charger_utilisateurs()
+    capacite = max(CAPACITE_FILTRE_UTILISATEURS, 2 * len(utilisateurs))
+    return creer_filtre(FICHIER_FILTRE_UTILISATEURS, utilisateurs, capacite, TAUX_FAUX_POSITIFS_UTILISATEURS, source)
+
+
+def creer_comptes(comptes, processus=None):
+    """Crée des comptes en lot, par exemple pour importer les utilisateurs d'un autre système.
+
+    Comme la fonction de dérivation de clé est volontairement coûteuse (voir `hacher_mot_de_passe`), les
+    mots de passe sont hachés en parallèle dans un bassin de processus, sans verrou. Les nouveaux utilisateurs
+    sont ensuite ajoutés au fichier des utilisateurs en une seule écriture, sous verrou, et le filtre de Bloom
+    est recréé une seule fois pour tout le lot.
+
+    Les noms d'utilisateur invalides (voir `nom_utilisateur_est_valide`), répétés dans le lot ou déjà pris,
+    y compris par un compte créé pendant le hachage, sont ignorés.
+
+    Args:
+        comptes (iterable): Des paires (nom d'utilisateur, mot de passe en clair).
+        processus (int): Le nombre de processus (par défaut, le nombre de processeurs).
+
+    Returns:
+        tuple: (nombre de comptes créés, nombre de comptes ignorés).
+    """
+    utilisateurs_existants = charger_utilisateurs()
+    utilisateurs = []
+    mots_de_passe = []
+    ignores = 0
+    for utilisateur, mot_passe in comptes:
+        if not nom_utilisateur_est_valide(utilisateur) or utilisateur in utilisateurs_existants:
+            ignores += 1
+            continue
+        utilisateurs_existants[utilisateur] = None
+        utilisateurs.append(utilisateur)
+        mots_de_passe.append(mot_passe)
+
+    if not utilisateurs:
+        return 0, ignores
+
+    processus = processus or os.cpu_count() or 1
+    with ProcessPoolExecutor(processus) as bassin:
+        taille_lot = max(1, len(mots_de_passe) // (4 * processus))
+        hachages = list(bassin.map(hacher_mot_de_passe, mots_de_passe, chunksize=taille_lot))
+
+    with verrouiller_fichier(FICHIER_UTILISATEURS):
+        utilisateurs_existants = charger_utilisateurs()
+        nouveaux = [(utilisateur, hachage) for utilisateur, hachage in zip(utilisateurs, hachages)
+                    if utilisateur not in utilisateurs_existants]
+        ajouter_utilisateurs(nouveaux)
+        reconstruire_filtre_utilisateurs()
+
+    return len(nouveaux), ignores + len(utilisateurs) - len(nouveaux)
+
+
 def se_connecter():
     """Connecte un utilisateur existant en vérifiant ses informations d'identification.
 
     Cette fonction suit les étapes suivantes :
       1. Charge les utilisateurs existants depuis le fichier des utilisateurs.
       2. Demande à l'utilisateur de saisir son nom d'utilisateur et son mot de passe.
-      3. Hache le mot de passe fourni et le compare au mot de passe haché stocké pour l'utilisateur.
+      3. Vérifie le mot de passe fourni contre le mot de passe haché stocké pour l'utilisateur, avec l'algorithme
+         et les paramètres enregistrés dans ce hachage (voir `verifier_mot_de_passe`).
       4. Si les informations sont correctes (nom d'utilisateur existant et mot de passe correspondant),
-         l'utilisateur est marqué comme connecté en enregistrant son nom dans le fichier de session.
+         une session est ouverte pour l'utilisateur et son jeton est conservé par le client.
          Un message de confirmation est affiché.
       5. Si les informations sont incorrectes, un message d'erreur est affiché.
 
@@ -119,9 +283,9 @@ def se_connecter():
 
     utilisateur = input("Nom d'utilisateur: ")
     mot_passe = input("Mot de passe: ")
-    hash_mot_de_passe = hacher_mot_de_passe(mot_passe)
+    hash_mot_de_passe = utilisateurs_existants.get(utilisateur)
 
-    if (utilisateur, hash_mot_de_passe) not in list(utilisateurs_existants.items()):
+    if hash_mot_de_passe is None or not verifier_mot_de_passe(mot_passe, hash_mot_de_passe):
         return print("Nom d'utilisateur ou mot de passe incorrect.")
     else:
         definir_utilisateur_courant(utilisateur)
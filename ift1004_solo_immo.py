@@ -16,16 +16,19 @@ Ce module utilise des fonctions définies dans d'autres modules comme `gestionna
 """
 
 from configuration import FICHIER_UTILISATEURS, FICHIER_PROPRIETES, FICHIER_SESSION
+from gestionnaire_donnees import preparer_fichier_proprietes
 from gestionnaire_proprietes import (
     lister_proprietes,
     filtrer_proprietes,
     ajouter_propriete,
+    lister_mes_proprietes,
 )
 from gestionnaire_utilisateurs import (
     creer_compte,
     se_connecter,
     se_deconnecter,
     utilisateur_est_connecte,
+    vider_session,
 )
 from utilitaires import afficher_banniere, garantir_existence_fichier
 
@@ -38,7 +41,7 @@ def main():
     l'affichage des menus et la gestion des actions des utilisateurs. L'utilisateur peut choisir
     de créer un compte, se connecter avec un compte existant, consulter les propriétés existantes,
     filtrer les propriétés ou quitter l'application. Une fois connecté, l'utilisateur a accès à
-    des actions supplémentaires telles qu'ajouter une propriété, ou se déconnecter.
+    des actions supplémentaires telles qu'ajouter une propriété, consulter ses propriétés, ou se déconnecter.
 
     L'utilisateur peut choisir une option en entrant le numéro correspondant, et la boucle
     continue jusqu'à ce que l'utilisateur choisisse de quitter.
@@ -46,6 +49,7 @@ def main():
     garantir_existence_fichier(FICHIER_UTILISATEURS)
     garantir_existence_fichier(FICHIER_PROPRIETES)
     garantir_existence_fichier(FICHIER_SESSION)
+    preparer_fichier_proprietes()
 
     afficher_banniere("Bienvenue sur IFT-1004 Solo Immo !")
 
@@ -61,6 +65,8 @@ def main():
             print("3. Créer un compte")
             print("4. Connexion")
         print("5. Quitter")
+        if utilisateur_est_connecte():
+            print("6. Mes propriétés")
 
         choix = input("Choisissez une option: ")
 
@@ -77,10 +83,13 @@ def main():
         elif choix == "4":
             se_connecter()
         elif choix == "5":
+            vider_session()
             print(
                 "IFT-1004 Solo Immo: Trouvez votre chez-vous, sans les agents embêtants !"
             )
             continuer = False
+        elif choix == "6" and utilisateur_est_connecte():
+            lister_mes_proprietes()
         else:
             print("Option invalide.")
 
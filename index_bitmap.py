@@ -0,0 +1,215 @@
+"""
+Ce module fournit des index bitmap pour l'application IFT-1004 Solo Immo, permettant de filtrer
+rapidement les propriétés sur des colonnes de faible cardinalité (ville, type, chambres, salles de bains).
+
+Pour chaque valeur distincte d'une colonne, l'index conserve un bitmap dont le bit `i` est à 1 si la
+propriété à la position `i` possède cette valeur. Les bitmaps sont représentés par des entiers Python,
+dont les opérations bit à bit (ET, OU) et le comptage des bits sont exécutés en C, mot machine par
+mot machine. Les critères d'égalité, de plage (>=, <=) et leurs combinaisons se résument donc à quelques
+opérations sur des entiers, sans parcourir les propriétés.
+
+Fonctions:
+- `construire_index_bitmap(valeurs)`: Construit l'index bitmap d'une colonne.
+- `indexer_proprietes(proprietes)`: Construit les index bitmap de toutes les colonnes indexées.
+- `indexer_colonnes(colonnes)`: Construit les mêmes index à partir des propriétés chargées colonne par colonne.
+- `bitmap_egal(index, valeur)`: Retourne le bitmap des positions ayant exactement cette valeur.
+- `bitmap_plage(index, minimum, maximum)`: Retourne le bitmap des positions dont la valeur est dans la plage.
+- `compter_bitmap(bitmap)`: Compte le nombre de positions sélectionnées par un bitmap.
+- `positions_bitmap(bitmap)`: Itère sur les positions sélectionnées par un bitmap, en ordre croissant.
+
+Le prix, dont les valeurs sont presque toutes distinctes, est indexé par tranche de prix (voir
+`tranche_prix`) : une plage de prix est l'union des tranches qu'elle couvre entièrement, auxquelles
+s'ajoutent les propriétés des deux tranches partiellement couvertes qui sont dans la plage.
+
+Dépendances:
+- `re`: Pour sauter rapidement les octets nuls lors de l'itération sur les positions d'un bitmap.
+- `statistiques`: Pour les tranches de prix.
+"""
+
+import re
+
+from statistiques import tranche_prix
+
+# Colonnes des propriétés pour lesquelles un index bitmap est construit.
+COLONNES_INDEXEES = ["ville", "type", "chambres", "salles_de_bains"]
+
+# Repère les octets non nuls d'un bitmap sérialisé.
+OCTET_NON_NUL = re.compile(b"[^\x00]")
+
+# Positions des bits à 1 pour chacune des 256 valeurs possibles d'un octet.
+BITS_PAR_OCTET = [[bit for bit in range(8) if octet >> bit & 1] for octet in range(256)]
+
+
+def construire_index_bitmap(valeurs):
+    """Construit l'index bitmap d'une colonne.
+
+    Args:
+        valeurs (iterable): Les valeurs de la colonne, dans l'ordre des propriétés.
+
+    Returns:
+        dict: Un dictionnaire associant chaque valeur distincte à son bitmap (int).
+
+    Exemple:
+        >>> construire_index_bitmap([3, 2, 3])
+        {3: 5, 2: 2}
+    """
+    tampons = {}
+    for position, valeur in enumerate(valeurs):
+        tampon = tampons.get(valeur)
+        if tampon is None:
+            tampon = tampons[valeur] = bytearray()
+        octet = position >> 3
+        if octet >= len(tampon):
+            tampon.extend(bytes(octet - len(tampon) + 1))
+        tampon[octet] |= 1 << (position & 7)
+
+    return {valeur: int.from_bytes(tampon, "little") for valeur, tampon in tampons.items()}
+
+
+def indexer_proprietes(proprietes):
+    """Construit les index bitmap de toutes les colonnes indexées.
+
+    Args:
+        proprietes (list): La liste des propriétés (dictionnaires) à indexer.
+
+    Returns:
+        dict: Un dictionnaire associant chaque colonne de `COLONNES_INDEXEES` à son index bitmap.
+              La clé "tranches_prix" contient l'index bitmap des tranches de prix, et la clé "tous" le bitmap
+              sélectionnant toutes les propriétés.
+    """
+    return indexer_colonnes(
+        {colonne: [propriete[colonne] for propriete in proprietes] for colonne in ["prix", *COLONNES_INDEXEES]}
+    )
+
+
+def indexer_colonnes(colonnes):
+    """Construit les index bitmap de toutes les colonnes indexées, à partir des propriétés chargées colonne par
+    colonne (voir `charger_colonnes_proprietes`), sans dictionnaire par propriété.
+
+    Args:
+        colonnes (dict): Les valeurs de chaque colonne (au moins "prix" et `COLONNES_INDEXEES`), dans l'ordre
+                         des propriétés.
+
+    Returns:
+        dict: Les index bitmap, comme `indexer_proprietes`.
+    """
+    index = {colonne: construire_index_bitmap(colonnes[colonne]) for colonne in COLONNES_INDEXEES}
+    index["tranches_prix"] = construire_index_bitmap(map(tranche_prix, colonnes["prix"]))
+    index["tous"] = (1 << len(colonnes["prix"])) - 1
+    return index
+
+
+def bitmap_egal(index, valeur):
+    """Retourne le bitmap des positions ayant exactement la valeur donnée.
+
+    Args:
+        index (dict): L'index bitmap d'une colonne.
+        valeur: La valeur recherchée.
+
+    Returns:
+        int: Le bitmap correspondant, ou 0 si la valeur est absente.
+    """
+    return index.get(valeur, 0)
+
+
+def bitmap_plage(index, minimum=None, maximum=None):
+    """Retourne le bitmap des positions dont la valeur est comprise dans une plage.
+
+    Les bornes sont inclusives; une borne à `None` n'est pas appliquée. Comme les colonnes indexées
+    ont peu de valeurs distinctes, le résultat est l'union (OU) de quelques bitmaps.
+
+    Args:
+        index (dict): L'index bitmap d'une colonne.
+        minimum: La valeur minimale (incluse), ou `None`.
+        maximum: La valeur maximale (incluse), ou `None`.
+
+    Returns:
+        int: Le bitmap des positions dont la valeur est dans la plage.
+
+    Exemple:
+        >>> bitmap_plage({1: 1, 2: 2, 3: 4}, minimum=2)
+        6
+    """
+    resultat = 0
+    for valeur, bitmap in index.items():
+        if (minimum is None or valeur >= minimum) and (maximum is None or valeur <= maximum):
+            resultat |= bitmap
+    return resultat
+
+
+def compter_bitmap(bitmap):
+    """Compte le nombre de positions sélectionnées par un bitmap.
+
+    Args:
+        bitmap (int): Le bitmap à compter.
+
+    Returns:
+        int: Le nombre de bits à 1.
+    """
+    return bitmap.bit_count()
+
+
+def positions_bitmap(bitmap):
+    """Itère sur les positions sélectionnées par un bitmap, en ordre croissant.
+
+    Les octets nuls sont sautés par une expression régulière (exécutée en C), ce qui rend l'itération
+    proportionnelle au nombre de positions sélectionnées plutôt qu'à la taille du bitmap.
+
+    Args:
+        bitmap (int): Le bitmap à parcourir.
+
+    Yields:
+        int: Les positions dont le bit est à 1.
+
+    Exemple:
+        >>> list(positions_bitmap(0b100101))
+        [0, 2, 5]
+    """
+    octets = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for correspondance in OCTET_NON_NUL.finditer(octets):
+        debut = correspondance.start()
+        base = debut << 3
+        for bit in BITS_PAR_OCTET[octets[debut]]:
+            yield base + bit
+
+
+def tests_index_bitmap():
+    # Teste la construction d'un index sur une petite colonne.
+    index = construire_index_bitmap([3, 1, 2, 3, 4])
+    assert index == {3: 0b01001, 1: 0b00010, 2: 0b00100, 4: 0b10000}
+
+    # Teste les critères d'égalité et de plage.
+    assert bitmap_egal(index, 3) == 0b01001
+    assert bitmap_egal(index, 9) == 0
+    assert list(positions_bitmap(bitmap_plage(index, minimum=3))) == [0, 3, 4]
+    assert list(positions_bitmap(bitmap_plage(index, maximum=2))) == [1, 2]
+    assert list(positions_bitmap(bitmap_plage(index, 2, 3))) == [0, 2, 3]
+    assert bitmap_plage(index) == 0b11111
+
+    # Teste la combinaison de deux index par un ET bit à bit.
+    villes = construire_index_bitmap(["Québec", "Québec", "Toronto", "Québec", "Toronto"])
+    selection = bitmap_egal(villes, "Québec") & bitmap_plage(index, minimum=3)
+    assert list(positions_bitmap(selection)) == [0, 3]
+    assert compter_bitmap(selection) == 2
+
+    # Teste l'itération sur un bitmap vide et sur des positions éloignées.
+    assert list(positions_bitmap(0)) == []
+    assert list(positions_bitmap(1 << 100_000 | 1)) == [0, 100_000]
+
+    # Teste l'index de toutes les propriétés.
+    index_proprietes = indexer_proprietes(
+        [{"prix": 250_000, "ville": "Québec", "type": "Condo", "chambres": 2, "salles_de_bains": 1}]
+    )
+    assert index_proprietes["tous"] == 1
+    assert index_proprietes["chambres"] == {2: 1}
+    assert index_proprietes["tranches_prix"] == {tranche_prix(250_000): 1}
+    assert indexer_colonnes(
+        {"prix": (250_000,), "ville": ("Québec",), "type": ("Condo",), "chambres": (2,), "salles_de_bains": (1,)}
+    ) == index_proprietes
+    assert indexer_colonnes({colonne: () for colonne in ["prix", *COLONNES_INDEXEES]})["tous"] == 0
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'index_bitmap'...")
+    tests_index_bitmap()
+    print("Tests réussis!")
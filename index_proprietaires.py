@@ -0,0 +1,215 @@
+"""
+Ce module maintient l'index des propriétaires de l'application IFT-1004 Solo Immo : pour chaque
+propriétaire, la liste des identifiants des propriétés qu'il a ajoutées. L'identifiant d'une propriété
+est sa position (décalage en octets) dans le fichier des propriétés, ce qui permet de relire ses
+propriétés directement, sans parcourir tout le catalogue.
+
+L'index est conservé sur disque sous la forme d'un fichier de lignes `proprietaire,identifiant`, auquel
+une ligne est ajoutée à chaque sauvegarde de propriété. Comme pour les sessions, une copie en mémoire est
+maintenue à jour en ne lisant que les lignes ajoutées depuis la dernière lecture.
+
+Chaque ajout est suivi d'une ligne `,longueur` (sans propriétaire), qui enregistre la longueur du fichier des
+propriétés couverte par l'index. La propriété est écrite avant son entrée : si un arrêt brutal survient entre
+les deux, le fichier des propriétés dépasse la longueur indexée, et les propriétés manquantes peuvent être
+ajoutées à l'index à partir de cette longueur (voir `completer_index_proprietaires` dans `gestionnaire_donnees`).
+
+Fonctions:
+- `ajouter_au_index_proprietaires(proprietaire, identifiant, longueur)`: Ajoute une propriété à l'index.
+- `ajouter_entrees_manquantes(entrees, longueur)`: Ajoute à l'index les entrées qui n'y sont pas encore.
+- `identifiants_du_proprietaire(proprietaire)`: Retourne les identifiants des propriétés d'un propriétaire.
+- `longueur_indexee()`: Retourne la longueur du fichier des propriétés couverte par l'index.
+- `ecrire_index_proprietaires(entrees, longueur)`: Remplace l'index par les entrées fournies.
+- `synchroniser_index_proprietaires()`: Ajoute à la copie en mémoire les lignes ajoutées depuis la dernière lecture.
+
+Dépendances:
+- `os`: Pour remplacer atomiquement l'index lors d'une reconstruction.
+- `configuration`: Pour le chemin du fichier de l'index des propriétaires.
+- `utilitaires`: Pour verrouiller le fichier de l'index entre processus et ne lire que ses lignes ajoutées.
+"""
+
+import os
+
+from configuration import FICHIER_INDEX_PROPRIETAIRES
+from utilitaires import verrouiller_fichier, synchroniser_fichier
+
+# Copie en mémoire de l'index: proprietaire -> liste des identifiants de ses propriétés.
+INDEX_PROPRIETAIRES = {}
+
+# Identité (inode) et position de lecture du fichier de l'index, et longueur du fichier des propriétés
+# couverte par l'index (`None` pour un index qui ne l'enregistre pas, créé par une version précédente).
+ETAT_INDEX_PROPRIETAIRES = {"inode": None, "octets_lus": 0, "longueur": None}
+
+
+def ajouter_au_index_proprietaires(proprietaire, identifiant, longueur):
+    """Ajoute une propriété à l'index des propriétaires, avec la longueur indexée du fichier des propriétés.
+
+    Args:
+        proprietaire (str): Le nom du propriétaire, ou une chaîne vide pour une propriété sans propriétaire
+                            (seule la longueur indexée est alors enregistrée).
+        identifiant (int): L'identifiant (décalage en octets) de la propriété dans le fichier des propriétés.
+        longueur (int): La longueur du fichier des propriétés après l'ajout de la propriété.
+    """
+    entree = f"{proprietaire},{identifiant}\n" if proprietaire else ""
+    with verrouiller_fichier(FICHIER_INDEX_PROPRIETAIRES):
+        with open(FICHIER_INDEX_PROPRIETAIRES, "ab") as fichier:
+            fichier.write(f"{entree},{longueur}\n".encode("utf-8"))
+
+
+def ajouter_entrees_manquantes(entrees, longueur):
+    """Ajoute à l'index les entrées qui n'y sont pas encore, puis la nouvelle longueur indexée.
+
+    Une entrée déjà présente (écrite juste avant un arrêt brutal, sans la longueur qui la suit) n'est pas
+    répétée. L'appelant est responsable d'écarter les ajouts concurrents de propriétés.
+
+    Args:
+        entrees (iterable): Des paires (proprietaire, identifiant) des propriétés qui suivent la longueur indexée.
+        longueur (int): La longueur du fichier des propriétés couverte par ces entrées.
+
+    Returns:
+        int: Le nombre d'entrées ajoutées.
+    """
+    with verrouiller_fichier(FICHIER_INDEX_PROPRIETAIRES):
+        synchroniser_index_proprietaires()
+        manquantes = [
+            f"{proprietaire},{identifiant}\n"
+            for proprietaire, identifiant in entrees
+            if identifiant not in INDEX_PROPRIETAIRES.get(proprietaire, ())
+        ]
+        with open(FICHIER_INDEX_PROPRIETAIRES, "ab") as fichier:
+            fichier.write(f"{''.join(manquantes)},{longueur}\n".encode("utf-8"))
+    return len(manquantes)
+
+
+def identifiants_du_proprietaire(proprietaire):
+    """Retourne les identifiants des propriétés d'un propriétaire, dans leur ordre d'ajout.
+
+    Args:
+        proprietaire (str): Le nom du propriétaire.
+
+    Returns:
+        list of int: Les identifiants de ses propriétés (liste vide s'il n'en a aucune).
+    """
+    synchroniser_index_proprietaires()
+    return list(INDEX_PROPRIETAIRES.get(proprietaire, []))
+
+
+def longueur_indexee():
+    """Retourne la longueur du fichier des propriétés couverte par l'index.
+
+    Returns:
+        int or None: La dernière longueur enregistrée, ou `None` si l'index n'existe pas ou n'en contient aucune.
+    """
+    synchroniser_index_proprietaires()
+    return ETAT_INDEX_PROPRIETAIRES["longueur"]
+
+
+def ecrire_index_proprietaires(entrees, longueur):
+    """Remplace l'index des propriétaires par les entrées fournies.
+
+    Args:
+        entrees (iterable): Des paires (proprietaire, identifiant).
+        longueur (int): La longueur du fichier des propriétés couverte par les entrées.
+    """
+    with verrouiller_fichier(FICHIER_INDEX_PROPRIETAIRES):
+        fichier_temporaire = f"{FICHIER_INDEX_PROPRIETAIRES}.tmp"
+        with open(fichier_temporaire, "wb") as fichier:
+            for proprietaire, identifiant in entrees:
+                fichier.write(f"{proprietaire},{identifiant}\n".encode("utf-8"))
+            fichier.write(f",{longueur}\n".encode("utf-8"))
+        os.replace(fichier_temporaire, FICHIER_INDEX_PROPRIETAIRES)
+
+
+def synchroniser_index_proprietaires():
+    """Ajoute à la copie en mémoire les lignes ajoutées à l'index depuis la dernière lecture.
+
+    Si le fichier a été remplacé (reconstruction), il est relu depuis le début (voir `synchroniser_fichier`).
+    """
+    synchroniser_fichier(
+        FICHIER_INDEX_PROPRIETAIRES, ETAT_INDEX_PROPRIETAIRES, vider_index_proprietaires, analyser_lignes_index
+    )
+
+
+def vider_index_proprietaires():
+    """Vide la copie en mémoire de l'index avant une relecture complète du fichier."""
+    ETAT_INDEX_PROPRIETAIRES["longueur"] = None
+    INDEX_PROPRIETAIRES.clear()
+
+
+def analyser_lignes_index(lignes):
+    """Ajoute à la copie en mémoire les lignes `proprietaire,identifiant` et `,longueur` lues dans l'index.
+
+    Args:
+        lignes (iterable of str): Les lignes lues, sans saut de ligne. Les lignes invalides sont ignorées.
+    """
+    for ligne in lignes:
+        proprietaire, _, identifiant = ligne.rpartition(",")
+        if not identifiant.isdigit():
+            continue
+        if proprietaire:
+            INDEX_PROPRIETAIRES.setdefault(proprietaire, []).append(int(identifiant))
+        elif ligne.startswith(","):
+            ETAT_INDEX_PROPRIETAIRES["longueur"] = int(identifiant)
+
+
+def tests_index_proprietaires():
+    from utilitaires import dossier_donnees_temporaire
+
+    with dossier_donnees_temporaire():
+        # Teste un index qui n'existe pas encore.
+        assert identifiants_du_proprietaire("alice") == []
+        assert longueur_indexee() is None
+
+        # Teste les ajouts, lus de façon incrémentale, et la longueur indexée qui les suit.
+        ajouter_au_index_proprietaires("alice", 10, 20)
+        ajouter_au_index_proprietaires("bob", 20, 30)
+        assert identifiants_du_proprietaire("alice") == [10]
+        ajouter_au_index_proprietaires("alice", 30, 40)
+        assert identifiants_du_proprietaire("alice") == [10, 30]
+        assert identifiants_du_proprietaire("bob") == [20]
+        assert longueur_indexee() == 40
+
+        # Teste qu'une propriété sans propriétaire ne fait qu'avancer la longueur indexée.
+        ajouter_au_index_proprietaires("", 40, 50)
+        assert longueur_indexee() == 50 and "" not in INDEX_PROPRIETAIRES
+
+        # Teste le rattrapage après un arrêt brutal : l'entrée écrite sans sa longueur n'est pas répétée.
+        with open(FICHIER_INDEX_PROPRIETAIRES, "ab") as fichier:
+            fichier.write(b"carole,50\n")
+        assert longueur_indexee() == 50
+        assert ajouter_entrees_manquantes([("carole", 50), ("david", 60)], 70) == 1
+        assert identifiants_du_proprietaire("carole") == [50] and identifiants_du_proprietaire("david") == [60]
+        assert longueur_indexee() == 70
+
+        # Teste qu'une ligne incomplète (en cours d'écriture) est laissée pour la prochaine lecture.
+        with open(FICHIER_INDEX_PROPRIETAIRES, "ab") as fichier:
+            fichier.write(b"eve,8")
+        assert identifiants_du_proprietaire("eve") == []
+        with open(FICHIER_INDEX_PROPRIETAIRES, "ab") as fichier:
+            fichier.write(b"0\n")
+        assert identifiants_du_proprietaire("eve") == [80]
+
+        # Teste que la reconstruction remplace la copie en mémoire, et que les ajouts suivants sont lus.
+        ecrire_index_proprietaires([("bob", 5), ("david", 7)], 8)
+        assert identifiants_du_proprietaire("alice") == []
+        assert identifiants_du_proprietaire("bob") == [5]
+        assert identifiants_du_proprietaire("david") == [7]
+        assert longueur_indexee() == 8
+        ajouter_au_index_proprietaires("alice", 9, 10)
+        assert identifiants_du_proprietaire("alice") == [9]
+
+        # Teste qu'un index sans longueur (version précédente) est signalé par une longueur inconnue.
+        with open(FICHIER_INDEX_PROPRIETAIRES, "wb") as fichier:
+            fichier.write(b"alice,1\n")
+        ETAT_INDEX_PROPRIETAIRES["inode"] = None
+        assert identifiants_du_proprietaire("alice") == [1] and longueur_indexee() is None
+
+        # Teste qu'une ligne invalide est ignorée.
+        with open(FICHIER_INDEX_PROPRIETAIRES, "ab") as fichier:
+            fichier.write(b"frank,abc\n")
+        assert identifiants_du_proprietaire("frank") == []
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'index_proprietaires'...")
+    tests_index_proprietaires()
+    print("Tests réussis!")
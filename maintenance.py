@@ -0,0 +1,323 @@
+"""
+Commandes de maintenance de l'application IFT-1004 Solo Immo, à exécuter hors de l'application
+(par exemple pendant une période d'inactivité) sur les fichiers de données.
+
+Utilisation:
+    python maintenance.py <commande> [fichier] [--ordre ORDRE] [--budget-memoire MO] [--processus N]
+
+Commandes:
+- `reconstruire-filtre`: Recrée le filtre de Bloom des utilisateurs à partir du fichier des utilisateurs.
+- `rapport-filtre`: Affiche les paramètres du filtre de Bloom des utilisateurs et son taux de faux positifs estimé.
+- `importer <fichier>`: Importe les propriétés d'un fichier CSV (avec en-tête), en ignorant les doublons et les
+  lignes invalides (affichées).
+- `creer-comptes <fichier>`: Crée les comptes d'un fichier CSV (colonnes utilisateur et mot_de_passe), en hachant
+  les mots de passe dans plusieurs processus (`--processus`) puis en les ajoutant en une seule écriture.
+- `compacter`: Récupère l'espace inutilisé du fichier des propriétés en blocs (octets des blocs réécrits).
+- `dedupliquer`: Retire les doublons et les lignes mal formées (affichées) du fichier des propriétés.
+- `trier <fichier>`: Exporte toutes les propriétés en CSV, par ordre de prix, avec un tri externe dont la
+  mémoire est bornée (`--ordre prix-decroissant` pour l'ordre décroissant, `--budget-memoire` en Mo).
+- `verifier`: Affiche les lignes mal formées des fichiers des utilisateurs et des propriétés, avec leur position.
+
+Fonctions:
+- `lire_proprietes_importees(source, erreurs)`: Lit et valide les propriétés d'un fichier CSV à importer.
+- `convertir_propriete_importee(ligne)`: Convertit et valide une ligne d'un fichier CSV à importer.
+- `main(arguments)`: Analyse les arguments de la ligne de commande et exécute la commande demandée.
+
+Dépendances:
+- `argparse`: Pour analyser les arguments de la ligne de commande.
+- `csv`: Pour lire les fichiers de propriétés et de comptes à importer.
+- `time`: Pour mesurer la durée de la création des comptes en lot.
+- `configuration`: Pour les chemins des fichiers de données et des vocabulaires, et le budget de mémoire du tri externe.
+- `exportation`: Pour exporter les propriétés triées par prix.
+- `filtre_bloom`: Pour décrire le filtre de Bloom des utilisateurs.
+- `gestionnaire_donnees`: Pour importer, dédupliquer, compacter, vérifier et trier les propriétés.
+- `gestionnaire_utilisateurs`: Pour créer des comptes en lot, recréer le filtre de Bloom des utilisateurs et
+  valider les propriétaires importés.
+- `vocabulaire`: Pour valider les villes et les types de propriété importés.
+- `utilitaires`: Pour s'assurer que les fichiers de données existent, les verrouiller et afficher les rapports.
+"""
+
+import argparse
+import csv
+import time
+
+from configuration import (
+    FICHIER_UTILISATEURS,
+    FICHIER_PROPRIETES,
+    FICHIER_FILTRE_UTILISATEURS,
+    FICHIER_VILLES,
+    FICHIER_TYPES_PROPRIETE,
+    BUDGET_MEMOIRE_TRI,
+)
+from exportation import exporter_csv, ORDRES_EXPORT
+from filtre_bloom import decrire_filtre
+from gestionnaire_donnees import (
+    preparer_fichier_proprietes,
+    iterer_proprietes_triees,
+    sauvegarder_proprietes,
+    dedupliquer_proprietes,
+    compacter_proprietes,
+    charger_utilisateurs,
+    iterer_proprietes,
+)
+from gestionnaire_utilisateurs import creer_comptes, reconstruire_filtre_utilisateurs, nom_utilisateur_est_valide
+from utilitaires import afficher_tableau, garantir_existence_fichier, verrouiller_fichier
+from vocabulaire import charger_vocabulaire, rechercher_valeur
+
+# Colonnes obligatoires d'un fichier CSV de propriétés à importer (la colonne proprietaire est facultative).
+COLONNES_IMPORTEES = ["prix", "ville", "type", "chambres", "salles_de_bains"]
+
+
+def reconstruire_filtre(fichier=None):
+    """Recrée le filtre de Bloom des utilisateurs et affiche son rapport."""
+    with verrouiller_fichier(FICHIER_UTILISATEURS):
+        nombre = reconstruire_filtre_utilisateurs()
+    print(f"Filtre de Bloom recréé avec {nombre} utilisateur(s).")
+    rapport_filtre()
+
+
+def rapport_filtre(fichier=None):
+    """Affiche les paramètres du filtre de Bloom des utilisateurs et son taux de faux positifs estimé."""
+    description = decrire_filtre(FICHIER_FILTRE_UTILISATEURS)
+    if description is None:
+        return print("Aucun filtre de Bloom des utilisateurs; utilisez la commande reconstruire-filtre pour le créer.")
+    afficher_tableau(
+        [
+            ["Utilisateurs", description["valeurs"]],
+            ["Capacité prévue", description["capacite"]],
+            ["Bits (m)", description["bits"]],
+            ["Hachages (k)", description["hachages"]],
+            ["Taille du fichier", f"{description['taille_octets']} octets"],
+            ["Bits à 1", f"{description['remplissage']:.2%}"],
+            ["Faux positifs (théorique)", f"{description['taux_theorique']:.4%}"],
+            ["Faux positifs (mesuré)", f"{description['taux_mesure']:.4%}"],
+        ],
+        ["Filtre de Bloom des utilisateurs", "Valeur"],
+    )
+
+
+def importer(fichier):
+    """Importe les propriétés d'un fichier CSV, en ignorant les doublons.
+
+    Le fichier doit commencer par une ligne d'en-tête contenant les colonnes prix, ville, type, chambres et
+    salles_de_bains, et facultativement proprietaire. Il est lu en continu. Les lignes invalides (voir
+    `convertir_propriete_importee`) sont ignorées et affichées à la fin, avec leur numéro de ligne.
+
+    Args:
+        fichier (str): Le chemin du fichier CSV à importer.
+    """
+    if not fichier:
+        return print("Veuillez indiquer le fichier à importer.")
+
+    erreurs = []
+    with open(fichier, "r", newline="", encoding="utf-8") as source:
+        try:
+            proprietes = lire_proprietes_importees(source, erreurs)
+        except ValueError as e:
+            return print(e)
+        ajoutees, doublons = sauvegarder_proprietes(proprietes)
+
+    print(f"{ajoutees} propriété(s) importée(s), {doublons} doublon(s) ignoré(s).")
+    if erreurs:
+        print(f"{len(erreurs)} ligne(s) invalide(s) ignorée(s):")
+        afficher_tableau([list(erreur) for erreur in erreurs], ["Ligne", "Contenu", "Erreur"])
+
+
+def lire_proprietes_importees(source, erreurs):
+    """Lit et valide les propriétés d'un fichier CSV à importer, en ignorant les lignes invalides.
+
+    L'en-tête est vérifié immédiatement; les lignes sont ensuite lues en continu, à mesure que les propriétés
+    retournées sont parcourues.
+
+    Args:
+        source (file): Le fichier CSV ouvert en lecture, qui commence par une ligne d'en-tête.
+        erreurs (list): Liste à laquelle ajouter un triplet (numéro de ligne, ligne, message) pour chaque
+                        ligne invalide, comme les lignes mal formées rapportées par `analyser_lignes`.
+
+    Returns:
+        generator: Les propriétés valides, dans l'ordre du fichier.
+
+    Raises:
+        ValueError: Si une colonne obligatoire est absente de l'en-tête.
+    """
+    lecteur = csv.reader(source)
+    en_tetes = [en_tete.strip() for en_tete in next(lecteur, [])]
+    manquantes = [colonne for colonne in COLONNES_IMPORTEES if colonne not in en_tetes]
+    if manquantes:
+        raise ValueError(f"Colonne(s) absente(s) de l'en-tête du fichier: {', '.join(manquantes)}.")
+
+    def proprietes():
+        for champs in lecteur:
+            if not champs:
+                continue
+            try:
+                if len(champs) != len(en_tetes):
+                    raise ValueError(f"{len(champs)} champ(s) au lieu de {len(en_tetes)}")
+                yield convertir_propriete_importee(dict(zip(en_tetes, champs)))
+            except ValueError as e:
+                erreurs.append((lecteur.line_num, ",".join(champs), str(e)))
+
+    return proprietes()
+
+
+def convertir_propriete_importee(ligne):
+    """Convertit et valide une ligne d'un fichier CSV à importer.
+
+    Les nombres doivent être des entiers positifs, comme lors d'un ajout dans l'application. La ville et le type
+    doivent faire partie de leur vocabulaire; ils sont remplacés par leur forme officielle (« quebec » devient
+    « Québec »). Le propriétaire, facultatif, doit être un nom d'utilisateur valide (voir
+    `nom_utilisateur_est_valide`). Ainsi, aucune valeur ne peut contenir de virgule ni de saut de ligne, qui
+    corrompraient le fichier des propriétés.
+
+    Args:
+        ligne (dict): Les champs de la ligne, associés aux colonnes de l'en-tête.
+
+    Returns:
+        dict: La propriété correspondante.
+
+    Raises:
+        ValueError: Si un champ est invalide.
+    """
+    valeurs = {}
+    for colonne in ["prix", "chambres", "salles_de_bains"]:
+        try:
+            valeurs[colonne] = int(ligne[colonne])
+        except ValueError:
+            raise ValueError(f"{colonne} invalide: « {ligne[colonne]} » n'est pas un nombre entier") from None
+        if valeurs[colonne] <= 0:
+            raise ValueError(f"{colonne} invalide: {valeurs[colonne]} n'est pas un nombre positif")
+
+    for colonne, chemin_vocabulaire in [("ville", FICHIER_VILLES), ("type", FICHIER_TYPES_PROPRIETE)]:
+        valeurs[colonne] = rechercher_valeur(charger_vocabulaire(chemin_vocabulaire), ligne[colonne])
+        if valeurs[colonne] is None:
+            raise ValueError(f"{colonne} inconnu(e): « {ligne[colonne]} »")
+
+    proprietaire = ligne.get("proprietaire", "").strip()
+    if proprietaire and not nom_utilisateur_est_valide(proprietaire):
+        raise ValueError(f"proprietaire invalide: « {proprietaire} »")
+
+    return {
+        "prix": valeurs["prix"],
+        "ville": valeurs["ville"],
+        "type": valeurs["type"],
+        "chambres": valeurs["chambres"],
+        "salles_de_bains": valeurs["salles_de_bains"],
+        "proprietaire": proprietaire,
+    }
+
+
+def creer_comptes_en_lot(fichier, processus=None):
+    """Crée les comptes d'un fichier CSV, en hachant les mots de passe en parallèle.
+
+    Le fichier doit commencer par une ligne d'en-tête contenant les colonnes utilisateur et mot_de_passe.
+
+    Args:
+        fichier (str): Le chemin du fichier CSV des comptes à créer.
+        processus (int): Le nombre de processus de hachage (par défaut, le nombre de processeurs).
+    """
+    if not fichier:
+        return print("Veuillez indiquer le fichier des comptes à créer.")
+
+    with open(fichier, "r", newline="", encoding="utf-8") as source:
+        comptes = [(ligne["utilisateur"].strip(), ligne["mot_de_passe"]) for ligne in csv.DictReader(source)]
+
+    debut = time.perf_counter()
+    crees, ignores = creer_comptes(comptes, processus)
+    print(f"{crees} compte(s) créé(s), {ignores} ignoré(s), en {time.perf_counter() - debut:.1f} s.")
+
+
+def dedupliquer(fichier=None):
+    """Retire les doublons du fichier des propriétés et affiche le résultat, avec les lignes mal formées retirées."""
+    erreurs = []
+    conservees, doublons = dedupliquer_proprietes(erreurs)
+    print(f"{conservees} propriété(s) conservée(s), {doublons} doublon(s) retiré(s).")
+    if erreurs:
+        print(f"{len(erreurs)} ligne(s) mal formée(s) retirée(s):")
+        afficher_tableau([list(erreur) for erreur in erreurs], ["Position", "Ligne", "Erreur"])
+
+
+def compacter(fichier=None):
+    """Récupère l'espace inutilisé du fichier des propriétés en blocs et affiche le nombre d'octets récupérés."""
+    recuperes = compacter_proprietes()
+    if recuperes is None:
+        return print("Le stockage texte des propriétés n'a rien à compacter.")
+    print(f"{recuperes} octet(s) récupéré(s).")
+
+
+def trier(fichier, ordre="prix", budget_memoire=None):
+    """Exporte toutes les propriétés en CSV, par ordre de prix, avec un tri externe.
+
+    Args:
+        fichier (str): Le chemin du fichier CSV à créer.
+        ordre (str): "prix" (croissant) ou "prix-decroissant".
+        budget_memoire (int): La mémoire allouée au tri externe, en Mo (par défaut, `BUDGET_MEMOIRE_TRI`).
+    """
+    if not fichier:
+        return print("Veuillez indiquer le fichier à créer.")
+
+    budget_memoire = budget_memoire * 1024 * 1024 if budget_memoire else BUDGET_MEMOIRE_TRI
+    nombre = exporter_csv(iterer_proprietes_triees({}, ORDRES_EXPORT[ordre], budget_memoire), fichier)
+    print(f"{nombre} propriété(s) exportée(s) par ordre de prix vers {fichier}.")
+
+
+def verifier(fichier=None):
+    """Affiche les lignes mal formées des fichiers des utilisateurs et des propriétés.
+
+    La position d'une ligne est son décalage en octets dans le fichier (ou son numéro de ligne avec le
+    stockage des propriétés en blocs).
+    """
+    erreurs_utilisateurs = []
+    erreurs_proprietes = []
+    nombre_utilisateurs = len(charger_utilisateurs(erreurs_utilisateurs))
+    nombre_proprietes = sum(1 for _ in iterer_proprietes(erreurs=erreurs_proprietes))
+
+    print(f"{nombre_utilisateurs} utilisateur(s) et {nombre_proprietes} propriété(s) valides.")
+    lignes = [
+        [nom, position, ligne, message]
+        for nom, erreurs in [("Utilisateurs", erreurs_utilisateurs), ("Propriétés", erreurs_proprietes)]
+        for position, ligne, message in erreurs
+    ]
+    if not lignes:
+        return print("Aucune ligne mal formée.")
+    afficher_tableau(lignes, ["Fichier", "Position", "Ligne", "Erreur"])
+
+
+# Fonction exécutée pour chaque commande; chacune reçoit le fichier indiqué, s'il y a lieu.
+COMMANDES = {
+    "reconstruire-filtre": reconstruire_filtre,
+    "rapport-filtre": rapport_filtre,
+    "importer": importer,
+    "creer-comptes": creer_comptes_en_lot,
+    "compacter": compacter,
+    "dedupliquer": dedupliquer,
+    "trier": trier,
+    "verifier": verifier,
+}
+
+
+def main(arguments=None):
+    """Analyse les arguments de la ligne de commande et exécute la commande demandée.
+
+    Args:
+        arguments (list of str): Les arguments à analyser (par défaut, ceux de la ligne de commande).
+    """
+    analyseur = argparse.ArgumentParser(description="Maintenance des fichiers de données de Solo Immo.")
+    analyseur.add_argument("commande", choices=COMMANDES, help="La commande à exécuter.")
+    analyseur.add_argument("fichier", nargs="?", help="Le fichier à importer (importer, creer-comptes) ou à créer (trier).")
+    analyseur.add_argument("--ordre", choices=ORDRES_EXPORT, default="prix", help="L'ordre du tri (trier).")
+    analyseur.add_argument("--budget-memoire", type=int, help="La mémoire allouée au tri externe, en Mo (trier).")
+    analyseur.add_argument("--processus", type=int, help="Le nombre de processus de hachage (creer-comptes).")
+    options = analyseur.parse_args(arguments)
+
+    garantir_existence_fichier(FICHIER_UTILISATEURS)
+    garantir_existence_fichier(FICHIER_PROPRIETES)
+    preparer_fichier_proprietes()
+    if options.commande == "trier":
+        return trier(options.fichier, options.ordre, options.budget_memoire)
+    if options.commande == "creer-comptes":
+        return creer_comptes_en_lot(options.fichier, options.processus)
+    COMMANDES[options.commande](options.fichier)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Ce module maintient les statistiques des propriétés de l'application IFT-1004 Solo Immo, qui permettent
+d'estimer instantanément le nombre de propriétés correspondant à des critères de filtrage, sans lire le
+fichier des propriétés.
+
+Les statistiques sont des histogrammes : pour chaque colonne (ville, type, chambres, salles de bains), le
+nombre de propriétés ayant chaque valeur; pour le prix, le nombre de propriétés dans chaque tranche de prix.
+Les tranches sont logarithmiques (`TRANCHES_PAR_DECADE` tranches entre 1 et 10, entre 10 et 100, etc.), ce
+qui donne la même précision relative pour un condo à 200 000 $ que pour un immeuble à 20 000 000 $.
+
+L'estimation suppose que les colonnes sont indépendantes : la proportion de propriétés retenues est le
+produit des proportions retenues par chaque critère. Dans une tranche de prix partiellement couverte par
+la plage demandée, les prix sont supposés uniformément répartis.
+
+Les statistiques sont conservées dans un fichier JSON, mis à jour à chaque ajout de propriétés et recalculé
+lorsque les propriétés sont chargées et que leur nombre ne correspond plus.
+
+Fonctions:
+- `tranche_prix(prix)`: Retourne le numéro de la tranche de prix contenant un prix.
+- `bornes_tranche(tranche)`: Retourne les prix minimal et maximal d'une tranche de prix.
+- `calculer_statistiques(proprietes)`: Calcule les statistiques d'un ensemble de propriétés.
+- `ajouter_aux_statistiques(statistiques, propriete)`: Ajoute une propriété aux statistiques.
+- `charger_statistiques()`: Charge les statistiques enregistrées.
+- `ecrire_statistiques(statistiques)`: Enregistre les statistiques.
+- `estimer_nombre(statistiques, criteres)`: Estime le nombre de propriétés correspondant à des critères.
+
+Dépendances:
+- `bisect`: Pour trouver la tranche d'un prix.
+- `collections`: Pour compter les valeurs de chaque colonne (`Counter`).
+- `json`: Pour lire et écrire le fichier des statistiques.
+- `math`: Pour calculer les bornes des tranches de prix.
+- `os`: Pour remplacer atomiquement le fichier des statistiques.
+- `configuration`: Pour le chemin du fichier des statistiques.
+"""
+
+import bisect
+import json
+import math
+import os
+from collections import Counter
+
+from configuration import FICHIER_STATISTIQUES
+
+# Nombre de tranches de prix par facteur de 10.
+TRANCHES_PAR_DECADE = 10
+
+# Prix minimal de chaque tranche de prix, jusqu'à 10^15 $; la dernière tranche n'a pas de maximum.
+BORNES_TRANCHES = sorted({0, *(math.ceil(10 ** (i / TRANCHES_PAR_DECADE)) for i in range(15 * TRANCHES_PAR_DECADE + 1))})
+
+# Colonnes dont l'histogramme porte sur les valeurs elles-mêmes.
+COLONNES_STATISTIQUES = ["ville", "type", "chambres", "salles_de_bains"]
+
+
+def tranche_prix(prix):
+    """Retourne le numéro de la tranche de prix contenant un prix.
+
+    Args:
+        prix (int): Le prix.
+
+    Returns:
+        int: Le numéro de la tranche (les tranches sont numérotées en ordre croissant de prix).
+
+    Exemple:
+        >>> bornes_tranche(tranche_prix(250_000))
+        (199527, 251188)
+    """
+    return max(0, bisect.bisect_right(BORNES_TRANCHES, prix) - 1)
+
+
+def bornes_tranche(tranche):
+    """Retourne les prix minimal et maximal (inclus) d'une tranche de prix.
+
+    Args:
+        tranche (int): Le numéro de la tranche.
+
+    Returns:
+        tuple: (prix minimal, prix maximal); le prix maximal de la dernière tranche est `math.inf`.
+    """
+    if tranche + 1 < len(BORNES_TRANCHES):
+        return BORNES_TRANCHES[tranche], BORNES_TRANCHES[tranche + 1] - 1
+    return BORNES_TRANCHES[tranche], math.inf
+
+
+def calculer_statistiques(proprietes):
+    """Calcule les statistiques d'un ensemble de propriétés.
+
+    Args:
+        proprietes (iterable): Les propriétés, qui peuvent être lues en continu.
+
+    Returns:
+        dict: Les statistiques : "nombre" (le nombre de propriétés), un `Counter` des valeurs de chaque
+              colonne de `COLONNES_STATISTIQUES` et un `Counter` des tranches de prix ("tranches_prix").
+    """
+    statistiques = {"nombre": 0, "tranches_prix": Counter(), **{colonne: Counter() for colonne in COLONNES_STATISTIQUES}}
+    for propriete in proprietes:
+        ajouter_aux_statistiques(statistiques, propriete)
+    return statistiques
+
+
+def ajouter_aux_statistiques(statistiques, propriete):
+    """Ajoute une propriété aux statistiques.
+
+    Args:
+        statistiques (dict): Les statistiques à mettre à jour (voir `calculer_statistiques`).
+        propriete (dict): La propriété ajoutée.
+    """
+    statistiques["nombre"] += 1
+    statistiques["tranches_prix"][tranche_prix(propriete["prix"])] += 1
+    for colonne in COLONNES_STATISTIQUES:
+        statistiques[colonne][propriete[colonne]] += 1
+
+
+def charger_statistiques():
+    """Charge les statistiques enregistrées.
+
+    Returns:
+        dict or None: Les statistiques (voir `calculer_statistiques`), ou `None` si le fichier des
+                      statistiques est absent ou illisible.
+    """
+    try:
+        with open(FICHIER_STATISTIQUES, "r", encoding="utf-8") as fichier:
+            contenu = json.load(fichier)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    # Les histogrammes sont enregistrés en paires (valeur, nombre), pour conserver les valeurs numériques.
+    statistiques = {"nombre": contenu["nombre"]}
+    for colonne, paires in contenu["histogrammes"].items():
+        statistiques[colonne] = Counter(dict(paires))
+    return statistiques
+
+
+def ecrire_statistiques(statistiques):
+    """Remplace atomiquement le fichier des statistiques.
+
+    Args:
+        statistiques (dict): Les statistiques à enregistrer.
+    """
+    contenu = {
+        "nombre": statistiques["nombre"],
+        "histogrammes": {
+            colonne: sorted(statistiques[colonne].items())
+            for colonne in ["tranches_prix", *COLONNES_STATISTIQUES]
+        },
+    }
+    fichier_temporaire = f"{FICHIER_STATISTIQUES}.tmp"
+    with open(fichier_temporaire, "w", encoding="utf-8") as fichier:
+        json.dump(contenu, fichier, ensure_ascii=False)
+    os.replace(fichier_temporaire, FICHIER_STATISTIQUES)
+
+
+def estimer_nombre(statistiques, criteres):
+    """Estime le nombre de propriétés correspondant à des critères, à partir des statistiques seulement.
+
+    Args:
+        statistiques (dict): Les statistiques des propriétés (voir `calculer_statistiques`).
+        criteres (dict): Les critères de filtrage (voir `correspond_aux_criteres`).
+
+    Returns:
+        float: Le nombre estimé de propriétés correspondant aux critères.
+    """
+    nombre = statistiques["nombre"]
+    if not nombre:
+        return 0.0
+
+    proportion = 1.0
+    for colonne in ["ville", "type"]:
+        if criteres.get(colonne):
+            proportion *= statistiques[colonne][criteres[colonne]] / nombre
+
+    for colonne in ["chambres", "salles_de_bains"]:
+        minimum = criteres.get(f"{colonne}_minimum")
+        maximum = criteres.get(f"{colonne}_maximum")
+        if minimum is not None or maximum is not None:
+            retenues = sum(
+                compte
+                for valeur, compte in statistiques[colonne].items()
+                if (minimum is None or valeur >= minimum) and (maximum is None or valeur <= maximum)
+            )
+            proportion *= retenues / nombre
+
+    prix_minimum = criteres.get("prix_minimum")
+    prix_maximum = criteres.get("prix_maximum")
+    if prix_minimum is not None or prix_maximum is not None:
+        bas = -math.inf if prix_minimum is None else prix_minimum
+        haut = math.inf if prix_maximum is None else prix_maximum
+        retenues = 0.0
+        for tranche, compte in statistiques["tranches_prix"].items():
+            debut, fin = bornes_tranche(tranche)
+            couvert_debut, couvert_fin = max(debut, bas), min(fin, haut)
+            if couvert_debut > couvert_fin:
+                continue
+            if fin == math.inf:
+                retenues += compte  # Tranche ouverte (prix de plus de 10^15 $): aucune interpolation possible
+            else:
+                retenues += compte * (couvert_fin - couvert_debut + 1) / (fin - debut + 1)
+        proportion *= retenues / nombre
+
+    return nombre * proportion
+
+
+def tests_statistiques():
+    # Teste les tranches de prix: chaque prix est dans les bornes de sa tranche, et les tranches sont contiguës.
+    for prix in [0, 1, 2, 9, 10, 99_999, 100_000, 250_000, 999_333_999_333]:
+        debut, fin = bornes_tranche(tranche_prix(prix))
+        assert debut <= prix <= fin, (prix, debut, fin)
+    assert all(bornes_tranche(t)[1] + 1 == bornes_tranche(t + 1)[0] for t in range(len(BORNES_TRANCHES) - 2))
+
+    proprietes = [
+        {"prix": 100_000 * (i + 1), "ville": "Québec" if i % 4 else "Laval", "type": "Condo" if i % 2 else "Maison",
+         "chambres": i % 5, "salles_de_bains": 1 + i % 2}
+        for i in range(1000)
+    ]
+    statistiques = calculer_statistiques(proprietes)
+
+    # Teste les estimations exactes pour un critère sur une seule colonne.
+    assert estimer_nombre(statistiques, {}) == 1000
+    assert estimer_nombre(statistiques, {"ville": "Laval"}) == 250
+    assert estimer_nombre(statistiques, {"chambres_minimum": 3}) == 400
+    assert estimer_nombre(statistiques, {"ville": "Montréal"}) == 0
+
+    # Teste l'hypothèse d'indépendance et l'estimation d'une plage de prix (valeur exacte: 300).
+    assert estimer_nombre(statistiques, {"type": "Condo", "salles_de_bains_maximum": 1}) == 250
+    assert 270 <= estimer_nombre(statistiques, {"prix_minimum": 200_000, "prix_maximum": 30_100_000}) <= 330
+
+    # Teste l'ajout d'une propriété.
+    ajouter_aux_statistiques(statistiques, {**proprietes[0], "ville": "Montréal"})
+    assert estimer_nombre(statistiques, {"ville": "Montréal"}) == 1
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'statistiques'...")
+    tests_statistiques()
+    print("Tests réussis!")
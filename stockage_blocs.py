@@ -0,0 +1,544 @@
+"""
+Ce module implémente le format de stockage en blocs compressés des propriétés de l'application
+IFT-1004 Solo Immo, offert en option au format texte (voir `FORMAT_STOCKAGE_PROPRIETES`).
+
+Le fichier de données est une suite de blocs compressés avec `zlib`, contenant chacun au plus
+`taille_bloc` lignes de propriétés (dans le même format CSV que le fichier texte). Un index des blocs,
+conservé dans un fichier compagnon (suffixe `.idx`, en JSON), décrit chaque bloc :
+    - "decalage" et "longueur" : la position et la taille du bloc compressé dans le fichier de données.
+    - "suite" (facultatif) : les positions et tailles des segments compressés ajoutés au bloc depuis son
+      écriture, une ligne par segment (voir `ajouter_ligne_bloc`).
+    - "nombre" : le nombre de lignes du bloc.
+    - "prix_minimum" et "prix_maximum" : les bornes des prix du bloc.
+    - "villes" : l'ensemble des villes présentes dans le bloc.
+
+Ces bornes et ensembles (« zone map ») permettent de sauter, sans les lire ni les décompresser, les blocs
+qui ne peuvent contenir aucune propriété correspondant à des critères de prix ou de ville. Comme tous les
+blocs sauf le dernier sont pleins, la ligne numéro `n` se trouve dans le bloc `n // taille_bloc`.
+
+Le fichier de données n'est jamais modifié en place : un ajout écrit à la fin du fichier, puis remplace
+atomiquement l'index; une réécriture complète (conversion, déduplication, compactage) produit un nouveau
+fichier et son index, qui remplacent les anciens, le fichier de données en premier. Un lecteur charge l'index
+et ouvre le fichier de données sous un verrou partagé : il lit ensuite un état cohérent, même si le fichier
+est remplacé pendant sa lecture. Les octets devenus inutiles (anciens segments d'un bloc regroupé, blocs
+d'une écriture interrompue) sont récupérés par `compacter_blocs`, appelé automatiquement par un ajout
+lorsqu'ils dépassent `PROPORTION_INUTILE_COMPACTAGE` du fichier : le coût de la recopie est ainsi réparti
+sur les ajouts qui ont produit ces octets.
+
+Ce module manipule des lignes de texte; leur conversion en propriétés est faite par `gestionnaire_donnees`.
+
+Fonctions:
+- `ecrire_blocs(chemin_fichier, lignes, taille_bloc)`: Écrit un fichier de blocs à partir de lignes.
+- `ajouter_ligne_bloc(chemin_fichier, ligne, prix, ville, taille_bloc)`: Ajoute une ligne à la fin du fichier.
+- `iterer_lignes_blocs(chemin_fichier, prix_minimum, prix_maximum, ville, debut)`: Parcourt les lignes des blocs
+  candidats, avec leur numéro.
+- `lire_lignes_blocs(chemin_fichier, numeros)`: Lit des lignes à partir de leurs numéros.
+- `charger_index_blocs(chemin_fichier)`: Charge l'index des blocs.
+- `compacter_blocs(chemin_fichier, proportion_minimale)`: Réécrit le fichier de blocs sans ses octets inutiles.
+- `terminer_remplacement_blocs(chemin_fichier)`: Termine ou annule un remplacement interrompu du fichier de blocs.
+
+Dépendances:
+- `itertools`: Pour sauter les lignes d'un bloc qui précèdent la première ligne demandée.
+- `json`: Pour lire et écrire l'index des blocs.
+- `os`: Pour remplacer atomiquement le fichier de blocs et son index.
+- `zlib`: Pour compresser et décompresser les blocs.
+- `utilitaires`: Pour verrouiller le fichier de blocs entre processus.
+"""
+
+import itertools
+import json
+import os
+import zlib
+
+from utilitaires import verrouiller_fichier
+
+# Proportion des octets du fichier de données devenus inutiles au-delà de laquelle un ajout compacte le fichier.
+PROPORTION_INUTILE_COMPACTAGE = 0.5
+
+
+def ecrire_blocs(chemin_fichier, lignes, taille_bloc):
+    """Écrit un fichier de blocs compressés et son index à partir de lignes.
+
+    Les lignes sont lues en continu : seul le bloc en cours est conservé en mémoire. Elles sont écrites
+    dans un fichier temporaire, qui remplace ensuite le fichier existant (voir `remplacer_blocs`); les lignes
+    peuvent donc provenir du fichier remplacé lui-même.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs à créer.
+        lignes (iterable): Des triplets (ligne, prix, ville), où `ligne` est la ligne CSV d'une propriété
+                           (terminée par un saut de ligne).
+        taille_bloc (int): Le nombre de lignes par bloc.
+
+    Returns:
+        int: Le nombre de lignes écrites.
+    """
+    fichier_temporaire = f"{chemin_fichier}.tmp"
+    blocs = []
+    nombre = 0
+
+    with verrouiller_fichier(fichier_temporaire):
+        achever_remplacement_blocs(chemin_fichier)
+        with open(fichier_temporaire, "wb") as fichier:
+            bloc = []
+            for ligne, prix, ville in lignes:
+                bloc.append((ligne, prix, ville))
+                nombre += 1
+                if len(bloc) == taille_bloc:
+                    blocs.append(ecrire_bloc(fichier, bloc))
+                    bloc = []
+            if bloc:
+                blocs.append(ecrire_bloc(fichier, bloc))
+        ecrire_index_blocs(fichier_temporaire, {"taille_bloc": taille_bloc, "blocs": blocs})
+
+        with verrouiller_fichier(chemin_fichier):
+            remplacer_blocs(chemin_fichier)
+
+    return nombre
+
+
+def ajouter_ligne_bloc(chemin_fichier, ligne, prix, ville, taille_bloc):
+    """Ajoute une ligne à la fin d'un fichier de blocs.
+
+    La ligne est compressée seule et écrite à la fin du fichier, comme segment du dernier bloc s'il n'est
+    pas plein, ou comme nouveau bloc sinon; l'index est ensuite remplacé atomiquement. Lorsque le dernier
+    bloc devient plein, ses segments sont regroupés en un seul bloc compressé, écrit lui aussi à la fin du
+    fichier. Les octets déjà écrits ne sont jamais modifiés : une interruption laisse au plus des octets
+    inutiles à la fin du fichier, que l'index ignore. Le fichier et son index sont créés au besoin.
+
+    Si les octets inutiles dépassent ensuite `PROPORTION_INUTILE_COMPACTAGE` du fichier, celui-ci est
+    compacté (voir `compacter_blocs`), après que le verrou de l'ajout a été relâché.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+        ligne (str): La ligne CSV de la propriété, terminée par un saut de ligne.
+        prix (int): Le prix de la propriété.
+        ville (str): La ville de la propriété.
+        taille_bloc (int): Le nombre de lignes par bloc, pour un fichier qui n'existe pas encore.
+
+    Returns:
+        int: Le numéro de la ligne ajoutée (à partir de 0).
+    """
+    with verrouiller_fichier(chemin_fichier):
+        index = charger_index_blocs(chemin_fichier, taille_bloc)
+        blocs = index["blocs"]
+        dernier = blocs[-1] if blocs and blocs[-1]["nombre"] < index["taille_bloc"] else None
+        numero = (len(blocs) - 1) * index["taille_bloc"] + dernier["nombre"] if dernier else len(blocs) * index["taille_bloc"]
+
+        with open(chemin_fichier, "ab+") as fichier:
+            if dernier is None:
+                fichier.seek(0, os.SEEK_END)
+                blocs.append(ecrire_bloc(fichier, [(ligne, prix, ville)]))
+            elif dernier["nombre"] + 1 == index["taille_bloc"]:
+                bloc = [*lire_bloc(fichier, dernier, avec_zone=True), (ligne, prix, ville)]
+                fichier.seek(0, os.SEEK_END)
+                blocs[-1] = ecrire_bloc(fichier, bloc)
+            else:
+                fichier.seek(0, os.SEEK_END)
+                dernier.setdefault("suite", []).append(ecrire_segment(fichier, [ligne]))
+                dernier["nombre"] += 1
+                dernier["prix_minimum"] = min(dernier["prix_minimum"], prix)
+                dernier["prix_maximum"] = max(dernier["prix_maximum"], prix)
+                dernier["villes"].add(ville)
+            taille_fichier = fichier.tell()
+
+        ecrire_index_blocs(chemin_fichier, index)
+
+    if taille_fichier - octets_utiles(index) > PROPORTION_INUTILE_COMPACTAGE * taille_fichier:
+        compacter_blocs(chemin_fichier, PROPORTION_INUTILE_COMPACTAGE)
+
+    return numero
+
+
+def iterer_lignes_blocs(chemin_fichier, prix_minimum=None, prix_maximum=None, ville=None, debut=0):
+    """Parcourt les lignes des blocs pouvant contenir des propriétés correspondant aux critères.
+
+    Les blocs dont la plage de prix ne recoupe pas la plage demandée, qui ne contiennent pas la ville
+    demandée, ou dont toutes les lignes précèdent `debut`, sont sautés sans être lus. Les lignes produites
+    doivent encore être filtrées individuellement.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+        prix_minimum (int): Le prix minimal recherché, ou `None`.
+        prix_maximum (int): Le prix maximal recherché, ou `None`.
+        ville (str): La ville recherchée, ou `None`.
+        debut (int): Le numéro de la première ligne à produire.
+
+    Yields:
+        tuple: (numéro de la ligne, ligne sans saut de ligne), pour les lignes des blocs candidats.
+    """
+    index, fichier = ouvrir_blocs(chemin_fichier)
+    if fichier is None:
+        return
+
+    with fichier:
+        for position_bloc, bloc in enumerate(index["blocs"]):
+            if prix_minimum is not None and bloc["prix_maximum"] < prix_minimum:
+                continue
+            if prix_maximum is not None and bloc["prix_minimum"] > prix_maximum:
+                continue
+            if ville and ville not in bloc["villes"]:
+                continue
+            premier = position_bloc * index["taille_bloc"]
+            if premier + bloc["nombre"] <= debut:
+                continue
+            lignes = enumerate(lire_bloc(fichier, bloc), premier)
+            yield from (lignes if premier >= debut else itertools.islice(lignes, debut - premier, None))
+
+
+def lire_lignes_blocs(chemin_fichier, numeros):
+    """Lit des lignes à partir de leurs numéros, en ne décompressant que les blocs qui les contiennent.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+        numeros (iterable of int): Les numéros des lignes à lire.
+
+    Returns:
+        list of str: Les lignes demandées, dans l'ordre des numéros, sans saut de ligne.
+
+    Raises:
+        ValueError: Si un numéro ne désigne aucune ligne du fichier.
+    """
+    index, fichier = ouvrir_blocs(chemin_fichier)
+    taille_bloc = index["taille_bloc"]
+    nombre_lignes = sum(bloc["nombre"] for bloc in index["blocs"])
+    blocs_lus = {}
+    lignes = []
+
+    try:
+        for numero in numeros:
+            if not 0 <= numero < nombre_lignes:
+                raise ValueError(f"Numéro de ligne invalide: {numero} ({nombre_lignes} ligne(s) dans {chemin_fichier})")
+            position_bloc = numero // taille_bloc
+            if position_bloc not in blocs_lus:
+                blocs_lus[position_bloc] = list(lire_bloc(fichier, index["blocs"][position_bloc]))
+            lignes.append(blocs_lus[position_bloc][numero % taille_bloc])
+    finally:
+        if fichier is not None:
+            fichier.close()
+
+    return lignes
+
+
+def ouvrir_blocs(chemin_fichier):
+    """Charge l'index d'un fichier de blocs et ouvre le fichier de données, sous un verrou partagé.
+
+    Le verrou empêche que le fichier de données soit remplacé entre le chargement de l'index et son
+    ouverture. Une fois ouvert, le fichier reste lisible même s'il est remplacé ensuite, et les blocs décrits
+    par l'index ne sont jamais modifiés : le verrou peut être relâché avant la lecture des blocs.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+
+    Returns:
+        tuple: (index, fichier ouvert en lecture binaire), ou (index, None) si l'index ne décrit aucun bloc.
+    """
+    with verrouiller_fichier(chemin_fichier, partage=True):
+        index = charger_index_blocs(chemin_fichier)
+        fichier = open(chemin_fichier, "rb") if index["blocs"] else None
+    return index, fichier
+
+
+def charger_index_blocs(chemin_fichier, taille_bloc=None):
+    """Charge l'index des blocs d'un fichier de blocs.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+        taille_bloc (int): La taille de bloc d'un index vide, si le fichier n'existe pas encore.
+
+    Returns:
+        dict: L'index, avec les clés "taille_bloc" et "blocs" (liste des descriptions de blocs).
+    """
+    try:
+        with open(f"{chemin_fichier}.idx", "r", encoding="utf-8") as fichier:
+            index = json.load(fichier)
+    except FileNotFoundError:
+        return {"taille_bloc": taille_bloc, "blocs": []}
+
+    for bloc in index["blocs"]:
+        bloc["villes"] = set(bloc["villes"])
+    return index
+
+
+def ecrire_index_blocs(chemin_fichier, index):
+    """Remplace atomiquement l'index des blocs d'un fichier de blocs.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+        index (dict): L'index à écrire.
+    """
+    contenu = {
+        "taille_bloc": index["taille_bloc"],
+        "blocs": [dict(bloc, villes=sorted(bloc["villes"])) for bloc in index["blocs"]],
+    }
+    fichier_temporaire = f"{chemin_fichier}.idx.tmp"
+    with open(fichier_temporaire, "w", encoding="utf-8") as fichier:
+        json.dump(contenu, fichier, ensure_ascii=False)
+    os.replace(fichier_temporaire, f"{chemin_fichier}.idx")
+
+
+def remplacer_blocs(chemin_fichier):
+    """Remplace un fichier de blocs et son index par le fichier temporaire (suffixe `.tmp`) et son index.
+
+    Le fichier de données est remplacé en premier : si le remplacement est interrompu entre les deux, l'index
+    temporaire subsiste et `terminer_remplacement_blocs` achève le remplacement. L'appelant doit tenir le
+    verrou exclusif du fichier de blocs.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+    """
+    fichier_temporaire = f"{chemin_fichier}.tmp"
+    os.replace(fichier_temporaire, chemin_fichier)
+    os.replace(f"{fichier_temporaire}.idx", f"{chemin_fichier}.idx")
+
+
+def terminer_remplacement_blocs(chemin_fichier):
+    """Termine ou annule un remplacement du fichier de blocs interrompu (par exemple, par un arrêt brutal).
+
+    Un index temporaire complet signifie que le fichier temporaire a été entièrement écrit : le remplacement
+    est achevé. Un fichier temporaire sans index est une écriture inachevée : il est supprimé, et le fichier
+    de blocs reste intact.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+
+    Returns:
+        bool: True si un remplacement a été achevé; les données dérivées du fichier de blocs (index des
+              propriétaires, empreintes, statistiques) doivent alors être reconstruites.
+    """
+    with verrouiller_fichier(f"{chemin_fichier}.tmp"):
+        return achever_remplacement_blocs(chemin_fichier)
+
+
+def achever_remplacement_blocs(chemin_fichier):
+    """Termine ou annule un remplacement interrompu (voir `terminer_remplacement_blocs`), sous le verrou du
+    fichier temporaire, que l'appelant doit tenir.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+
+    Returns:
+        bool: True si un remplacement a été achevé.
+    """
+    fichier_temporaire = f"{chemin_fichier}.tmp"
+    if os.path.isfile(f"{fichier_temporaire}.idx"):
+        with verrouiller_fichier(chemin_fichier):
+            if os.path.isfile(fichier_temporaire):
+                os.replace(fichier_temporaire, chemin_fichier)
+            os.replace(f"{fichier_temporaire}.idx", f"{chemin_fichier}.idx")
+        return True
+    if os.path.isfile(fichier_temporaire):
+        os.remove(fichier_temporaire)
+    return False
+
+
+def compacter_blocs(chemin_fichier, proportion_minimale=None):
+    """Réécrit un fichier de blocs sans ses octets inutiles.
+
+    Les blocs sont recopiés dans l'ordre, sans être décompressés, sauf ceux qui ont des segments ajoutés :
+    ils sont regroupés en un seul bloc compressé. Les numéros des lignes ne changent pas. Le verrou exclusif
+    est tenu pendant toute la réécriture : les ajouts et les lectures attendent la fin du compactage.
+
+    Args:
+        chemin_fichier (str): Le chemin du fichier de blocs.
+        proportion_minimale (float): La proportion d'octets inutiles en deçà de laquelle le fichier n'est pas
+                                     réécrit (par exemple, s'il vient d'être compacté par un autre processus),
+                                     ou `None` pour le réécrire dans tous les cas.
+
+    Returns:
+        int: Le nombre d'octets récupérés.
+    """
+    fichier_temporaire = f"{chemin_fichier}.tmp"
+
+    with verrouiller_fichier(fichier_temporaire):
+        achever_remplacement_blocs(chemin_fichier)
+        with verrouiller_fichier(chemin_fichier):
+            index = charger_index_blocs(chemin_fichier)
+            if not os.path.isfile(chemin_fichier):
+                return 0
+            taille_avant = os.path.getsize(chemin_fichier)
+            inutiles = taille_avant - octets_utiles(index)
+            if proportion_minimale is not None and inutiles <= proportion_minimale * taille_avant:
+                return 0
+
+            blocs = []
+            with open(chemin_fichier, "rb") as source, open(fichier_temporaire, "wb") as fichier:
+                for bloc in index["blocs"]:
+                    if bloc.get("suite"):
+                        blocs.append(ecrire_bloc(fichier, list(lire_bloc(source, bloc, avec_zone=True))))
+                    else:
+                        source.seek(bloc["decalage"])
+                        blocs.append(dict(bloc, decalage=fichier.tell()))
+                        fichier.write(source.read(bloc["longueur"]))
+                taille_apres = fichier.tell()
+            ecrire_index_blocs(fichier_temporaire, {"taille_bloc": index["taille_bloc"], "blocs": blocs})
+            remplacer_blocs(chemin_fichier)
+
+    return taille_avant - taille_apres
+
+
+def octets_utiles(index):
+    """Retourne le nombre d'octets du fichier de données décrits par un index (blocs et segments ajoutés).
+
+    Args:
+        index (dict): L'index des blocs.
+
+    Returns:
+        int: Le nombre d'octets utiles; le reste du fichier peut être récupéré par `compacter_blocs`.
+    """
+    return sum(bloc["longueur"] + sum(longueur for _, longueur in bloc.get("suite", [])) for bloc in index["blocs"])
+
+
+def ecrire_bloc(fichier, bloc):
+    """Compresse un bloc de lignes et l'écrit à la position courante du fichier.
+
+    Args:
+        fichier (file): Le fichier de blocs, ouvert en écriture binaire.
+        bloc (list): Les triplets (ligne, prix, ville) du bloc.
+
+    Returns:
+        dict: La description du bloc écrit, pour l'index des blocs.
+    """
+    decalage, longueur = ecrire_segment(fichier, [ligne for ligne, _, _ in bloc])
+    return {
+        "decalage": decalage,
+        "longueur": longueur,
+        "nombre": len(bloc),
+        "prix_minimum": min(prix for _, prix, _ in bloc),
+        "prix_maximum": max(prix for _, prix, _ in bloc),
+        "villes": {ville for _, _, ville in bloc},
+    }
+
+
+def ecrire_segment(fichier, lignes):
+    """Compresse des lignes et les écrit à la position courante du fichier.
+
+    Args:
+        fichier (file): Le fichier de blocs, ouvert en écriture binaire.
+        lignes (list of str): Les lignes, terminées par un saut de ligne.
+
+    Returns:
+        list: [décalage, longueur] du segment compressé dans le fichier.
+    """
+    donnees = zlib.compress("".join(lignes).encode("utf-8"))
+    decalage = fichier.tell()
+    fichier.write(donnees)
+    return [decalage, len(donnees)]
+
+
+def lire_bloc(fichier, bloc, avec_zone=False):
+    """Lit et décompresse un bloc, avec ses segments ajoutés.
+
+    Args:
+        fichier (file): Le fichier de blocs, ouvert en lecture binaire.
+        bloc (dict): La description du bloc dans l'index.
+        avec_zone (bool): Produit des triplets (ligne, prix, ville) plutôt que des lignes seules,
+                          pour réécrire le bloc.
+
+    Returns:
+        iterator: Les lignes du bloc, sans saut de ligne (ou les triplets, si `avec_zone` est vrai).
+    """
+    lignes = []
+    for decalage, longueur in [(bloc["decalage"], bloc["longueur"]), *bloc.get("suite", [])]:
+        fichier.seek(decalage)
+        lignes.extend(zlib.decompress(fichier.read(longueur)).decode("utf-8").splitlines())
+    if not avec_zone:
+        return iter(lignes)
+    return ((f"{ligne}\n", int(ligne.split(",", 1)[0]), ligne.split(",", 2)[1]) for ligne in lignes)
+
+
+def tests_stockage_blocs():
+    import tempfile
+
+    def triplet(prix, ville):
+        return f"{prix},{ville},Condo,2,1,\n", prix, ville
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "test.blocs")
+        lignes = [triplet(100 + numero, "Québec") for numero in range(4)] + [triplet(500, "Lévis"), triplet(600, "Lévis")]
+        assert ecrire_blocs(chemin, lignes, 4) == 6
+        assert not os.path.exists(f"{chemin}.tmp") and not os.path.exists(f"{chemin}.tmp.idx")
+        index = charger_index_blocs(chemin)
+        assert [bloc["nombre"] for bloc in index["blocs"]] == [4, 2]
+        assert index["blocs"][1]["villes"] == {"Lévis"}
+
+        # Teste des ajouts qui remplissent le dernier bloc puis en créent un nouveau.
+        taille_avant = os.path.getsize(chemin)
+        assert ajouter_ligne_bloc(chemin, *triplet(700, "Laval"), 4) == 6
+        assert os.path.getsize(chemin) > taille_avant
+        assert len(charger_index_blocs(chemin)["blocs"][1]["suite"]) == 1
+        assert ajouter_ligne_bloc(chemin, *triplet(50, "Laval"), 4) == 7
+        assert ajouter_ligne_bloc(chemin, *triplet(800, "Gatineau"), 4) == 8
+        index = charger_index_blocs(chemin)
+        assert [bloc["nombre"] for bloc in index["blocs"]] == [4, 4, 1]
+        assert "suite" not in index["blocs"][1]
+        assert (index["blocs"][1]["prix_minimum"], index["blocs"][1]["prix_maximum"]) == (50, 700)
+        assert index["blocs"][1]["villes"] == {"Lévis", "Laval"}
+
+        # Teste la lecture de lignes par numéro, de part et d'autre des frontières de blocs.
+        assert lire_lignes_blocs(chemin, [8, 0, 7, 3, 4]) == [
+            "800,Gatineau,Condo,2,1,", "100,Québec,Condo,2,1,", "50,Laval,Condo,2,1,",
+            "103,Québec,Condo,2,1,", "500,Lévis,Condo,2,1,",
+        ]
+        assert [numero for numero, _ in iterer_lignes_blocs(chemin)] == list(range(9))
+
+        for numero in [-1, 9]:
+            try:
+                lire_lignes_blocs(chemin, [numero])
+                assert False, "Un numéro hors du fichier doit être refusé."
+            except ValueError:
+                pass
+
+        # Teste que les blocs exclus par la zone map ne sont pas lus.
+        assert [numero for numero, _ in iterer_lignes_blocs(chemin, prix_minimum=750)] == [8]
+        assert [numero for numero, _ in iterer_lignes_blocs(chemin, prix_maximum=60)] == [4, 5, 6, 7]
+        assert [numero for numero, _ in iterer_lignes_blocs(chemin, ville="Québec")] == [0, 1, 2, 3]
+        assert list(iterer_lignes_blocs(chemin, ville="Montréal")) == []
+        assert [numero for numero, _ in iterer_lignes_blocs(chemin, debut=6)] == [6, 7, 8]
+        assert [numero for numero, _ in iterer_lignes_blocs(chemin, prix_maximum=60, debut=3)] == [4, 5, 6, 7]
+
+        # Teste qu'une lecture commencée conserve un état cohérent pendant le remplacement du fichier.
+        lecture = iterer_lignes_blocs(chemin)
+        assert next(lecture) == (0, "100,Québec,Condo,2,1,")
+        ecrire_blocs(chemin, [triplet(1, "Laval")], 4)
+        assert [numero for numero, _ in lecture] == list(range(1, 9))
+        assert lire_lignes_blocs(chemin, [0]) == ["1,Laval,Condo,2,1,"]
+
+        # Teste que les ajouts compactent le fichier dès que ses octets inutiles en dépassent la proportion prévue.
+        for prix in range(2, 11):
+            ajouter_ligne_bloc(chemin, *triplet(prix, "Laval"), 4)
+            taille = os.path.getsize(chemin)
+            assert taille - octets_utiles(charger_index_blocs(chemin)) <= PROPORTION_INUTILE_COMPACTAGE * taille
+        assert compacter_blocs(chemin, PROPORTION_INUTILE_COMPACTAGE) == 0
+
+        # Teste que le compactage regroupe les segments ajoutés, sans changer les lignes ni leurs numéros.
+        contenu = list(iterer_lignes_blocs(chemin))
+        taille_avant = os.path.getsize(chemin)
+        recuperes = compacter_blocs(chemin)
+        assert recuperes > 0 and os.path.getsize(chemin) == taille_avant - recuperes
+        assert list(iterer_lignes_blocs(chemin)) == contenu
+        assert not any(bloc.get("suite") for bloc in charger_index_blocs(chemin)["blocs"])
+        assert compacter_blocs(chemin) == 0
+
+        # Teste la reprise d'un remplacement interrompu après le remplacement du fichier de données.
+        ecrire_blocs(f"{chemin}.tmp", [triplet(42, "Laval")], 4)
+        os.replace(f"{chemin}.tmp", chemin)
+        assert terminer_remplacement_blocs(chemin)
+        assert list(iterer_lignes_blocs(chemin)) == [(0, "42,Laval,Condo,2,1,")]
+
+        # Teste qu'une écriture inachevée (sans index) est abandonnée.
+        with open(f"{chemin}.tmp", "wb") as fichier:
+            fichier.write(b"incomplet")
+        assert not terminer_remplacement_blocs(chemin)
+        assert not os.path.exists(f"{chemin}.tmp")
+        assert lire_lignes_blocs(chemin, [0]) == ["42,Laval,Condo,2,1,"]
+
+        # Teste un fichier qui n'existe pas encore.
+        nouveau = os.path.join(dossier, "nouveau.blocs")
+        assert list(iterer_lignes_blocs(nouveau)) == []
+        assert ajouter_ligne_bloc(nouveau, *triplet(1, "Laval"), 4) == 0
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'stockage_blocs'...")
+    tests_stockage_blocs()
+    print("Tests réussis!")
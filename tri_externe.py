@@ -0,0 +1,147 @@
+"""
+Ce module implémente un tri externe (tri-fusion sur disque) pour l'application IFT-1004 Solo Immo, qui
+permet de trier des fichiers de propriétés plus grands que la mémoire disponible.
+
+Les lignes à trier sont lues en continu et accumulées jusqu'à ce que leur taille estimée atteigne le budget
+de mémoire. Le lot est alors trié en mémoire et écrit dans un fichier temporaire (une « séquence triée »).
+Les séquences sont ensuite fusionnées par `heapq.merge`, qui ne garde en mémoire qu'une ligne par séquence :
+les lignes triées sont produites une à une, au fur et à mesure de la fusion. Si toutes les lignes tiennent
+dans le budget, aucun fichier temporaire n'est créé.
+
+Lorsqu'il y a plus de `NOMBRE_MAXIMAL_SEQUENCES` séquences, elles sont d'abord fusionnées par groupes
+de séquences consécutives en séquences plus longues, pour limiter le nombre de fichiers ouverts simultanément.
+
+Fonctions:
+- `trier_externe(lignes, cle, budget_memoire, decroissant)`: Trie des lignes de texte avec un budget de mémoire borné.
+
+Dépendances:
+- `heapq`: Pour fusionner les séquences triées.
+- `sys`: Pour estimer la mémoire occupée par les lignes.
+- `tempfile`: Pour créer les fichiers temporaires des séquences triées (supprimés automatiquement).
+- `configuration`: Pour le budget de mémoire par défaut.
+"""
+
+import heapq
+import sys
+import tempfile
+
+from configuration import BUDGET_MEMOIRE_TRI
+
+# Nombre maximal de séquences triées fusionnées en une seule passe (fichiers ouverts simultanément).
+NOMBRE_MAXIMAL_SEQUENCES = 64
+
+# Surcoût estimé, en octets, de chaque ligne conservée dans un lot (pointeur dans la liste et clé de tri).
+SURCOUT_LIGNE = 80
+
+
+def trier_externe(lignes, cle, budget_memoire=BUDGET_MEMOIRE_TRI, decroissant=False):
+    """Trie des lignes de texte en ne gardant en mémoire qu'environ `budget_memoire` octets de lignes.
+
+    Le tri est stable : des lignes de même clé conservent leur ordre d'origine.
+
+    Args:
+        lignes (iterable of str): Les lignes à trier, sans saut de ligne.
+        cle (callable): La fonction qui retourne la clé de tri d'une ligne.
+        budget_memoire (int): La taille maximale estimée, en octets, d'un lot de lignes triées en mémoire.
+        decroissant (bool): Trie en ordre décroissant plutôt que croissant.
+
+    Yields:
+        str: Les lignes, dans l'ordre de leur clé.
+
+    Exemple:
+        >>> list(trier_externe(["3,c", "1,a", "2,b"], cle=lambda ligne: int(ligne.split(",")[0])))
+        ['1,a', '2,b', '3,c']
+    """
+    sequences = []
+    try:
+        lot = []
+        taille = 0
+        for ligne in lignes:
+            lot.append(ligne)
+            taille += sys.getsizeof(ligne) + SURCOUT_LIGNE
+            if taille >= budget_memoire:
+                sequences.append(ecrire_sequence(sorted(lot, key=cle, reverse=decroissant)))
+                lot = []
+                taille = 0
+
+        lot.sort(key=cle, reverse=decroissant)
+        if not sequences:
+            yield from lot
+            return
+        if lot:
+            sequences.append(ecrire_sequence(lot))
+        del lot
+
+        while len(sequences) > NOMBRE_MAXIMAL_SEQUENCES:
+            fusionnees = []
+            for debut in range(0, len(sequences), NOMBRE_MAXIMAL_SEQUENCES):
+                groupe = sequences[debut:debut + NOMBRE_MAXIMAL_SEQUENCES]
+                fusionnees.append(ecrire_sequence(fusionner_sequences(groupe, cle, decroissant)))
+                for sequence in groupe:
+                    sequence.close()
+            sequences = fusionnees
+
+        yield from fusionner_sequences(sequences, cle, decroissant)
+    finally:
+        for sequence in sequences:
+            sequence.close()
+
+
+def ecrire_sequence(lignes):
+    """Écrit une séquence de lignes triées dans un fichier temporaire, supprimé à sa fermeture.
+
+    Args:
+        lignes (iterable of str): Les lignes triées, sans saut de ligne.
+
+    Returns:
+        file: Le fichier temporaire, ouvert en lecture et positionné au début.
+    """
+    fichier = tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n")
+    fichier.writelines(f"{ligne}\n" for ligne in lignes)
+    fichier.seek(0)
+    return fichier
+
+
+def fusionner_sequences(sequences, cle, decroissant):
+    """Fusionne des séquences triées en une seule, en lisant chaque fichier en continu.
+
+    Les séquences sont fusionnées dans l'ordre où elles ont été écrites, ce qui préserve la stabilité du tri.
+
+    Args:
+        sequences (list of file): Les fichiers temporaires des séquences triées.
+        cle (callable): La fonction qui retourne la clé de tri d'une ligne.
+        decroissant (bool): Les séquences sont triées en ordre décroissant.
+
+    Returns:
+        iterator: Les lignes fusionnées, sans saut de ligne.
+    """
+    lecteurs = [(ligne[:-1] for ligne in sequence) for sequence in sequences]
+    return heapq.merge(*lecteurs, key=cle, reverse=decroissant)
+
+
+def tests_tri_externe():
+    import random
+
+    lignes = [f"{random.randint(0, 1000)},{i}" for i in range(5000)]
+    cle = lambda ligne: int(ligne.split(",")[0])  # noqa: E731
+
+    # Teste que le tri externe (plusieurs séquences, fusion en plusieurs passes) donne le même résultat
+    # stable qu'un tri en mémoire, dans les deux ordres.
+    for decroissant in [False, True]:
+        attendu = sorted(lignes, key=cle, reverse=decroissant)
+        for budget in [1, 2_000, 50_000, 10**9]:
+            assert list(trier_externe(iter(lignes), cle, budget, decroissant)) == attendu
+
+    # Teste qu'une fusion interrompue ferme ses fichiers temporaires.
+    iterateur = trier_externe(iter(lignes), cle, 2_000)
+    next(iterateur)
+    iterateur.close()
+
+    # Teste le tri d'une séquence vide.
+    assert list(trier_externe([], cle)) == []
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'tri_externe'...")
+    tests_tri_externe()
+    print("Tests réussis!")
@@ -4,16 +4,30 @@ couvrant diverses fonctionnalités telles que le hachage de mots de passe, le fo
 monétaires et l'affichage de données sous forme de tableaux.
 
 Fonctions:
-- `hacher_mot_de_passe(mot_de_passe)`: Hache un mot de passe en utilisant l'algorithme SHA-256.
+- `hacher_mot_de_passe(mot_de_passe, algorithme, cout)`: Hache un mot de passe avec scrypt ou PBKDF2 et un sel aléatoire.
+- `verifier_mot_de_passe(mot_de_passe, hachage)`: Vérifie un mot de passe avec les paramètres de son hachage.
 - `garantir_existence_fichier(chemin_fichier)`: S'assure qu'un fichier existe; le crée vide le cas échéant.
+- `verrouiller_fichier(chemin_fichier, partage)`: Verrou exclusif ou partagé entre processus sur un fichier de données.
+- `synchroniser_fichier(chemin_fichier, etat, reinitialiser, analyser, taille_enregistrement)`: Lit seulement
+  les enregistrements ajoutés à un fichier depuis la dernière lecture, pour tenir à jour une copie en mémoire.
+- `dossier_donnees_temporaire()`: Redirige les fichiers de données vers un dossier temporaire, le temps d'un test.
 - `formater_argent(montant_en_dollars)`: Convertit un montant en dollars en une chaîne formatée.
 - `afficher_banniere(titre)`: Affiche une bannière contenant un titre centré.
 - `afficher_tableau(lignes, en_tetes)`: Affiche des données sous forme de tableau dans la console.
+- `afficher_tableau_en_continu(lignes, en_tetes, taille_echantillon)`: Affiche un tableau au fur et à mesure
+  que ses lignes sont produites.
 
 Dépendances:
 - `os`: Utilisé pour vérifier l'existence de fichiers et les créer si nécessaire.
-- `hashlib`: Nécessaire pour le hachage de mots de passe en utilisant SHA-256.
-- `secrets`: Pour comparer les hachages (https://docs.python.org/3/library/secrets.html#secrets.compare_digest).
+- `contextlib`: Pour définir le gestionnaire de contexte `verrouiller_fichier`.
+- `fcntl`: Pour verrouiller les fichiers entre processus (systèmes POSIX seulement; ignoré ailleurs).
+- `hashlib`: Pour dériver les clés des mots de passe (scrypt, PBKDF2) et vérifier les anciens hachages SHA-256.
+- `itertools`: Pour prélever les premières lignes d'un tableau affiché en continu.
+- `secrets`: Pour tirer les sels et comparer les hachages (https://docs.python.org/3/library/secrets.html#secrets.compare_digest).
+- `sys`: Pour trouver les modules de l'application dont les chemins de fichiers doivent être redirigés.
+- `tempfile`: Pour créer le dossier de données temporaire des tests.
+- `pathlib`: Pour construire les chemins redirigés.
+- `configuration`: Pour l'algorithme et les paramètres de hachage des mots de passe, et les chemins des fichiers de données.
 
 Note:
     Les fonctions de ce module sont conçues pour être réutilisables et facilement intégrables dans divers points de
@@ -22,27 +36,114 @@ Note:
 
 import os
 import hashlib
+import itertools
 import secrets
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import configuration
+from configuration import (
+    ALGORITHME_MOTS_DE_PASSE,
+    COUT_SCRYPT,
+    TAILLE_BLOC_SCRYPT,
+    ITERATIONS_PBKDF2,
+    TAILLE_SEL_MOTS_DE_PASSE,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: pas de verrou entre processus
+    fcntl = None
+
+
+def hacher_mot_de_passe(mot_de_passe, algorithme=ALGORITHME_MOTS_DE_PASSE, cout=None):
+    """Hache un mot de passe avec une fonction de dérivation de clé salée et volontairement coûteuse.
+
+    Un sel aléatoire est tiré pour chaque mot de passe, de sorte que deux hachages du même mot de passe
+    diffèrent. Le résultat contient l'algorithme, ses paramètres et le sel, séparés par des `$` (jamais de
+    virgule, pour rester compatible avec le fichier des utilisateurs); `verifier_mot_de_passe` utilise ces
+    paramètres, ce qui permet d'augmenter le coût des nouveaux hachages sans invalider les anciens.
+
+    Args:
+        mot_de_passe (str): Le mot de passe en clair à hacher.
+        algorithme (str): "scrypt" ou "pbkdf2" (PBKDF2-HMAC-SHA256). scrypt est remplacé par PBKDF2 si la
+                          version d'OpenSSL de Python ne le fournit pas.
+        cout (int): Le facteur de coût (N) de scrypt ou le nombre d'itérations de PBKDF2
+                    (par défaut, `COUT_SCRYPT` ou `ITERATIONS_PBKDF2`).
+
+    Returns:
+        str: Le hachage encodé : "scrypt$N$r$p$sel$clé" ou "pbkdf2_sha256$itérations$sel$clé",
+             le sel et la clé dérivée étant en hexadécimal.
+
+    Exemple:
+        >>> hacher_mot_de_passe("motdepasse123", "pbkdf2", 1000)
+        'pbkdf2_sha256$1000$0f5e6c...$8d2a41...'
+    """
+    if algorithme not in ["scrypt", "pbkdf2"]:
+        raise ValueError(f"Algorithme de hachage inconnu: {algorithme}")
+    if algorithme == "scrypt" and not hasattr(hashlib, "scrypt"):
+        algorithme, cout = "pbkdf2", None
+
+    if algorithme == "scrypt":
+        nom, parametres = "scrypt", [cout or COUT_SCRYPT, TAILLE_BLOC_SCRYPT, 1]
+    else:
+        nom, parametres = "pbkdf2_sha256", [cout or ITERATIONS_PBKDF2]
+    sel = secrets.token_bytes(TAILLE_SEL_MOTS_DE_PASSE)
+    cle = deriver_cle(mot_de_passe, nom, parametres, sel)
+    return "$".join([nom, *map(str, parametres), sel.hex(), cle.hex()])
 
 
-def hacher_mot_de_passe(mot_de_passe):
-    """Hache un mot de passe en utilisant l'algorithme SHA-256.
+def verifier_mot_de_passe(mot_de_passe, hachage):
+    """Vérifie un mot de passe en clair contre un hachage enregistré, avec les paramètres de ce hachage.
 
-    Cette fonction prend un mot de passe en clair comme entrée et retourne
-    son hash SHA-256, offrant une forme sécurisée pour stocker ou comparer
-    des mots de passe.
+    Les anciens hachages SHA-256 non salés (64 caractères hexadécimaux, sans `$`) sont aussi acceptés.
+    La comparaison est faite avec `secrets.compare_digest`, pour résister aux attaques temporelles.
 
     Args:
-        mot_de_passe (str): Le mot de passe en clair à hacher.
+        mot_de_passe (str): Le mot de passe en clair saisi.
+        hachage (str): Le hachage enregistré (voir `hacher_mot_de_passe`).
 
     Returns:
-        str: Le hash SHA-256 du mot de passe.
+        bool: True si le mot de passe correspond au hachage, False sinon (y compris si le hachage est invalide).
 
     Exemple:
-        >>> hacher_mot_de_passe("motdepasse123")
-        '75216c44a46bfff78f692d1fe695c02a407a2136625dcc17ca6cf3141e0c4c72'
+        >>> verifier_mot_de_passe("motdepasse123", hacher_mot_de_passe("motdepasse123"))
+        True
     """
-    return hashlib.sha256(mot_de_passe.encode()).hexdigest()
+    if "$" not in hachage:
+        return secrets.compare_digest(hashlib.sha256(mot_de_passe.encode()).hexdigest(), hachage)
+
+    try:
+        nom, *parametres, sel, cle = hachage.split("$")
+        calculee = deriver_cle(mot_de_passe, nom, [int(parametre) for parametre in parametres], bytes.fromhex(sel))
+    except ValueError:
+        return False
+    return secrets.compare_digest(calculee.hex(), cle)
+
+
+def deriver_cle(mot_de_passe, nom, parametres, sel):
+    """Dérive la clé d'un mot de passe avec l'algorithme et les paramètres d'un hachage encodé.
+
+    Args:
+        mot_de_passe (str): Le mot de passe en clair.
+        nom (str): "scrypt" ou "pbkdf2_sha256".
+        parametres (list of int): [N, r, p] pour scrypt, [itérations] pour PBKDF2.
+        sel (bytes): Le sel.
+
+    Returns:
+        bytes: La clé dérivée (32 octets).
+
+    Raises:
+        ValueError: Si l'algorithme est inconnu ou si ses paramètres sont invalides.
+    """
+    if nom == "scrypt" and len(parametres) == 3:
+        n, r, p = parametres
+        return hashlib.scrypt(mot_de_passe.encode(), salt=sel, n=n, r=r, p=p, maxmem=256 * n * r * p, dklen=32)
+    if nom == "pbkdf2_sha256" and len(parametres) == 1:
+        return hashlib.pbkdf2_hmac("sha256", mot_de_passe.encode(), sel, parametres[0])
+    raise ValueError(f"Hachage de mot de passe invalide: {nom}")
 
 
 def garantir_existence_fichier(chemin_fichier):
@@ -60,6 +161,132 @@ def garantir_existence_fichier(chemin_fichier):
             pass  # Créer simplement le fichier sans rien écrire
 
 
+@contextmanager
+def verrouiller_fichier(chemin_fichier, partage=False):
+    """Acquiert un verrou entre processus sur un fichier de données, exclusif ou partagé.
+
+    Le verrou est posé sur un fichier compagnon (suffixe `.verrou`) plutôt que sur le fichier lui-même,
+    afin de rester valide lorsque le fichier de données est remplacé (par exemple lors d'un compactage).
+    Plusieurs verrous partagés peuvent être tenus en même temps (lecteurs); un verrou exclusif (écrivain)
+    attend qu'ils soient tous relâchés. Un même processus ne doit pas imbriquer deux verrous sur le même
+    fichier. Sur les systèmes sans `fcntl`, le verrou n'a aucun effet.
+
+    Args:
+        chemin_fichier (Path): Le chemin du fichier de données à protéger.
+        partage (bool): Acquiert un verrou partagé (lecture) plutôt qu'exclusif.
+
+    Exemple:
+        >>> with verrouiller_fichier(FICHIER_SESSION):
+        ...     pass  # Lire et écrire le fichier sans interférence des autres processus
+    """
+    with open(f"{chemin_fichier}.verrou", "a") as verrou:
+        if fcntl is not None:
+            fcntl.flock(verrou.fileno(), fcntl.LOCK_SH if partage else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(verrou.fileno(), fcntl.LOCK_UN)
+
+
+def synchroniser_fichier(chemin_fichier, etat, reinitialiser, analyser, taille_enregistrement=None):
+    """Lit les enregistrements ajoutés à un fichier depuis la dernière lecture, pour tenir à jour une copie en mémoire.
+
+    Les fichiers qui ne font que grandir (sessions, index des propriétaires, empreintes) sont suivis par leur
+    identité (inode) et le nombre d'octets déjà lus : seule la fin du fichier est lue. Si le fichier a été
+    remplacé (compactage, reconstruction), tronqué ou supprimé, la copie en mémoire est vidée par
+    `reinitialiser` et le fichier est relu depuis le début. Un enregistrement incomplet (en cours d'écriture
+    par un autre processus) est laissé pour la prochaine lecture.
+
+    Args:
+        chemin_fichier (Path): Le chemin du fichier à lire.
+        etat (dict): L'état de lecture du fichier, mis à jour : "inode" et "octets_lus".
+        reinitialiser (callable): Vide la copie en mémoire (appelée sans argument).
+        analyser (callable): Ajoute à la copie en mémoire les enregistrements lus, reçus en un seul itérable :
+                             des lignes décodées en UTF-8 sans saut de ligne, ou des tranches de
+                             `taille_enregistrement` octets.
+        taille_enregistrement (int): La taille des enregistrements d'un fichier binaire, ou `None` pour un
+                                     fichier de lignes.
+    """
+    try:
+        with open(chemin_fichier, "rb") as fichier:
+            statistiques = os.fstat(fichier.fileno())
+            if statistiques.st_ino != etat["inode"] or statistiques.st_size < etat["octets_lus"]:
+                etat["inode"] = statistiques.st_ino
+                etat["octets_lus"] = 0
+                reinitialiser()
+            fichier.seek(etat["octets_lus"])
+            contenu = fichier.read()
+    except FileNotFoundError:
+        etat["inode"] = None
+        etat["octets_lus"] = 0
+        reinitialiser()
+        return
+
+    if taille_enregistrement is None:
+        fin = contenu.rfind(b"\n") + 1
+        enregistrements = contenu[:fin].decode("utf-8").splitlines()
+    else:
+        fin = len(contenu) - len(contenu) % taille_enregistrement
+        enregistrements = (
+            contenu[position:position + taille_enregistrement] for position in range(0, fin, taille_enregistrement)
+        )
+    etat["octets_lus"] += fin
+    analyser(enregistrements)
+
+
+@contextmanager
+def dossier_donnees_temporaire():
+    """Redirige les fichiers de données vers un dossier temporaire vide, le temps d'un test.
+
+    Chaque module déjà importé de l'application voit ses constantes `FICHIER_*` qui désignent un fichier de
+    `DOSSIER_DONNEES` remplacées par le même nom dans le dossier temporaire; les fichiers de référence (villes,
+    types de propriété) ne sont pas redirigés. Les états de lecture incrémentale (`ETAT_*`, `CACHE_*`) sont
+    invalidés à l'entrée et à la sortie, puisqu'ils désignent des fichiers par leur inode. Les constantes
+    d'origine sont rétablies à la sortie, et le dossier temporaire est supprimé.
+
+    Yields:
+        Path: Le dossier temporaire.
+
+    Exemple:
+        >>> with dossier_donnees_temporaire():
+        ...     sauvegarder_propriete(propriete)  # Écrit dans le dossier temporaire
+    """
+    fichiers_donnees = {
+        valeur
+        for nom, valeur in vars(configuration).items()
+        if nom.startswith("FICHIER_") and valeur.parent == configuration.DOSSIER_DONNEES
+    } - {configuration.FICHIER_VILLES, configuration.FICHIER_TYPES_PROPRIETE}
+    modules = [
+        module
+        for module in list(sys.modules.values())
+        if getattr(module, "__file__", None) and Path(module.__file__).resolve().parent == configuration.DOSSIER_BASE
+    ]
+
+    def invalider_etats():
+        for module in modules:
+            for nom, valeur in vars(module).items():
+                if nom.startswith(("ETAT_", "CACHE_")) and isinstance(valeur, dict):
+                    for cle in ["inode", "signature"]:
+                        if cle in valeur:
+                            valeur[cle] = None
+
+    remplacements = []
+    with tempfile.TemporaryDirectory() as dossier:
+        for module in modules:
+            for nom, valeur in list(vars(module).items()):
+                if nom.startswith("FICHIER_") and valeur in fichiers_donnees:
+                    remplacements.append((module, nom, valeur))
+                    setattr(module, nom, Path(dossier) / valeur.name)
+        invalider_etats()
+        try:
+            yield Path(dossier)
+        finally:
+            for module, nom, valeur in remplacements:
+                setattr(module, nom, valeur)
+            invalider_etats()
+
+
 def formater_argent(montant_en_dollars):
     """Convertit un montant en dollars en une chaîne formatée.
 
@@ -149,42 +376,71 @@ def afficher_tableau(lignes, en_tetes):
     print(ligne_separation)
 
 
+def afficher_tableau_en_continu(lignes, en_tetes, taille_echantillon=1000):
+    """Affiche un tableau formaté au fur et à mesure que ses lignes sont produites, sans les conserver.
+
+    Contrairement à `afficher_tableau`, les lignes peuvent provenir d'un générateur de taille quelconque.
+    La largeur des colonnes est calculée sur les `taille_echantillon` premières lignes; une valeur plus
+    longue apparaissant plus loin est affichée en entier, au prix d'un léger décalage de sa colonne.
+
+    Args:
+        lignes (iterable of list): Les lignes du tableau, qui peuvent être produites en continu.
+        en_tetes (list of str): Les noms des colonnes du tableau.
+        taille_echantillon (int): Le nombre de lignes prélevées pour calculer la largeur des colonnes.
+
+    Returns:
+        int: Le nombre de lignes affichées.
+    """
+    lignes = iter(lignes)
+    echantillon = list(itertools.islice(lignes, taille_echantillon))
+    largeurs = [
+        max([len(str(ligne[idx])) for ligne in echantillon] + [len(en_tete)])
+        for idx, en_tete in enumerate(en_tetes)
+    ]
+    ligne_separation = "+-" + "-+-".join("-" * largeur for largeur in largeurs) + "-+"
+
+    print(ligne_separation)
+    print("| " + " | ".join(en_tete.center(largeurs[idx]) for idx, en_tete in enumerate(en_tetes)) + " |")
+    print(ligne_separation)
+
+    nombre = 0
+    for ligne in itertools.chain(echantillon, lignes):
+        print("| " + " | ".join(str(item).center(largeurs[idx]) for idx, item in enumerate(ligne)) + " |")
+        nombre += 1
+
+    print(ligne_separation)
+    return nombre
+
+
 def tests_hacher_mot_de_passe():
-    # Teste si la fonction retourne un résultat.
-    mot_de_passe = "secret"
-    assert hacher_mot_de_passe(mot_de_passe) is not None
-
-    # Teste si le hash a une longueur de 64 caractères.
-    mot_de_passe = "secret"
-    assert len(hacher_mot_de_passe(mot_de_passe)) == 64
-
-    # Teste la consistance du hash pour le même mot de passe.
-    mot_de_passe = "secret"
-    hachage_1 = hacher_mot_de_passe(mot_de_passe)
-    hachage_2 = hacher_mot_de_passe(mot_de_passe)
-    # Note: La fonction `secrets.compare_digest` est spécialement conçue pour résister aux attaques par analyse
-    # de temps, car elle compare les chaînes de caractères de manière à prendre toujours le même temps,
-    # indépendamment du nombre de caractères qui correspondent.
-    # Cela empêche les attaquants de pouvoir deviner le mot de passe basé sur le temps que prend
-    # la comparaison, ajoutant ainsi une couche supplémentaire de sécurité.
-    assert secrets.compare_digest(hachage_1, hachage_2)
-
-    # Teste que deux mots de passe différents produisent des hachages différents.
-    mot_de_passe_1 = "secret"
-    mot_de_passe_2 = "secret2"
-    hachage_1 = hacher_mot_de_passe(mot_de_passe_1)
-    hachage_2 = hacher_mot_de_passe(mot_de_passe_2)
-    assert not secrets.compare_digest(hachage_1, hachage_2)
-
-    # Teste le comportement de la fonction avec un mot de passe vide.
-    mot_de_passe = ""
-    assert hacher_mot_de_passe(mot_de_passe) is not None
-    assert len(hacher_mot_de_passe(mot_de_passe)) == 64
-
-    # Teste le comportement de la fonction avec un très long mot de passe.
-    mot_de_passe = "a" * 1000  # Un mot de passe de 1000 caractères 'a'
-    assert hacher_mot_de_passe(mot_de_passe) is not None
-    assert len(hacher_mot_de_passe(mot_de_passe)) == 64
+    # Des coûts réduits gardent les tests rapides; les paramètres sont lus dans chaque hachage.
+    for algorithme, cout in [("scrypt", 2**10), ("pbkdf2", 1000)]:
+        # Teste qu'un mot de passe est vérifié avec son propre hachage, et qu'un autre mot de passe est refusé.
+        hachage = hacher_mot_de_passe("secret", algorithme, cout)
+        assert verifier_mot_de_passe("secret", hachage)
+        assert not verifier_mot_de_passe("secret2", hachage)
+
+        # Teste que le sel rend différents deux hachages du même mot de passe.
+        assert not secrets.compare_digest(hachage, hacher_mot_de_passe("secret", algorithme, cout))
+
+        # Teste que le hachage peut être enregistré dans le fichier des utilisateurs (aucune virgule).
+        assert "," not in hachage and "\n" not in hachage
+
+        # Teste les mots de passe vide et très long.
+        for mot_de_passe in ["", "a" * 1000]:
+            assert verifier_mot_de_passe(mot_de_passe, hacher_mot_de_passe(mot_de_passe, algorithme, cout))
+
+    # Teste qu'un hachage fait avec un coût plus faible reste valide après une hausse du coût par défaut.
+    assert verifier_mot_de_passe("secret", hacher_mot_de_passe("secret", "pbkdf2", 1))
+
+    # Teste les anciens hachages SHA-256 non salés.
+    ancien_hachage = "2bb80d537b1da3e38bd30361aa855686bde0eacd7162fef6a25fe97bf527a25b"
+    assert verifier_mot_de_passe("secret", ancien_hachage)
+    assert not verifier_mot_de_passe("secret2", ancien_hachage)
+
+    # Teste qu'un hachage invalide est refusé sans erreur.
+    for hachage in ["", "scrypt$1", "scrypt$abc$8$1$00$00", "bcrypt$10$00$00", "pbkdf2_sha256$1000$zz$00"]:
+        assert not verifier_mot_de_passe("secret", hachage)
 
 
 def tests_formater_argent():
@@ -210,8 +466,53 @@ def tests_formater_argent():
     assert formater_argent(0) == "0.00 $"
 
 
+
+def tests_synchroniser_fichier():
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = Path(dossier) / "lignes.txt"
+        etat = {"inode": None, "octets_lus": 0}
+        copie = []
+
+        def synchroniser():
+            synchroniser_fichier(chemin, etat, copie.clear, copie.extend)
+
+        # Teste un fichier absent, puis la lecture des seules lignes ajoutées.
+        copie.append("périmée")
+        synchroniser()
+        assert copie == []
+        chemin.write_bytes("a\nb\n".encode("utf-8"))
+        synchroniser()
+        assert copie == ["a", "b"]
+        with open(chemin, "ab") as fichier:
+            fichier.write("é\nincompl".encode("utf-8"))
+        synchroniser()
+        assert copie == ["a", "b", "é"]
+        with open(chemin, "ab") as fichier:
+            fichier.write(b"ete\n")
+        synchroniser()
+        assert copie == ["a", "b", "é", "incomplete"]
+
+        # Teste qu'un fichier remplacé ou tronqué est relu depuis le début.
+        remplacant = Path(dossier) / "remplacant.txt"
+        remplacant.write_bytes(b"x\n")
+        os.replace(remplacant, chemin)
+        synchroniser()
+        assert copie == ["x"]
+        with open(chemin, "wb") as fichier:
+            fichier.write(b"")
+        synchroniser()
+        assert copie == []
+
+        # Teste un fichier d'enregistrements de taille fixe, dont le dernier est incomplet.
+        chemin.write_bytes(b"aabbc")
+        etat = {"inode": None, "octets_lus": 0}
+        synchroniser_fichier(chemin, etat, copie.clear, copie.extend, taille_enregistrement=2)
+        assert copie == [b"aa", b"bb"] and etat["octets_lus"] == 4
+
+
 if __name__ == "__main__":
     print("Exécution des tests unitaires du module 'utilitaires'...")
     tests_hacher_mot_de_passe()
     tests_formater_argent()
+    tests_synchroniser_fichier()
     print("Tests réussis!")
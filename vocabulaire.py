@@ -0,0 +1,203 @@
+"""
+Ce module gère les vocabulaires de l'application IFT-1004 Solo Immo, c'est-à-dire les listes de valeurs
+permises pour certains champs des propriétés (villes, types de propriété).
+
+Chaque vocabulaire est chargé depuis un fichier de données (une valeur par ligne, dans l'encodage des fichiers de données) et
+converti en dictionnaire interné : chaque valeur reçoit un petit code entier (sa position dans le fichier),
+qui relie les valeurs normalisées à leur forme officielle, et les chaînes sont internées (`sys.intern`) afin
+d'être partagées par toutes les propriétés. Une liste triée des valeurs normalisées permet la recherche par
+préfixe (autocomplétion) par recherche dichotomique.
+
+Fonctions:
+- `normaliser(texte)`: Normalise une saisie (casse, accents, espaces) pour la comparaison.
+- `charger_vocabulaire(chemin_fichier)`: Charge un vocabulaire depuis un fichier de données.
+- `rechercher_valeur(vocabulaire, texte)`: Retrouve la valeur officielle correspondant à une saisie.
+- `completer_prefixe(vocabulaire, prefixe, limite)`: Retourne les valeurs commençant par un préfixe.
+- `resoudre_saisie(vocabulaire, texte, limite)`: Retrouve la valeur d'une saisie complète ou d'un préfixe unique.
+
+Dépendances:
+- `bisect`: Pour la recherche par préfixe dans la liste triée des valeurs normalisées.
+- `functools`: Pour ne charger chaque fichier de vocabulaire qu'une seule fois.
+- `sys`: Pour interner les valeurs du vocabulaire.
+- `unicodedata`: Pour retirer les accents lors de la normalisation.
+- `configuration`: Pour l'encodage des fichiers de données.
+"""
+
+import bisect
+import functools
+import sys
+import unicodedata
+
+from configuration import ENCODAGE_FICHIERS
+
+
+def normaliser(texte):
+    """Normalise une saisie pour la comparer aux valeurs d'un vocabulaire.
+
+    La normalisation retire les espaces superflus, les accents et la casse, de sorte que
+    « montreal », « MONTRÉAL » et « Montréal » soient équivalents.
+
+    Args:
+        texte (str): La saisie à normaliser.
+
+    Returns:
+        str: La saisie normalisée.
+
+    Exemple:
+        >>> normaliser("  Montréal ")
+        'montreal'
+    """
+    decompose = unicodedata.normalize("NFD", texte.strip())
+    return "".join(caractere for caractere in decompose if not unicodedata.combining(caractere)).casefold()
+
+
+@functools.lru_cache(maxsize=None)
+def charger_vocabulaire(chemin_fichier):
+    """Charge un vocabulaire depuis un fichier de données contenant une valeur par ligne.
+
+    Les lignes vides et les doublons (après normalisation) sont ignorés; le code d'une valeur est
+    sa position dans le fichier. Le résultat est mis en cache : chaque fichier n'est lu qu'une fois.
+
+    Args:
+        chemin_fichier (Path): Le chemin du fichier de vocabulaire.
+
+    Returns:
+        dict: Le vocabulaire, contenant les clés suivantes :
+            - "valeurs" (list of str) : Les valeurs, indexées par leur code.
+            - "codes" (dict) : Associe chaque valeur normalisée à son code.
+            - "cles_triees" (list of str) : Les valeurs normalisées, triées, pour la recherche par préfixe.
+            - "codes_tries" (list of int) : Les codes correspondant à `cles_triees`.
+    """
+    valeurs = []
+    codes = {}
+
+    with open(chemin_fichier, "r", encoding=ENCODAGE_FICHIERS) as fichier:
+        for ligne in fichier:
+            valeur = ligne.strip()
+            cle = normaliser(valeur)
+            if valeur and cle not in codes:
+                codes[cle] = len(valeurs)
+                valeurs.append(sys.intern(valeur))
+
+    cles_triees = sorted(codes)
+    return {
+        "valeurs": valeurs,
+        "codes": codes,
+        "cles_triees": cles_triees,
+        "codes_tries": [codes[cle] for cle in cles_triees],
+    }
+
+
+def rechercher_valeur(vocabulaire, texte):
+    """Retrouve la valeur officielle correspondant à une saisie, sans égard à la casse ni aux accents.
+
+    Args:
+        vocabulaire (dict): Le vocabulaire retourné par `charger_vocabulaire`.
+        texte (str): La saisie de l'utilisateur.
+
+    Returns:
+        str or None: La valeur officielle, ou `None` si la saisie ne fait pas partie du vocabulaire.
+    """
+    code = vocabulaire["codes"].get(normaliser(texte))
+    return None if code is None else vocabulaire["valeurs"][code]
+
+
+def completer_prefixe(vocabulaire, prefixe, limite=10):
+    """Retourne les valeurs du vocabulaire commençant par un préfixe, en ordre alphabétique.
+
+    La recherche est dichotomique dans la liste triée des valeurs normalisées : son coût dépend
+    du nombre de suggestions retournées, et non de la taille du vocabulaire.
+
+    Args:
+        vocabulaire (dict): Le vocabulaire retourné par `charger_vocabulaire`.
+        prefixe (str): Le début de la saisie de l'utilisateur.
+        limite (int): Le nombre maximal de suggestions à retourner.
+
+    Returns:
+        list of str: Les valeurs officielles commençant par le préfixe.
+    """
+    prefixe = normaliser(prefixe)
+    cles_triees = vocabulaire["cles_triees"]
+    suggestions = []
+
+    position = bisect.bisect_left(cles_triees, prefixe)
+    while position < len(cles_triees) and len(suggestions) < limite and cles_triees[position].startswith(prefixe):
+        suggestions.append(vocabulaire["valeurs"][vocabulaire["codes_tries"][position]])
+        position += 1
+
+    return suggestions
+
+
+def resoudre_saisie(vocabulaire, texte, limite=10):
+    """Retrouve la valeur officielle désignée par une saisie, complète ou abrégée.
+
+    Une saisie qui correspond exactement à une valeur (sans égard à la casse ni aux accents) la désigne.
+    Sinon, elle est traitée comme un préfixe : s'il n'est le début que d'une seule valeur, celle-ci est
+    retenue; sinon, les valeurs commençant par le préfixe sont retournées comme suggestions.
+
+    Args:
+        vocabulaire (dict): Le vocabulaire retourné par `charger_vocabulaire`.
+        texte (str): La saisie de l'utilisateur.
+        limite (int): Le nombre maximal de suggestions à retourner.
+
+    Returns:
+        tuple: (valeur officielle ou `None`, liste des suggestions). Les suggestions sont vides si une
+               valeur a été retenue, ou si la saisie est vide.
+
+    Exemple:
+        >>> resoudre_saisie(charger_vocabulaire(FICHIER_VILLES), "trois-r")
+        ('Trois-Rivières', [])
+    """
+    valeur = rechercher_valeur(vocabulaire, texte)
+    if valeur is not None:
+        return valeur, []
+    if not texte.strip():
+        return None, []
+
+    suggestions = completer_prefixe(vocabulaire, texte, limite)
+    if len(suggestions) == 1:
+        return suggestions[0], []
+    return None, suggestions
+
+
+def tests_vocabulaire():
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "villes.txt")
+        with open(chemin, "w", encoding=ENCODAGE_FICHIERS) as fichier:
+            fichier.write("Montréal\nQuébec\n\n  Lévis \nMONTREAL\nMont-Tremblant\nLaval\nTrois-Rivières\n")
+        vocabulaire = charger_vocabulaire(chemin)
+
+        # Teste le chargement: lignes vides et doublons normalisés ignorés, codes selon l'ordre du fichier.
+        assert vocabulaire["valeurs"] == ["Montréal", "Québec", "Lévis", "Mont-Tremblant", "Laval", "Trois-Rivières"]
+        assert vocabulaire["cles_triees"] == sorted(vocabulaire["cles_triees"])
+        assert charger_vocabulaire(chemin) is vocabulaire
+
+        # Teste la normalisation des accents, de la casse et des espaces.
+        assert normaliser("  MONTRÉAL ") == "montreal"
+        assert rechercher_valeur(vocabulaire, "montreal") == "Montréal"
+        assert rechercher_valeur(vocabulaire, " QUEBEC ") == "Québec"
+        assert rechercher_valeur(vocabulaire, "Montré") is None
+
+        # Teste la recherche par préfixe, en ordre alphabétique et avec une limite.
+        assert completer_prefixe(vocabulaire, "mont") == ["Mont-Tremblant", "Montréal"]
+        assert completer_prefixe(vocabulaire, "L") == ["Laval", "Lévis"]
+        assert completer_prefixe(vocabulaire, "l", limite=1) == ["Laval"]
+        assert completer_prefixe(vocabulaire, "x") == []
+
+        # Teste la résolution d'une saisie complète, d'un préfixe unique et d'un préfixe ambigu.
+        assert resoudre_saisie(vocabulaire, "LEVIS") == ("Lévis", [])
+        assert resoudre_saisie(vocabulaire, "trois") == ("Trois-Rivières", [])
+        assert resoudre_saisie(vocabulaire, "qué") == ("Québec", [])
+        assert resoudre_saisie(vocabulaire, "mont") == (None, ["Mont-Tremblant", "Montréal"])
+        assert resoudre_saisie(vocabulaire, "Montreal") == ("Montréal", [])
+        assert resoudre_saisie(vocabulaire, "Toronto") == (None, [])
+        assert resoudre_saisie(vocabulaire, "   ") == (None, [])
+
+
+if __name__ == "__main__":
+    print("Exécution des tests unitaires du module 'vocabulaire'...")
+    tests_vocabulaire()
+    print("Tests réussis!")